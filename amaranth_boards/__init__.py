@@ -7,3 +7,157 @@ except ImportError:
     # packages via pip at all, instead using PYTHONPATH directly or copying the package files into
     # `lib/pythonX.Y/site-packages`. Although not a recommended way, we still try to support it.
     __version__ = "unknown" # :nocov:
+
+
+import importlib
+from collections import namedtuple
+from fnmatch import fnmatchcase
+
+
+__all__ = ["PlatformInfo", "platforms", "get_platform"]
+
+
+PlatformInfo = namedtuple("PlatformInfo", ("name", "module", "variant", "cls_name", "family",
+                                           "device"))
+PlatformInfo.__doc__ = """Description of a board platform that does not require importing it.
+
+``family`` is the name of the ``amaranth.vendor`` backend the platform is built on. ``device``
+is ``None`` if it is only known once the platform is instantiated with its parameters.
+"""
+
+
+def _platform(module, variant, cls_name, family, device):
+    name = module if variant is None else "{}_{}".format(module, variant)
+    return PlatformInfo(name, module, variant, cls_name, family, device)
+
+
+# This table is plain data on purpose: enumerating and selecting platforms must not import any
+# board module, since that pulls in the vendor backend and builds every resource of the board.
+_registry = [
+    _platform("alchitry_au",           None,   "AlchitryAuPlatform",           "xilinx",              "XC7A35T"),
+    _platform("arrow_deca",            None,   "ArrowDECAPlatform",            "intel",               "10M50DA"),
+    _platform("arrow_sockit",          None,   "ArrowSoCKitPlatform",          "intel",               None),
+    _platform("arty_a7",               "35",   "ArtyA7_35Platform",            "xilinx",              "xc7a35ti"),
+    _platform("arty_a7",               "100",  "ArtyA7_100Platform",           "xilinx",              "xc7a100ti"),
+    _platform("arty_s7",               "25",   "ArtyS7_25Platform",            "xilinx",              "xc7s25"),
+    _platform("arty_s7",               "50",   "ArtyS7_50Platform",            "xilinx",              "xc7s50"),
+    _platform("arty_z7",               "20",   "ArtyZ720Platform",             "xilinx",              "xc7z020"),
+    _platform("atlys",                 None,   "AtlysPlatform",                "xilinx",              "xc6slx45"),
+    _platform("blackice",              None,   "BlackIcePlatform",             "lattice_ice40",       "iCE40HX4K"),
+    _platform("blackice_ii",           None,   "BlackIceIIPlatform",           "lattice_ice40",       "iCE40HX4K"),
+    _platform("chameleon96",           None,   "Chameleon96Platform",          "intel",               "5CSEBA6"),
+    _platform("cmod_a7",               "15",   "CmodA7_15Platform",            "xilinx",              "xc7a15t"),
+    _platform("cmod_a7",               "35",   "CmodA7_35Platform",            "xilinx",              "xc7a35t"),
+    _platform("cmod_s7",               None,   "CmodS7_Platform",              "xilinx",              "xc7s25"),
+    _platform("colorlight_5a75b_r7_0", None,   "Colorlight_5A75B_R70Platform", "lattice_ecp5",        "LFE5U-25F"),
+    _platform("colorlight_i5",         None,   "ColorLightI5Platform",         "lattice_ecp5",        "LFE5U-25F"),
+    _platform("colorlight_i9",         None,   "ColorLightI9Platform",         "lattice_ecp5",        "LFE5U-45F"),
+    _platform("colorlight_qmtech",     None,   "ColorlightQMTechPlatform",     "lattice_ecp5",        None),
+    _platform("de0",                   None,   "DE0Platform",                  "intel",               "EP3C16"),
+    _platform("de0_cv",                None,   "DE0CVPlatform",                "intel",               "5CEBA4"),
+    _platform("de0_nano",              None,   "DE0NanoPlatform",              "intel",               "EP4CE22"),
+    _platform("de10_lite",             None,   "DE10LitePlatform",             "intel",               "10M50DA"),
+    _platform("de10_nano",             None,   "DE10NanoPlatform",             "intel",               "5CSEBA6"),
+    _platform("de1_soc",               None,   "DE1SoCPlatform",               "intel",               "5CSEMA5"),
+    _platform("ebaz4205",              None,   "EBAZ4205Platform",             "xilinx",              "xc7z010"),
+    _platform("ecp5_5g_evn",           None,   "ECP55GEVNPlatform",            "lattice_ecp5",        "LFE5UM5G-85F"),
+    _platform("ecpix5",                "45",   "ECPIX545Platform",             "lattice_ecp5",        "LFE5UM5G-45F"),
+    _platform("ecpix5",                "85",   "ECPIX585Platform",             "lattice_ecp5",        "LFE5UM5G-85F"),
+    _platform("fomu_hacker",           None,   "FomuHackerPlatform",           "lattice_ice40",       "iCE40UP5K"),
+    _platform("fomu_pvt",              None,   "FomuPVTPlatform",              "lattice_ice40",       "iCE40UP5K"),
+    _platform("genesys2",              None,   "Genesys2Platform",             "xilinx",              "xc7k325t"),
+    _platform("hpc_xc7k420t",          None,   "HPCStoreXC7K420TPlatform",     "xilinx",              "xc7k420t"),
+    _platform("ice40_hx1k_blink_evn",  None,   "ICE40HX1KBlinkEVNPlatform",    "lattice_ice40",       "iCE40HX1K"),
+    _platform("ice40_hx8k_b_evn",      None,   "ICE40HX8KBEVNPlatform",        "lattice_ice40",       "iCE40HX8K"),
+    _platform("ice40_up5k_b_evn",      None,   "ICE40UP5KBEVNPlatform",        "lattice_ice40",       "iCE40UP5K"),
+    _platform("icebreaker",            None,   "ICEBreakerPlatform",           "lattice_ice40",       "iCE40UP5K"),
+    _platform("icebreaker_bitsy",      None,   "ICEBreakerBitsyPlatform",      "lattice_ice40",       "iCE40UP5K"),
+    _platform("icestick",              None,   "ICEStickPlatform",             "lattice_ice40",       "iCE40HX1K"),
+    _platform("icesugar",              None,   "ICESugarPlatform",             "lattice_ice40",       "iCE40UP5K"),
+    _platform("icesugar_nano",         None,   "ICESugarNanoPlatform",         "lattice_ice40",       "iCE40LP1K"),
+    _platform("kc705",                 None,   "KC705Platform",                "xilinx",              "xc7k325t"),
+    _platform("kcu105",                None,   "KCU105Platform",               "xilinx",              "xcku040"),
+    _platform("logicbone",             None,   "LogicbonePlatform",            "lattice_ecp5",        "LFE5UM5G-45F"),
+    _platform("logicbone",             "85f",  "Logicbone85FPlatform",         "lattice_ecp5",        "LFE5UM5G-85F"),
+    _platform("machxo3_sk",            None,   "MachXO3SKPlatform",            "lattice_machxo_2_3l", "LCMXO3LF-6900C"),
+    _platform("mercury",               None,   "MercuryPlatform",              "xilinx",              "xc3s200a"),
+    _platform("microzed_z010",         None,   "MicroZedZ010Platform",         "xilinx",              "xc7z010"),
+    _platform("microzed_z020",         None,   "MicroZedZ020Platform",         "xilinx",              "xc7z020"),
+    _platform("mister",                None,   "MisterPlatform",               "intel",               "5CSEBA6"),
+    _platform("nandland_go",           None,   "NandlandGoPlatform",           "lattice_ice40",       "iCE40HX1K"),
+    _platform("nexys4ddr",             None,   "Nexys4DDRPlatform",            "xilinx",              "xc7a100t"),
+    _platform("numato_mimas",          None,   "NumatoMimasPlatform",          "xilinx",              "xc6slx9"),
+    _platform("orangecrab_r0_1",       None,   "OrangeCrabR0_1Platform",       "lattice_ecp5",        "LFE5U-25F"),
+    _platform("orangecrab_r0_2",       None,   "OrangeCrabR0_2Platform",       "lattice_ecp5",        "LFE5U-25F"),
+    _platform("orangecrab_r0_2",       "25f",  "OrangeCrabR0_2_25FPlatform",   "lattice_ecp5",        "LFE5U-25F"),
+    _platform("orangecrab_r0_2",       "85f",  "OrangeCrabR0_2_85FPlatform",   "lattice_ecp5",        "LFE5U-85F"),
+    _platform("qmtech_10cl006",        None,   "QMTech10CL006Platform",        "intel",               "10CL006"),
+    _platform("qmtech_5cefa2",         None,   "QMTech5CEFA2Platform",         "intel",               "5CEFA2"),
+    _platform("qmtech_ep4ce",          None,   "QMTechEP4CEPlatform",          "intel",               None),
+    _platform("qmtech_ep4cgx150",      None,   "QMTechEP4CGX150Platform",      "intel",               "EP4CGX150"),
+    _platform("qmtech_xc7a35t",        None,   "QMTechXC7A35TPlatform",        "xilinx",              "xc7a35t"),
+    _platform("quickfeather",          None,   "QuickfeatherPlatform",         "quicklogic",          "ql-eos-s3_wlcsp"),
+    _platform("rz_easyfpga_a2_2",      None,   "RZEasyFPGAA2_2Platform",       "intel",               "EP4CE6"),
+    _platform("sk_xc6slx9",            None,   "SK_XC6SLX9Platform",           "xilinx",              "xc6slx9"),
+    _platform("supercon19badge",       None,   "Supercon19BadgePlatform",      "lattice_ecp5",        "LFE5U-45F"),
+    _platform("tang_nano",             None,   "TangNanoPlatform",             "gowin",               "GW1N-LV1QN48C6/I5"),
+    _platform("te0714_03_50_2I",       None,   "TE0714_03_50_2IPlatform",      "xilinx",              "xc7a50t"),
+    _platform("tinyfpga_ax1",          None,   "TinyFPGAAX1Platform",          "lattice_machxo_2_3l", "LCMXO2-256HC"),
+    _platform("tinyfpga_ax2",          None,   "TinyFPGAAX2Platform",          "lattice_machxo_2_3l", "LCMXO2-1200HC"),
+    _platform("tinyfpga_bx",           None,   "TinyFPGABXPlatform",           "lattice_ice40",       "iCE40LP8K"),
+    _platform("ulx3s",                 "12f",  "ULX3S_12F_Platform",           "lattice_ecp5",        "LFE5U-12F"),
+    _platform("ulx3s",                 "25f",  "ULX3S_25F_Platform",           "lattice_ecp5",        "LFE5U-25F"),
+    _platform("ulx3s",                 "45f",  "ULX3S_45F_Platform",           "lattice_ecp5",        "LFE5U-45F"),
+    _platform("ulx3s",                 "85f",  "ULX3S_85F_Platform",           "lattice_ecp5",        "LFE5U-85F"),
+    _platform("upduino_v1",            None,   "UpduinoV1Platform",            "lattice_ice40",       "iCE40UP5K"),
+    _platform("upduino_v2",            None,   "UpduinoV2Platform",            "lattice_ice40",       "iCE40UP5K"),
+    _platform("upduino_v3",            None,   "UpduinoV3Platform",            "lattice_ice40",       "iCE40UP5K"),
+    _platform("versa_ecp5",            None,   "VersaECP5Platform",            "lattice_ecp5",        "LFE5UM-45F"),
+    _platform("versa_ecp5_5g",         None,   "VersaECP55GPlatform",          "lattice_ecp5",        "LFE5UM5G-45F"),
+    _platform("waveshare_ep4ce10",     None,   "WaveshareEP4CE10Platform",     "intel",               "EP4CE10"),
+    _platform("zturn_lite_z007s",      None,   "ZTurnLiteZ007SPlatform",       "xilinx",              "xc7z007s"),
+    _platform("zturn_lite_z010",       None,   "ZTurnLiteZ010Platform",        "xilinx",              "xc7z010"),
+]
+_by_name     = {info.name:     info for info in _registry}
+_by_cls_name = {info.cls_name: info for info in _registry}
+
+
+def platforms(name="*", *, family="*", device="*"):
+    """Iterate over the known platforms, without importing any of them.
+
+    Every argument is a shell-style pattern matched against the respective field of
+    :class:`PlatformInfo`. Platforms whose device depends on their parameters only match
+    the default ``device`` pattern.
+    """
+    for info in _registry:
+        if not fnmatchcase(info.name, name):
+            continue
+        if not fnmatchcase(info.family, family):
+            continue
+        if device != "*" and (info.device is None or not fnmatchcase(info.device, device)):
+            continue
+        yield info
+
+
+def _load(info):
+    module = importlib.import_module("{}.{}".format(__package__, info.module))
+    return getattr(module, info.cls_name)
+
+
+def get_platform(name):
+    """Return the platform class registered as ``name``, importing only the module defining it."""
+    try:
+        info = _by_name[name]
+    except KeyError:
+        raise KeyError("Unknown platform {!r}".format(name)) from None
+    return _load(info)
+
+
+def __getattr__(name):
+    if name in _by_cls_name:
+        return _load(_by_cls_name[name])
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted([*globals(), *_by_cls_name])
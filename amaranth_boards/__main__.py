@@ -0,0 +1,167 @@
+import os
+import sys
+import argparse
+import traceback
+from fnmatch import fnmatchcase
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import platforms, get_platform
+from ._products import LocalProducts
+
+
+def _select(specs):
+    # A spec is either a pattern matched against registry names (`arty_a7_35`, `ulx3s_*`), or
+    # a `module:variant` pair where both halves are patterns (`ulx3s:*`, `ecpix5:85`).
+    selected = []
+    for spec in specs:
+        if ":" in spec:
+            module, variant = spec.split(":", 1)
+            matches = [info for info in platforms()
+                       if fnmatchcase(info.module, module) and
+                          fnmatchcase(info.variant or "", variant.lower())]
+        else:
+            matches = list(platforms(spec))
+        if not matches:
+            raise ValueError("No platform matches {!r}".format(spec))
+        for info in matches:
+            if info not in selected:
+                selected.append(info)
+    return selected
+
+
+def _build(name, build_dir, cache_dir=None, cache_size=None, profile=None):
+    from .test.blinky import Blinky
+
+    platform = get_platform(name)()
+    if profile is not None:
+        from . import instrument
+
+        products, profiler = instrument.build(platform, Blinky(),
+                                              build_dir=os.path.join(build_dir, name))
+        profiler.write(profile, platform=name)
+        return products, False
+
+    if cache_dir is None:
+        platform.build(Blinky(), build_dir=os.path.join(build_dir, name))
+        return LocalProducts(os.path.join(build_dir, name)), False
+
+    from .cache import BuildCache
+
+    cache = BuildCache(cache_dir, max_size=cache_size)
+    products = cache.build(platform, Blinky(), build_dir=os.path.join(build_dir, name))
+    return products, cache.hits > 0
+
+
+def _devices(specs, selected):
+    # A spec is `[PLATFORM@]DEVICE`; the platform may only be omitted if one is selected.
+    from .program import Device
+
+    devices = {}
+    for spec in specs:
+        name, sep, device = spec.rpartition("@")
+        if not sep:
+            if len(selected) != 1:
+                raise ValueError("Device {!r} must be prefixed with `PLATFORM@` when more than "
+                                 "one platform is selected".format(spec))
+            name = selected[0].name
+        elif name not in [info.name for info in selected]:
+            raise ValueError("Device {!r} is for a platform that is not selected".format(spec))
+        devices.setdefault(name, []).append(Device.parse(device))
+    return devices
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m {}".format(__package__),
+        description="Build (and optionally program) the Blinky test design for one or more "
+                    "boards.")
+    parser.add_argument("platforms", metavar="PLATFORM", nargs="+",
+        help="platform name or pattern (e.g. `arty_a7_35`, `icebreaker*`), or a "
+             "`module:variant` pattern (e.g. `ulx3s:*`, `ecpix5:85`)")
+    parser.add_argument("-j", "--jobs", metavar="N", type=int, default=os.cpu_count(),
+        help="run at most N builds at once (default: %(default)s)")
+    parser.add_argument("-b", "--build-dir", metavar="DIR", default="build",
+        help="build each platform in DIR/<platform> (default: %(default)s)")
+    parser.add_argument("-p", "--program", action="store_true",
+        help="program each board once it is built")
+    parser.add_argument("-d", "--device", metavar="[PLATFORM@]DEVICE", action="append",
+        default=[],
+        help="program DEVICE (`serial:SERIAL`, `usb:PORT` and/or `cable:NAME`, separated by "
+             "commas) instead of the first device found; may be repeated to program several "
+             "boards with the same build")
+    parser.add_argument("--state", metavar="FILE",
+        help="record what was programmed into each device in FILE, and skip devices that "
+             "already hold the same bitstream")
+    parser.add_argument("--cache", metavar="DIR",
+        help="reuse the products of identical earlier builds stored in DIR, and store new ones")
+    parser.add_argument("--cache-size", metavar="MIB", type=int, default=1024,
+        help="evict the least recently used builds once the cache exceeds MIB mebibytes "
+             "(default: %(default)s)")
+    parser.add_argument("--profile", metavar="FILE",
+        help="append the wall-clock time, CPU time and peak memory of each build step to "
+             "FILE, as one JSON object per platform (cannot be used with --cache)")
+    parser.add_argument("-l", "--list", action="store_true",
+        help="only list the selected platforms")
+    args = parser.parse_args()
+
+    try:
+        selected = _select(args.platforms)
+        devices  = _devices(args.device, selected)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.profile is not None and args.cache is not None:
+        parser.error("--profile cannot be used with --cache")
+
+    if args.list:
+        for info in selected:
+            print("{:24} {:28} {:20} {}".format(info.name, info.cls_name, info.family,
+                                                info.device or "-"))
+        return
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {executor.submit(_build, info.name, args.build_dir, args.cache,
+                                   args.cache_size << 20, args.profile): info.name
+                   for info in selected}
+        products = {}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                products[name], cached = future.result()
+            except Exception:
+                failed.append(name)
+                print("{}: build failed".format(name), file=sys.stderr)
+                traceback.print_exc()
+            else:
+                print("{}: {}".format(name, "restored from cache" if cached else "built"))
+
+    # Boards without a device are programmed one after another, since each of them goes to the
+    # first device found.
+    if args.program:
+        from .program import ProgramState, program_all
+
+        names, targets = [], []
+        for info in selected:
+            if info.name not in products:
+                continue
+            for device in devices.get(info.name, [None]):
+                names.append(info.name if device is None else "{}@{}".format(info.name, device))
+                targets.append((get_platform(info.name)(), products[info.name], device))
+        state = None if args.state is None else ProgramState(args.state)
+        for name, result in zip(names, program_all(targets, jobs=args.jobs, state=state)):
+            if result.skipped:
+                print("{}: unchanged, not programmed".format(name))
+            elif result.ok:
+                print("{}: programmed in {:.1f} s".format(name, result.elapsed))
+            else:
+                failed.append(name)
+                print("{}: programming failed after {:.1f} s".format(name, result.elapsed),
+                      file=sys.stderr)
+                traceback.print_exception(type(result.error), result.error,
+                                          result.error.__traceback__)
+
+    if failed:
+        sys.exit("Failed: {}".format(", ".join(failed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import subprocess
+from collections import namedtuple
+from contextlib import contextmanager, ExitStack
+from contextvars import ContextVar
+
+
+__all__ = ["Command", "run_command", "record_commands", "current_recording"]
+
+
+Command = namedtuple("Command", ("args", "input"))
+
+
+class _Recording:
+    def __init__(self):
+        self.commands = []
+        # Files extracted for the recorded commands must outlive `toolchain_program`.
+        self.cleanup  = ExitStack()
+
+
+_recording = ContextVar("_recording", default=None)
+
+
+def current_recording():
+    return _recording.get()
+
+
+@contextmanager
+def record_commands():
+    # Within the `with` block, `run_command()` records commands instead of running them, so that
+    # the caller can run them some other way (e.g. asynchronously) before the block ends.
+    recording = _Recording()
+    token = _recording.set(recording)
+    try:
+        with recording.cleanup:
+            yield recording
+    finally:
+        _recording.reset(token)
+
+
+def run_command(args, *, input=None):
+    recording = _recording.get()
+    if recording is not None:
+        recording.commands.append(Command(list(args), input))
+    else:
+        subprocess.run(args, input=input, check=True)
@@ -0,0 +1,9 @@
+__all__ = ["append_override"]
+
+
+def append_override(kwargs, override, script):
+    # Template overrides such as `add_settings` or `script_after_synth` are chunks of script;
+    # add to whatever the caller already passed instead of replacing it.
+    if kwargs.get(override):
+        script = "{}\n{}".format(kwargs[override], script)
+    kwargs[override] = script
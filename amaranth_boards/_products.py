@@ -0,0 +1,62 @@
+import os
+from contextlib import contextmanager
+
+from amaranth.build.run import LocalBuildProducts
+
+from ._command import current_recording
+
+
+__all__ = ["LocalProducts", "extract"]
+
+
+class LocalProducts(LocalBuildProducts):
+    """Build products in the local directory ``build_dir``, which :func:`extract` uses in
+    place.
+    """
+    def __init__(self, build_dir):
+        self.build_dir = os.path.abspath(build_dir)
+        super().__init__(self.build_dir)
+
+
+def _build_dir(products):
+    if isinstance(products, LocalProducts):
+        return products.build_dir
+    if isinstance(products, LocalBuildProducts):
+        # Amaranth keeps the directory private, as it does not promise that build products are
+        # files on the local filesystem; but `platform.build()` only returns `LocalBuildProducts`
+        # for a local build, with the absolute path of its directory. Should a later version
+        # store it differently, the files are extracted instead.
+        root = getattr(products, "_LocalBuildProducts__root", None)
+        if isinstance(root, str) and os.path.isabs(root):
+            return root
+    return None
+
+
+def _local_path(products, filename):
+    build_dir = _build_dir(products)
+    if build_dir is None:
+        return None
+    path = os.path.join(build_dir, filename)
+    return path if os.path.isfile(path) else None
+
+
+@contextmanager
+def extract(products, *filenames):
+    # Like `products.extract()`, but for local build products (`LocalProducts`, or those
+    # returned by `platform.build()`) the files are used in place rather than copied to
+    # temporary files; programmers only read them. Other products (e.g. ones built remotely)
+    # are still extracted.
+    paths = [_local_path(products, filename) for filename in filenames]
+    if None in paths:
+        recording = current_recording()
+        if recording is not None:
+            yield recording.cleanup.enter_context(products.extract(*filenames))
+        else:
+            with products.extract(*filenames) as result:
+                yield result
+    elif len(paths) == 0:
+        yield
+    elif len(paths) == 1:
+        yield paths[0]
+    else:
+        yield paths
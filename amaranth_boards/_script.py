@@ -0,0 +1,44 @@
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+
+from ._tools import tool_env_var
+
+
+__all__ = ["split_script", "command_tool", "command_script"]
+
+
+_command_re = re.compile(r'^"\$(\w+)"')
+
+
+def split_script(platform, script):
+    # The `sh` build script sets up the shell and the toolchain environment, which can take
+    # several lines and differs between toolchains, and then runs the rendered
+    # `command_templates`, each collapsed into a single line, at its end.
+    lines = script.rstrip("\n").split("\n")
+    split = len(lines) - len(platform.command_templates)
+    commands = [command for command in lines[split:] if command.strip()]
+    return "\n".join(lines[:split]), commands
+
+
+def command_tool(platform, command):
+    # Commands invoke their tool through its environment variable, e.g. `"$NEXTPNR_ECP5"`.
+    match = _command_re.match(command)
+    if match:
+        for tool in platform.required_tools:
+            if tool_env_var(tool) == match.group(1):
+                return tool
+        return match.group(1).lower()
+    return command.split()[0]
+
+
+@contextmanager
+def command_script(header, command):
+    # The header has to be run from a file, since some toolchains (e.g. Vivado) re-execute it
+    # with `bash "$0"`. Yields the arguments that run `command` after the header.
+    with tempfile.TemporaryDirectory() as script_dir:
+        path = os.path.join(script_dir, "command.sh")
+        with open(path, "w") as f:
+            f.write("{}\n{}\n".format(header, command))
+        yield ["sh", path]
@@ -0,0 +1,54 @@
+from collections.abc import Sequence
+
+
+__all__ = ["LazyTable"]
+
+
+class LazyTable(Sequence):
+    """A ``resources`` or ``connectors`` table that is only built when it is first used.
+
+    ``build`` is called once, with the class the table is defined in, and the result is cached.
+    Accessed through the class, the table behaves as a read-only sequence; this is also what
+    keeps ``ABCMeta`` from building it while checking for abstract attributes. Accessed through
+    a platform instance, it is a list owned by that instance, so that ``__init__`` can add or
+    replace entries without affecting other instances.
+    """
+    def __init__(self, build):
+        self._build = build
+        self._table = None
+
+    def __set_name__(self, owner, name):
+        self._owner = owner
+        self._name  = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        table = list(self._materialize())
+        instance.__dict__[self._name] = table
+        return table
+
+    def _materialize(self):
+        if self._table is None:
+            self._table = self._build(self._owner)
+        return self._table
+
+    def __getitem__(self, index):
+        return self._materialize()[index]
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __add__(self, other):
+        return self._materialize() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self._materialize()
+
+    def __repr__(self):
+        if self._table is None:
+            return "<LazyTable {}.{} (not built)>".format(self._owner.__qualname__, self._name)
+        return repr(self._table)
@@ -0,0 +1,39 @@
+import os
+import functools
+import subprocess
+
+
+__all__ = ["tool_env_var", "tool_command", "tool_version"]
+
+
+def tool_env_var(name):
+    # The environment variable that overrides the command run for tool `name` in Amaranth build
+    # scripts, e.g. `YOSYS=yowasp-yosys` or `NEXTPNR_ICE40=...`.
+    return name.upper().replace("-", "_").replace("+", "X")
+
+
+def tool_command(name):
+    return os.environ.get(tool_env_var(name), name)
+
+
+# Tools that do not understand `--version`.
+_VERSION_FLAGS = {
+    "vivado": "-version",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _run_version(command, flag):
+    try:
+        result = subprocess.run([command, flag], stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return b""
+    return result.stdout
+
+
+def tool_version(name):
+    """Return the output of the command for tool ``name`` when asked for its version, or
+    ``b""`` if it cannot be run. Tools without such an option print their usage instead.
+    """
+    return _run_version(tool_command(name), _VERSION_FLAGS.get(name, "--version"))
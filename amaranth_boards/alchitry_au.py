@@ -1,10 +1,12 @@
 import os
-import subprocess
 import shutil
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["AlchitryAuPlatform"]
@@ -25,7 +27,7 @@ class AlchitryAuPlatform(XilinxPlatform):
     package     = "FTG256"
     speed       = "1"
     default_clk = "clk100"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk100", 0, Pins("N14", dir="i"),
                  Clock(10e7), Attrs(IOSTANDARD="LVCMOS33")),
 
@@ -50,9 +52,9 @@ class AlchitryAuPlatform(XilinxPlatform):
             dm="A14 C9", odt="G11",
             diff_attrs=Attrs(IOSTANDARD="LVDS"),
             attrs=Attrs(IOSTANDARD="LVCMOS15")),
-    ]
+    ])
 
-    connectors  = [
+    connectors  = LazyTable(lambda cls: [
         Connector("bank", 0, "T8  T7  T5  R5  R8  P8  L2  L3  J1  K1  H1  H2  G1  G2  K5  E6 "
                              "T10 T9  R6  R7  P9  N9  K2  K3  J4  J5  H3  J3  H4  H5  N6  M6 "),
         Connector("bank", 1, "D1  E2  A2  B2  E1  F2  F3  F4  A3  B4  A4  A5  B5  B6  A7  B7 "
@@ -61,12 +63,12 @@ class AlchitryAuPlatform(XilinxPlatform):
                              "P11 P10 N12 N11 P13 N13 M1  M2  P1  N1  R1  R2  T2  R3  T3  T4 "),
         Connector("bank", 3, "L14 L13 M12 N16 R16 R15 P14 M15 P16 P15  -   -   -   -   -   - "
                              "K13 K12 M16 M14 T16 T14 N14   -   -   -  -   -   -   -   -   - ")
-    ]
+    ])
 
     def toolchain_program(self, products, name):
         (loader, bridge_bin) = find_loader()
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([loader, "-e", "-f", bitstream_filename,
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([loader, "-e", "-f", bitstream_filename,
                 "-p", bridge_bin
             ])
 
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ArrowDECAPlatform"]
@@ -15,7 +18,7 @@ class ArrowDECAPlatform(IntelPlatform):
     speed       = "C6"
     suffix      = "GES"
     default_clk = "clk50"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("M8", dir="i"),
             Clock(50e6), Attrs(io_standard="2.5 V")),
         Resource("clk50", 1, Pins("P11", dir="i"),
@@ -36,8 +39,8 @@ class ArrowDECAPlatform(IntelPlatform):
         *SwitchResources(
             pins="J21 J22",
             attrs=Attrs(io_standard="1.5 V")),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("gpio", 0,
             "W18  Y18  Y19  AA17 AA20 AA19 AB21 AB20 AB19 Y16  V16  "
             "AB18 V15  W17  AB17 AA16 AB16 W16  AB15 W15  Y14  AA15 "
@@ -47,13 +50,14 @@ class ArrowDECAPlatform(IntelPlatform):
             "Y5   Y6   W6   W7   W8   V8   AB8   V7  R11  AB7  AB6  "
             "AA7  AA6  Y7   V10  U7   W9   W5   R9   W4    P9  V17  "
             "W3"),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                   "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                         "--operation", "P;" + bitstream_filename])
 
     @property
     def file_templates(self):
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 __all__ = ["ArrowSoCKitPlatform"]
 
@@ -19,7 +22,7 @@ class ArrowSoCKitPlatform(IntelPlatform):
     speed       = "C8"
     suffix      = None
     default_clk = "clk50"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("AF14", dir="i"),
             Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
 
@@ -102,9 +105,9 @@ class ArrowSoCKitPlatform(IntelPlatform):
             Subsignal("aud_i2c_sdat", Pins("AF30")),
             Subsignal("aud_mute",     Pins("AD26")),
             Attrs(io_standard="3.3-V LVTTL")),
-    ]
+    ])
 
-    connectors  = [ ]
+    connectors  = LazyTable(lambda cls: [])
 
     gpio_daughterboard_connectors = [
         Connector("J", 2, "- G15 F14 H15 F15 A13 G13 B13 H14 B11 E13 - - "
@@ -133,7 +136,7 @@ class ArrowSoCKitPlatform(IntelPlatform):
 
         self.device, self.suffix = _device_map[revision]
         if with_gpio_daughterboard:
-            self.connectors.append(self.gpio_daughterboard_connectors)
+            self.connectors.extend(self.gpio_daughterboard_connectors)
             self.resources.append(Resource("gpio_serial", 0,
                                            Subsignal("tx", Pins("J_3:9")),
                                            Subsignal("rx", Pins("J_3:10")),
@@ -149,11 +152,12 @@ class ArrowSoCKitPlatform(IntelPlatform):
 
         super().__init__(toolchain=toolchain)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG", "-c", "CV SoCKit",
-                                                "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, "--haltcc", "--mode", "JTAG",
+                         *device_args("quartus_pgm", device, cable="CV SoCKit"),
+                         "--operation", "P;" + bitstream_filename])
 
 if __name__ == "__main__":
     from .test.blinky import Blinky
@@ -1,9 +1,15 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .multiboot import multiboot_overrides
+from .bram import bram_overrides
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ArtyA7_35Platform", "ArtyA7_100Platform"]
@@ -14,7 +20,9 @@ class _ArtyA7Platform(XilinxPlatform):
     speed       = "1L"
     default_clk = "clk100"
     default_rst = "rst"
-    resources   = [
+    config_interface = ConfigInterface(flash="S25FL128S", size=16, max_clock=33, bus_width=4,
+                                       compression=True)
+    resources   = LazyTable(lambda cls: [
         Resource("clk100", 0, Pins("E3", dir="i"),
                  Clock(100e6), Attrs(IOSTANDARD="LVCMOS33")),
         Resource("rst", 0, PinsN("C2", dir="i"), Attrs(IOSTANDARD="LVCMOS33")),
@@ -102,8 +110,8 @@ class _ArtyA7Platform(XilinxPlatform):
             Subsignal("rx_data",   Pins("D18 E17", dir="i")),
             Attrs(IOSTANDARD="LVCMOS33")
         )
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("pmod", 0, "G13 B11 A11 D12 - - D13 B18 A18 K16 - -"), # JA
         Connector("pmod", 1, "E15 E16 D15 C15 - - J17 J18 K15 J15 - -"), # JB
         Connector("pmod", 2, "U12 V12 V10 V11 - - U14 V14 T13 U13 - -"), # JC
@@ -193,9 +201,10 @@ class _ArtyA7Platform(XilinxPlatform):
             "isns0v95_n": "A16",
             "isns0v95_n": "A15",
         })
-    ]
+    ])
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, multiboot=None,
+                          patchable_memories=None, **kwargs):
         overrides = {
             "script_before_bitstream":
                 "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
@@ -209,12 +218,25 @@ class _ArtyA7Platform(XilinxPlatform):
                 set_property CONFIG_VOLTAGE 3.3 [current_design]
                 """
         }
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
+        if multiboot is not None:
+            overrides = multiboot_overrides(self, *multiboot, **overrides)
+        if patchable_memories is not None:
+            overrides = bram_overrides(self, name, patchable_memories, **overrides)
         return super().toolchain_prepare(fragment, name, **overrides, **kwargs)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         xc3sprog = os.environ.get("XC3SPROG", "xc3sprog")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.run([xc3sprog, "-c", "nexys4", bitstream_filename], check=True)
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([xc3sprog, *device_args("xc3sprog", device, cable="nexys4"),
+                         bitstream_filename])
+
+    def toolchain_program_flash(self, filename, *, offset=0, device=None):
+        loader = os.environ.get("OPENFPGALOADER", "openFPGALoader")
+        run_command([loader, *device_args("openFPGALoader", device, cable="digilent"),
+                     "--fpga-part", "{}{}".format(self.device, self.package),
+                     "-f", "-o", str(offset), filename])
 
 
 class ArtyA7_35Platform(_ArtyA7Platform):
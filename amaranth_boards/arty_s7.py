@@ -1,10 +1,14 @@
 import os
 import textwrap
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .bram import bram_overrides
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ArtyS7_25Platform", "ArtyS7_50Platform"]
@@ -15,7 +19,9 @@ class _ArtyS7Platform(XilinxPlatform):
     speed       = "1"
     default_clk = "clk100"
     default_rst = "rst"
-    resources   = [
+    config_interface = ConfigInterface(flash="S25FL128S", size=16, max_clock=33, bus_width=4,
+                                       compression=True)
+    resources   = LazyTable(lambda cls: [
         Resource("clk100", 0, Pins("R2", dir="i"),
                  Clock(100e6), Attrs(IOSTANDARD="SSTL135")),
         Resource("rst", 0, PinsN("C18", dir="i"), Attrs(IOSTANDARD="LVCMOS33")),
@@ -66,8 +72,8 @@ class _ArtyS7Platform(XilinxPlatform):
             Subsignal("odt",    Pins("P5", dir="o")),
             Attrs(IOSTANDARD="SSTL135", SLEW="FAST"),
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("pmod", 0, "L17 L18 M14 N14 - - M16 M17 M18 N18 - -"), # JA
         Connector("pmod", 1, "P17 P18 R18 T18 - - P14 P15 N15 P16 - -"), # JB
         Connector("pmod", 2, "U15 V16 U17 U18 - - U16 P13 R13 V14 - -"), # JC
@@ -145,9 +151,10 @@ class _ArtyS7Platform(XilinxPlatform):
             "vaux3_p": "D16",
             "vaux3_n": "D17",
         })
-    ]
+    ])
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False,
+                          patchable_memories=None, **kwargs):
         overrides = {
             "script_before_bitstream":
                 "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
@@ -157,16 +164,21 @@ class _ArtyS7Platform(XilinxPlatform):
             "add_constraints":
                 "set_property INTERNAL_VREF 0.675 [get_iobanks 34]"
         }
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
+        if patchable_memories is not None:
+            overrides = bram_overrides(self, name, patchable_memories, **overrides)
         return super().toolchain_prepare(fragment, name, **overrides, **kwargs)
 
     def toolchain_program(self, product, name, *, programmer="vivado", flash=True):
         assert programmer in ("vivado", "openocd")
 
         if programmer == "vivado":
+            vivado = os.environ.get("VIVADO", "vivado")
             if flash:
                 # It does not appear possible to reset the FPGA via TCL after
                 # flash programming.
-                with product.extract("{}.bin".format(name)) as bitstream_filename:
+                with extract(product, "{}.bin".format(name)) as bitstream_filename:
                     cmd = textwrap.dedent("""
                         open_hw_manager
                         connect_hw_server
@@ -185,9 +197,9 @@ class _ArtyS7Platform(XilinxPlatform):
                         close_hw_manager
                         puts "Vivado TCL cannot reset boards. Reset or power-cycle your board now."
                     """).format(bitstream_filename).encode("utf-8")
-                    subprocess.run(["vivado", "-nolog", "-nojournal", "-mode", "tcl"], input=cmd, check=True)
+                    run_command([vivado, "-nolog", "-nojournal", "-mode", "tcl"], input=cmd)
             else:
-                with product.extract("{}.bit".format(name)) as bitstream_filename:
+                with extract(product, "{}.bit".format(name)) as bitstream_filename:
                     cmd = textwrap.dedent("""
                         open_hw_manager
                         connect_hw_server
@@ -197,7 +209,7 @@ class _ArtyS7Platform(XilinxPlatform):
                         program_hw_devices
                         close_hw_manager
                     """).format(bitstream_filename).encode("utf-8")
-                    subprocess.run(["vivado", "-nolog", "-nojournal", "-mode", "tcl"], input=cmd, check=True)
+                    run_command([vivado, "-nolog", "-nojournal", "-mode", "tcl"], input=cmd)
         else:
             openocd = os.environ.get("OPENOCD", "openocd")
             # In order, OpenOCD searches these directories for files:
@@ -207,16 +219,16 @@ class _ArtyS7Platform(XilinxPlatform):
             # Place the bscan_spi_xc7s50.bit proxy bitstream under a directory
             # named "proxy" in one of the above directories so OpenOCD finds it.
             if flash:
-                with product.extract("{}.bin".format(name)) as fn:
-                    subprocess.check_call([openocd, "-f", "board/arty_s7.cfg",
+                with extract(product, "{}.bin".format(name)) as fn:
+                    run_command([openocd, "-f", "board/arty_s7.cfg",
                         "-c", """init;
                         jtagspi_init 0 [find proxy/bscan_spi_xc7s50.bit];
                         jtagspi_program {} 0;
                         xc7_program xc7.tap;
                         shutdown""".format(fn)])
             else:
-                with product.extract("{}.bit".format(name)) as fn:
-                    subprocess.check_call(["openocd", "-f", "board/arty_s7.cfg",
+                with extract(product, "{}.bit".format(name)) as fn:
+                    run_command(["openocd", "-f", "board/arty_s7.cfg",
                         "-c", """init;
                         pld load 0 {};
                         shutdown""".format(fn)])
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ArtyZ720Platform"]
@@ -14,7 +17,7 @@ class ArtyZ720Platform(XilinxPlatform):
     package     = "clg400"
     speed       = "1"
     default_clk = "clk125"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk125", 0,
             Pins("H16", dir="i"), Clock(125e6), Attrs(IOSTANDARD="LVCMOS33")),
 
@@ -67,8 +70,8 @@ class ArtyZ720Platform(XilinxPlatform):
             Subsignal("scl", Pins("M17", dir="io")),
             Subsignal("sda", Pins("M18", dir="io")),
             Attrs(IOSTANDARD="LVCMOS33"))
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("pmod", 0, "Y18 Y19 Y16 Y17 - - U18 U19 W18 W19 - -"),  # JA
         Connector("pmod", 1, "W14 Y14 T11 T10 - - V16 W16 V12 W13 - -"),  # JB
 
@@ -162,12 +165,13 @@ class ArtyZ720Platform(XilinxPlatform):
             "vaux8_n": "A20",
             "vaux8_p": "B19"
         })
-    ]
+    ])
 
-    def toolchain_program(self, products, name, **kwargs):
+    def toolchain_program(self, products, name, *, device=None, **kwargs):
         xc3sprog = os.environ.get("XC3SPROG", "xc3sprog")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.run([xc3sprog, "-c", "jtaghs1_fast", "-p", "1", bitstream_filename], check=True)
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([xc3sprog, *device_args("xc3sprog", device, cable="jtaghs1_fast"),
+                         "-p", "1", bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
-import subprocess
 import textwrap
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["AtlysPlatform"]
@@ -28,8 +30,8 @@ class AtlysPlatform(XilinxPlatform):
 
     default_clk = "clk100"
     default_rst = "rst"
-    resources   = [
-        Resource("rst",    0, PinsN("T15", dir="i"), Attrs(IOSTANDARD=bank2_iostandard)), # RESET
+    resources   = LazyTable(lambda cls: [
+        Resource("rst",    0, PinsN("T15", dir="i"), Attrs(IOSTANDARD=cls.bank2_iostandard)), # RESET
         Resource("clk100", 0, Pins("L15",  dir="i"),
                  Clock(100e6), Attrs(IOSTANDARD="LVCMOS33")),                             # GCLK
 
@@ -40,7 +42,7 @@ class AtlysPlatform(XilinxPlatform):
         Resource("led",    4, Pins("M13",  dir="o"), Attrs(IOSTANDARD="LVCMOS33")),       # LD4
         Resource("led",    5, Pins("D4",   dir="o"), Attrs(IOSTANDARD="LVCMOS33")),       # LD5
         Resource("led",    6, Pins("P16",  dir="o"), Attrs(IOSTANDARD="LVCMOS33")),       # LD6
-        Resource("led",    7, Pins("N12",  dir="o"), Attrs(IOSTANDARD=bank2_iostandard)), # LD7
+        Resource("led",    7, Pins("N12",  dir="o"), Attrs(IOSTANDARD=cls.bank2_iostandard)), # LD7
 
         Resource("button", 0, Pins("N4",   dir="i"), Attrs(IOSTANDARD="LVCMOS18")),       # BTNU
         Resource("button", 1, Pins("P4",   dir="i"), Attrs(IOSTANDARD="LVCMOS18")),       # BTNL
@@ -52,9 +54,9 @@ class AtlysPlatform(XilinxPlatform):
         Resource("switch", 1, Pins("D14",  dir="i"), Attrs(IOSTANDARD="LVCMOS33")),       # SW1
         Resource("switch", 2, Pins("C14",  dir="i"), Attrs(IOSTANDARD="LVCMOS33")),       # SW2
         Resource("switch", 3, Pins("P15",  dir="i"), Attrs(IOSTANDARD="LVCMOS33")),       # SW3
-        Resource("switch", 4, Pins("P12",  dir="i"), Attrs(IOSTANDARD=bank2_iostandard)), # SW4
-        Resource("switch", 5, Pins("R5",   dir="i"), Attrs(IOSTANDARD=bank2_iostandard)), # SW5
-        Resource("switch", 6, Pins("T5",   dir="i"), Attrs(IOSTANDARD=bank2_iostandard)), # SW6
+        Resource("switch", 4, Pins("P12",  dir="i"), Attrs(IOSTANDARD=cls.bank2_iostandard)), # SW4
+        Resource("switch", 5, Pins("R5",   dir="i"), Attrs(IOSTANDARD=cls.bank2_iostandard)), # SW5
+        Resource("switch", 6, Pins("T5",   dir="i"), Attrs(IOSTANDARD=cls.bank2_iostandard)), # SW6
         Resource("switch", 7, Pins("E4",   dir="i"), Attrs(IOSTANDARD="LVCMOS18")),       # SW7
 
         UARTResource(0, rx="A16", tx="B16", attrs=Attrs(IOSTANDARD="LVCMOS33")), # J17/UART
@@ -197,18 +199,18 @@ class AtlysPlatform(XilinxPlatform):
             Subsignal("sdi",     Pins("T18", dir="i")),
             Attrs(IOSTANDARD="LVCMOS33")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("pmod", 0, "T3 R3 P6 N5 - - V9 T9 V4 T4 - -"), # JB
 
         Connector("vhdci", 0, # JC
             "U16 - U15 U13 - M11 R11 - T12 N10 - M10 U11 - R10 - - - - U10 - R8  M8  - U8  U7  - N7  T6  - R7  N6  - U5 "
             "V16 - V15 V13 - N11 T11 - V12 P11 - N9  V11 - T10 - - - - V10 - T8  N8  - V8  V7  - P8  V6  - T7  P7  - V5 "
         ),
-    ]
+    ])
 
     def toolchain_program(self, products, name):
-        with products.extract("{}.bit".format(name)) as bitfile:
+        with extract(products, "{}.bit".format(name)) as bitfile:
             cmd = textwrap.dedent("""
                 setMode -bscan
                 setCable -port auto
@@ -216,7 +218,7 @@ class AtlysPlatform(XilinxPlatform):
                 program -p 1
                 exit
             """).format(bitfile).encode('utf-8')
-            subprocess.run(["impact", "-batch"], input=cmd, check=True)
+            run_command(["impact", "-batch"], input=cmd)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["BlackIceIIPlatform"]
@@ -13,7 +15,7 @@ class BlackIceIIPlatform(LatticeICE40Platform):
     device      = "iCE40HX4K"
     package     = "TQ144"
     default_clk = "clk100"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk100", 0, Pins("129", dir="i"),
             Clock(100e6), Attrs(GLOBAL=True, IO_STANDARD="SB_LVCMOS")
         ),
@@ -41,8 +43,8 @@ class BlackIceIIPlatform(LatticeICE40Platform):
             dm_n="24 28",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS"),
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("pmod", 0, " 94  91  88  85 - -  95  93  90  87 - -"),  # PMOD1/2
         Connector("pmod", 1, "105 102  99  97 - - 104 101  98  96 - -"),  # PMOD3/4
         Connector("pmod", 2, "143 114 112 107 - - 144 113 110 106 - -"),  # PMOD5/6
@@ -51,11 +53,11 @@ class BlackIceIIPlatform(LatticeICE40Platform):
         Connector("pmod", 5, " 34  33  22  21 - -  32  31  26  25 - -"),  # PMOD11/12
         Connector("pmod", 6, " 37  38  39  41 - -"),  # PMOD13
         Connector("pmod", 7, " 71  67  68  70 - -"),  # PMOD14
-    ]
+    ])
 
     def toolchain_program(self, products, name):
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call(["cp", bitstream_filename, "/dev/ttyACM0"])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command(["cp", bitstream_filename, "/dev/ttyACM0"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,357 @@
+import os
+import re
+import sys
+import json
+import zlib
+import random
+import shutil
+import argparse
+import inspect
+import tempfile
+import subprocess
+from collections import namedtuple
+
+from amaranth.hdl.mem import Memory
+
+from ._script import split_script, command_tool, command_script
+from ._products import LocalProducts
+from ._overrides import append_override
+
+
+__all__ = ["PatchableMemory", "bram_overrides", "build", "patch"]
+
+
+class PatchableMemory(namedtuple("PatchableMemory", ("name", "width", "depth", "seed"))):
+    """A memory whose contents can be replaced in a built bitstream, without running synthesis
+    or place and route again.
+
+    The memory is built with a pseudorandom placeholder derived from ``seed`` (by default, from
+    ``name``), which is found and replaced in the bitstream when it is patched. ``name`` is also
+    the name of the :class:`Memory` in the design.
+    """
+    def __new__(cls, name, width, depth, seed=None):
+        if not re.match(r"^\w+$", name):
+            raise ValueError("Memory name must be an identifier, not {!r}".format(name))
+        if seed is None:
+            seed = zlib.crc32(name.encode("utf-8"))
+        return super().__new__(cls, name, width, depth, seed)
+
+    def placeholder(self):
+        """The initial contents the memory must be built with."""
+        rng = random.Random(self.seed)
+        return [rng.getrandbits(self.width) for _ in range(self.depth)]
+
+    def memory(self, **kwargs):
+        """Create the :class:`Memory` with the placeholder contents."""
+        return Memory(width=self.width, depth=self.depth, init=self.placeholder(),
+                      name=self.name, **kwargs)
+
+    def words(self, contents):
+        """Convert ``contents`` to exactly ``depth`` words, padding it with zeroes.
+
+        ``contents`` is either a sequence of words, or :class:`bytes` that are split into
+        little-endian words (if ``width`` is a multiple of 8).
+        """
+        if isinstance(contents, (bytes, bytearray)):
+            if self.width % 8 != 0:
+                raise ValueError("Memory {} is {} bits wide, and cannot be loaded from bytes"
+                                 .format(self.name, self.width))
+            size = self.width // 8
+            contents = [int.from_bytes(contents[offset:offset + size], "little")
+                        for offset in range(0, len(contents), size)]
+        words = list(contents)
+        if len(words) > self.depth:
+            raise ValueError("Contents of memory {} are {} words long, but it only holds {}"
+                             .format(self.name, len(words), self.depth))
+        for word in words:
+            if not 0 <= word < 1 << self.width:
+                raise ValueError("Word {:#x} does not fit in memory {}, which is {} bits wide"
+                                 .format(word, self.name, self.width))
+        return words + [0] * (self.depth - len(words))
+
+
+def _flow(platform):
+    toolchain = getattr(platform, "toolchain", None)
+    if toolchain == "IceStorm":
+        return "icestorm"
+    if toolchain == "Trellis":
+        return "trellis"
+    if toolchain == "Vivado" and getattr(platform, "family", None) == "series7":
+        return "vivado"
+    raise ValueError("{} cannot patch memories into its bitstream with the {} toolchain"
+                     .format(type(platform).__name__, toolchain))
+
+
+# Describes where Vivado placed each memory, for `updatemem`. Vivado records which part of the
+# memory every block RAM holds in its `bram_*` properties.
+_WRITE_MMI = r"""
+proc _amaranth_write_mmi {filename memories} {
+    set f [open $filename w]
+    puts $f {<?xml version="1.0" encoding="UTF-8"?>}
+    puts $f {<MemInfo Version="1" Minor="0">}
+    foreach {name width depth} $memories {
+        set cells [get_cells -hierarchical -filter \
+            "PRIMITIVE_GROUP == BLOCKRAM && RTL_RAM_NAME =~ *$name*"]
+        if {![llength $cells]} {
+            close $f
+            error "No block RAM was inferred for memory $name"
+        }
+        set ranges [dict create]
+        foreach cell $cells {
+            dict lappend ranges [list [get_property bram_addr_begin $cell] \
+                                      [get_property bram_addr_end $cell]] $cell
+        }
+        puts $f "  <Processor Endianness=\"Little\" InstPath=\"$name\">"
+        puts $f "    <AddressSpace Name=\"$name\" Begin=\"0\"\
+                      End=\"[expr {$width * $depth / 8 - 1}]\">"
+        foreach range [lsort -integer -index 0 [dict keys $ranges]] {
+            puts $f "      <BusBlock>"
+            set lanes [list]
+            foreach cell [dict get $ranges $range] {
+                lappend lanes [list [get_property bram_slice_end $cell] \
+                                    [get_property bram_slice_begin $cell] $cell]
+            }
+            foreach lane [lsort -integer -decreasing -index 0 $lanes] {
+                lassign $lane msb lsb cell
+                set type [string range [get_property REF_NAME $cell] 0 5]
+                set placement [string range [get_property LOC $cell] 7 end]
+                puts $f "        <BitLane MemType=\"$type\" Placement=\"$placement\">"
+                puts $f "          <DataWidth MSB=\"$msb\" LSB=\"$lsb\"/>"
+                puts $f "          <AddressRange Begin=\"[lindex $range 0]\"\
+                                                 End=\"[lindex $range 1]\"/>"
+                puts $f "          <Parity ON=\"false\" NumBits=\"0\"/>"
+                puts $f "        </BitLane>"
+            }
+            puts $f "      </BusBlock>"
+        }
+        puts $f "    </AddressSpace>"
+        puts $f "  </Processor>"
+    }
+    puts $f "  <Config>"
+    puts $f "    <Option Name=\"Part\" Val=\"[get_property PART [current_design]]\"/>"
+    puts $f "  </Config>"
+    puts $f "</MemInfo>"
+    close $f
+}
+"""
+
+
+# `icebram` and `ecpbram` look for the placeholder one block RAM's worth of words at a time.
+_BLOCK_DEPTH = {
+    "icestorm": ("icebram", 256),
+    "trellis":  ("ecpbram", 512),
+}
+
+
+def _check_memories(platform, memories):
+    flow = _flow(platform)
+    for memory in memories:
+        if flow == "vivado" and memory.width % 8 != 0:
+            raise ValueError("Memory {} is {} bits wide; `updatemem` can only patch "
+                             "memories whose width is a multiple of 8"
+                             .format(memory.name, memory.width))
+        if flow in _BLOCK_DEPTH:
+            tool, depth = _BLOCK_DEPTH[flow]
+            if memory.depth % depth != 0:
+                raise ValueError("Memory {} is {} words deep; `{}` can only patch memories "
+                                 "whose depth is a multiple of {}"
+                                 .format(memory.name, memory.depth, tool, depth))
+
+
+def bram_overrides(platform, name, memories, **overrides):
+    """Return ``overrides``, changed so that the contents of ``memories`` (a list of
+    :class:`PatchableMemory`) can be replaced with :func:`patch` in the bitstream.
+    """
+    if _flow(platform) == "vivado":
+        append_override(overrides, "script_after_bitstream", "\n".join([
+            _WRITE_MMI,
+            "_amaranth_write_mmi {}.mmi {{{}}}".format(name, " ".join(
+                "{} {} {}".format(memory.name, memory.width, memory.depth)
+                for memory in memories)),
+        ]))
+    return overrides
+
+
+def _manifest_path(build_dir, name):
+    return os.path.join(build_dir, "{}.brams.json".format(name))
+
+
+def _read_manifest(build_dir, name):
+    with open(_manifest_path(build_dir, name)) as f:
+        return [PatchableMemory(**memory) for memory in json.load(f)["memories"]]
+
+
+def build(platform, elaboratable, memories, name="top", build_dir="build", **kwargs):
+    """Build ``elaboratable`` for ``platform`` like ``platform.build``, so that the contents of
+    ``memories`` (a list of :class:`PatchableMemory`) can later be replaced with :func:`patch`.
+
+    The design must create each of these memories with :meth:`PatchableMemory.memory`. Their
+    depth must be a multiple of 256 words on iCE40 and of 512 words on ECP5, and their width a
+    multiple of 8 bits on 7-series devices.
+    """
+    memories = list(memories)
+    _check_memories(platform, memories)
+    if "patchable_memories" in inspect.signature(platform.toolchain_prepare).parameters:
+        # The board adds the overrides to its own, like other `*_overrides` options.
+        kwargs["patchable_memories"] = memories
+    else:
+        kwargs = bram_overrides(platform, name, memories, **kwargs)
+    products = platform.build(elaboratable, name, build_dir, **kwargs)
+    if os.path.isdir(build_dir):
+        with open(_manifest_path(build_dir, name), "w") as f:
+            json.dump({"memories": [memory._asdict() for memory in memories]}, f, indent=2)
+    return products
+
+
+def _write_hex(path, memory, words):
+    with open(path, "w") as f:
+        for word in words:
+            f.write("{:0{}x}\n".format(word, (memory.width + 3) // 4))
+
+
+def _repack(platform, build_dir, patch_dir, name, tool):
+    # Run the packing command of the original build script again, in `patch_dir`, so that the
+    # patched bitstream is packed with the same options.
+    with open(os.path.join(build_dir, "build_{}.sh".format(name))) as f:
+        header, commands = split_script(platform, f.read())
+    for command in commands:
+        if command_tool(platform, command) == tool:
+            with command_script(header, command) as args:
+                subprocess.run(args, cwd=patch_dir, check=True)
+            return
+    raise ValueError("The build script in {} does not run {}".format(build_dir, tool))
+
+
+def patch(platform, contents, name="top", build_dir="build", *, patch_dir=None,
+          do_program=False, program_opts=None):
+    """Replace the contents of memories in the bitstream built by :func:`build` in
+    ``build_dir``, and write the patched bitstream to ``patch_dir`` (by default,
+    ``build_dir/patched``).
+
+    ``contents`` maps each :class:`PatchableMemory` to replace to its new contents (see
+    :meth:`PatchableMemory.words`). Memories are patched with ``icebram`` on iCE40, ``ecpbram``
+    on ECP5 and ``updatemem`` on 7-series devices, which can be selected with the ``ICEBRAM``,
+    ``ECPBRAM`` and ``UPDATEMEM`` environment variables. The build products in ``build_dir``
+    are left unchanged. Returns the patched build products, and programs them if
+    ``do_program`` is true.
+    """
+    flow = _flow(platform)
+    build_dir = os.path.abspath(build_dir)
+    if patch_dir is None:
+        patch_dir = os.path.join(build_dir, "patched")
+    patch_dir = os.path.abspath(patch_dir)
+    os.makedirs(patch_dir, exist_ok=True)
+
+    # The tools are run in `temp_dir` with relative paths, since some builds of them (e.g.
+    # YoWASP ones) can only access the current directory.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        patches = []
+        for index, (memory, memory_contents) in enumerate(contents.items()):
+            from_path = "{}_from.hex".format(index)
+            to_path   = "{}_to.hex".format(index)
+            _write_hex(os.path.join(temp_dir, from_path), memory, memory.placeholder())
+            _write_hex(os.path.join(temp_dir, to_path), memory, memory.words(memory_contents))
+            patches.append((memory, from_path, to_path))
+
+        if flow == "icestorm":
+            icebram = os.environ.get("ICEBRAM", "icebram")
+            with open(os.path.join(build_dir, "{}.asc".format(name)), "rb") as f:
+                asc = f.read()
+            for memory, from_path, to_path in patches:
+                asc = subprocess.run([icebram, from_path, to_path], input=asc, cwd=temp_dir,
+                                     stdout=subprocess.PIPE, check=True).stdout
+            with open(os.path.join(patch_dir, "{}.asc".format(name)), "wb") as f:
+                f.write(asc)
+            _repack(platform, build_dir, patch_dir, name, "icepack")
+
+        elif flow == "trellis":
+            ecpbram = os.environ.get("ECPBRAM", "ecpbram")
+            config = "original.config"
+            shutil.copy(os.path.join(build_dir, "{}.config".format(name)),
+                        os.path.join(temp_dir, config))
+            for index, (memory, from_path, to_path) in enumerate(patches):
+                patched = "{}.config".format(index)
+                subprocess.run([ecpbram, "-i", config, "-o", patched,
+                                "-f", from_path, "-t", to_path], cwd=temp_dir, check=True)
+                config = patched
+            shutil.copy(os.path.join(temp_dir, config),
+                        os.path.join(patch_dir, "{}.config".format(name)))
+            _repack(platform, build_dir, patch_dir, name, "ecppack")
+
+        elif flow == "vivado":
+            updatemem = os.environ.get("UPDATEMEM", "updatemem")
+            args = [updatemem, "-force",
+                    "-meminfo", os.path.join(build_dir, "{}.mmi".format(name)),
+                    "-bit", os.path.join(build_dir, "{}.bit".format(name)),
+                    "-out", os.path.join(patch_dir, "{}.bit".format(name))]
+            for index, (memory, from_path, to_path) in enumerate(patches):
+                mem_path = "{}.mem".format(index)
+                with open(os.path.join(temp_dir, mem_path), "w") as f, \
+                        open(os.path.join(temp_dir, to_path)) as words:
+                    f.write("@0\n" + words.read())
+                args += ["-data", mem_path, "-proc", memory.name]
+            subprocess.run(args, cwd=temp_dir, check=True)
+
+    products = LocalProducts(patch_dir)
+    if do_program:
+        platform.toolchain_program(products, name, **(program_opts or {}))
+    return products
+
+
+def _read_contents(path):
+    # `.hex` files have one hexadecimal word per line; anything else is a raw binary image.
+    if path.endswith(".hex"):
+        with open(path) as f:
+            return [int(word, 16) for word in f.read().split()]
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def main():
+    from . import get_platform
+    from .program import Device
+
+    parser = argparse.ArgumentParser(prog="python -m {}".format(__spec__.name),
+        description="Replace the contents of memories in a bitstream built with "
+                    "`amaranth_boards.bram.build`, and optionally program it.")
+    parser.add_argument("platform", metavar="PLATFORM",
+        help="platform name (e.g. `icebreaker`)")
+    parser.add_argument("contents", metavar="MEMORY=FILE", nargs="+",
+        help="load MEMORY from FILE, a binary image or a `.hex` file with one word per line")
+    parser.add_argument("-b", "--build-dir", metavar="DIR", default="build",
+        help="patch the bitstream built in DIR (default: %(default)s)")
+    parser.add_argument("-n", "--name", metavar="NAME", default="top",
+        help="name of the design (default: %(default)s)")
+    parser.add_argument("-o", "--patch-dir", metavar="DIR",
+        help="write the patched bitstream to DIR (default: BUILD-DIR/patched)")
+    parser.add_argument("-p", "--program", action="store_true",
+        help="program the board with the patched bitstream")
+    parser.add_argument("-d", "--device", metavar="DEVICE",
+        help="program DEVICE instead of the first device found")
+    args = parser.parse_args()
+
+    try:
+        platform = get_platform(args.platform)()
+        memories = {memory.name: memory for memory in _read_manifest(args.build_dir, args.name)}
+        contents = {}
+        for spec in args.contents:
+            memory_name, sep, path = spec.partition("=")
+            if not sep or memory_name not in memories:
+                raise ValueError("{!r} does not name a memory of the design; it has {}"
+                                 .format(spec, ", ".join(memories)))
+            contents[memories[memory_name]] = _read_contents(path)
+        program_opts = {}
+        if args.device is not None:
+            program_opts["device"] = Device.parse(args.device)
+    except (OSError, KeyError, ValueError) as e:
+        parser.error(str(e))
+
+    try:
+        patch(platform, contents, args.name, args.build_dir, patch_dir=args.patch_dir,
+              do_program=args.program, program_opts=program_opts)
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        sys.exit(str(e))
+
+
+if __name__ == "__main__":
+    main()
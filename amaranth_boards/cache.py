@@ -0,0 +1,150 @@
+import os
+import shutil
+import hashlib
+import tempfile
+
+from ._tools import tool_env_var, tool_version
+from ._products import LocalProducts
+
+
+__all__ = ["BuildCache"]
+
+
+def _snapshot(build_dir):
+    # The modification time and size of every file in `build_dir`, by relative path; the files
+    # a build writes are those that are new or changed afterwards.
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(build_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            files[os.path.relpath(path, build_dir)] = stat.st_mtime_ns, stat.st_size
+    return files
+
+
+class BuildCache:
+    """A local directory of build products, keyed by everything the build depends on.
+
+    The key of a build is the digest of its build plan, which covers the elaborated design,
+    the constraints, and the build script with every ``toolchain_prepare`` override (such as
+    ``ecppack_opts`` or ``script_before_bitstream``) rendered into it; plus the toolchain
+    environment variables, which select the tools that run the script, and the version each
+    tool reports.
+
+    Each entry holds the files of a successful build: those of the build plan, and those the
+    toolchain wrote. Other files in the build directory (e.g. of other designs built there)
+    are neither stored nor overwritten. Once the entries add up to more than ``max_size``
+    bytes, the least recently used ones are removed.
+    """
+    def __init__(self, path, *, max_size=1 << 30):
+        self.path     = os.path.abspath(path)
+        self.max_size = max_size
+        self.hits     = 0
+        self.misses   = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def key(self, platform, plan):
+        """Return the key, as a hex string, of building ``plan`` for ``platform``."""
+        hasher = hashlib.sha256(plan.digest())
+        toolchain = tool_env_var(platform.toolchain)
+        env_vars = sorted({"AMARANTH_ENV_{}".format(toolchain), "NMIGEN_ENV_{}".format(toolchain),
+                           *(tool_env_var(tool) for tool in platform.required_tools)})
+        for env_var in env_vars:
+            hasher.update("\0{}={}".format(env_var, os.environ.get(env_var, "")).encode())
+        # The same command may run a different version of the tool after an upgrade.
+        for tool in sorted(platform.required_tools):
+            hasher.update("\0{}\0".format(tool).encode())
+            hasher.update(tool_version(tool))
+        return hasher.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.path, key)
+
+    def get(self, key, build_dir):
+        """Restore the products stored under ``key`` into ``build_dir``.
+
+        Returns :class:`~._products.LocalProducts`, or ``None`` if there is no such entry.
+        """
+        entry = self._entry(key)
+        if not os.path.isdir(entry):
+            return None
+        shutil.copytree(entry, build_dir, dirs_exist_ok=True)
+        try:
+            # The modification time of an entry is when it was last used.
+            os.utime(entry)
+        except FileNotFoundError:
+            pass
+        return LocalProducts(build_dir)
+
+    def put(self, key, build_dir, filenames):
+        """Store ``filenames`` (relative to ``build_dir``) under ``key``, then evict entries as
+        needed.
+        """
+        # Copy into a temporary directory first and rename it into place, so that concurrent
+        # builds never see a partial entry.
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=self.path)
+        try:
+            for filename in filenames:
+                target = os.path.join(staging, filename)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(os.path.join(build_dir, filename), target)
+            try:
+                os.rename(staging, self._entry(key))
+            except OSError:
+                # Another build stored the same products first.
+                pass
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def _size(self, entry):
+        size = 0
+        for dirpath, dirnames, filenames in os.walk(entry):
+            for filename in filenames:
+                try:
+                    size += os.lstat(os.path.join(dirpath, filename)).st_size
+                except FileNotFoundError:
+                    pass
+        return size
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in ``max_size``."""
+        entries = []
+        for name in os.listdir(self.path):
+            entry = self._entry(name)
+            if name.startswith(".") or not os.path.isdir(entry):
+                continue
+            try:
+                entries.append((os.stat(entry).st_mtime, self._size(entry), entry))
+            except FileNotFoundError:
+                pass
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+    def build(self, platform, elaboratable, name="top", build_dir="build",
+              program_opts=None, do_program=False, **kwargs):
+        """Like ``platform.build()``, but return the stored products if this exact build has
+        been done before, and store the products otherwise.
+        """
+        plan = platform.prepare(elaboratable, name, **kwargs)
+        key = self.key(platform, plan)
+        products = self.get(key, build_dir)
+        if products is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            before = _snapshot(build_dir)
+            plan.execute_local(build_dir)
+            products = LocalProducts(build_dir)
+            after = _snapshot(build_dir)
+            self.put(key, build_dir, {*plan.files, *(filename for filename, stat in after.items()
+                                                      if before.get(filename) != stat)})
+
+        if not do_program:
+            return products
+        platform.toolchain_program(products, name, **(program_opts or {}))
@@ -1,10 +1,13 @@
 import os
-import subprocess
 
 from amaranth import *
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["Chameleon96Platform"]
@@ -15,7 +18,7 @@ class Chameleon96Platform(IntelPlatform):
     package     = "U19"     # UBGA-484
     speed       = "I7"
     default_clk = "cyclonev_oscillator"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         # WIFI and BT LEDs
         *LEDResources(
             pins="Y19 Y20",
@@ -69,9 +72,9 @@ class Chameleon96Platform(IntelPlatform):
             rx="AB14", cts="AB17", tx="AA15", rts="AA16", role="dte",
             attrs=Attrs(io_standard="1.8 V"),
         ),
-    ]
+    ])
 
-    connectors  = [
+    connectors  = LazyTable(lambda cls: [
         # J3, 2x20 expansion port
         Connector("J", 3,
             "-      -      Y13    -      W14    -      C5     -      C6     -"
@@ -89,15 +92,16 @@ class Chameleon96Platform(IntelPlatform):
             "-      -      -      -      -      -      -      -      -      -"
             "-      -      -      -      -      -      -      -      -      -"
         ),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
             # The @2 selects the second device in the JTAG chain, because this chip
             # puts the ARM cores first.
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                   "--operation", "P;" + bitstream_filename + "@2"])
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                         "--operation", "P;" + bitstream_filename + "@2"])
 
 
 if __name__ == "__main__":
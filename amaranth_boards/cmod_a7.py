@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 """
 Example Usage:
@@ -21,7 +24,7 @@ class _CmodA7Platform(XilinxPlatform):
     package     = "cpg236"
     speed       = "1"
     default_clk = "clk12"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk12", 0, Pins("L17", dir="i"),
                  Clock(12e6), Attrs(IOSTANDARD="LVCMOS33")),
 
@@ -52,8 +55,8 @@ class _CmodA7Platform(XilinxPlatform):
         # May not be populated on the board
         Resource("atsha204a", 0, Pins("D17", dir="io"),
             Attrs(IOSTANDARD="LVCMOS33"))
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("pmod", 0, "G17 G19 N18 L18 - - H17 H19 J19 K18 - -"), # JA
 
         # Pin 24/25 are VCC and GND
@@ -72,11 +75,12 @@ class _CmodA7Platform(XilinxPlatform):
             "vaux12_n":  "J2",
             "vaux12_p":  "H2"
         })
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call(["openFPGALoader",
+    def toolchain_program(self, products, name, *, device=None):
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command(["openFPGALoader",
+                *device_args("openFPGALoader", device),
                 "-b", "cmoda7_35t",
                 "{}".format(bitstream_filename)
             ])
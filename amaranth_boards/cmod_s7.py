@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 """
 Example Usage:
@@ -22,7 +25,7 @@ class CmodS7_Platform(XilinxPlatform):
     package     = "csga225"
     speed       = "1"
     default_clk = "clk12"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk12", 0, Pins("M9", dir="i"),
                  Clock(12e6), Attrs(IOSTANDARD="LVCMOS33")),
 
@@ -49,8 +52,8 @@ class CmodS7_Platform(XilinxPlatform):
         # May not be populated on the board
         Resource("atsha204a", 0, Pins("D17", dir="io"),
             Attrs(IOSTANDARD="LVCMOS33"))
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("pmod", 0, "J2 H2 H4 F3 - - H3 H1 G1 F4 - -"), # JA
 
         # Pin 24/25 are VCC and GND
@@ -70,12 +73,12 @@ class CmodS7_Platform(XilinxPlatform):
             "vaux12_n":  "A11",
             "vaux12_p":  "A12"
         })
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call(["openFPGALoader",
-                "-c", "digilent",
+    def toolchain_program(self, products, name, *, device=None):
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command(["openFPGALoader",
+                *device_args("openFPGALoader", device, cable="digilent"),
                 "--fpga-part", "xc7s25",
                 "{}".format(bitstream_filename)
             ])
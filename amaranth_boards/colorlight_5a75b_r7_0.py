@@ -1,9 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["Colorlight_5A75B_R70Platform"]
@@ -14,8 +18,10 @@ class Colorlight_5A75B_R70Platform(LatticeECP5Platform):
     package                = "BG256"
     speed                  = "6"
     default_clk            = "clk25"
+    config_interface = ConfigInterface(flash=None, size=None, max_clock=None, bus_width=1,
+                                       compression=True)
 
-    resources = [
+    resources = LazyTable(lambda cls: [
         Resource("clk25", 0, Pins("P6", dir="i"), Clock(25e6), Attrs(IO_TYPE="LVCMOS33")),
 
         *LEDResources(pins="P11", invert = True,
@@ -79,8 +85,8 @@ class Colorlight_5A75B_R70Platform(LatticeECP5Platform):
             Attrs(IO_TYPE="LVCMOS33")
         ),
 
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("j",  1, "F3  F1  G3  - G2  H3  H5  F15 L2 K1 J5 K2 B16 J14 F12 -"),
         Connector("j",  2, "J4  K3  G1  - K4  C2  E3  F15 L2 K1 J5 K2 B16 J14 F12 -"),
         Connector("j",  3, "H4  K5  P1  - R1  L5  F2  F15 L2 K1 J5 K2 B16 J14 F12 -"),
@@ -90,7 +96,7 @@ class Colorlight_5A75B_R70Platform(LatticeECP5Platform):
         Connector("j",  7, "H13 J13 H12 - G14 H14 G15 F15 L2 K1 J5 K2 B16 J14 F12 -"),
         Connector("j",  8, "A15 F16 A14 - E13 B14 A13 F15 L2 K1 J5 K2 B16 J14 F12 -"),
         Connector("j", 19, " -  M13  -  - P11"),
-    ]
+    ])
 
     @property
     def required_tools(self):
@@ -98,15 +104,18 @@ class Colorlight_5A75B_R70Platform(LatticeECP5Platform):
             "openFPGALoader"
         ]
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, **kwargs):
         overrides = dict(ecppack_opts="--compress")
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
         overrides.update(kwargs)
         return super().toolchain_prepare(fragment, name, **overrides)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         tool = os.environ.get("OPENFPGALOADER", "openFPGALoader")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([tool, "-c", "ft232", "-m", bitstream_filename])
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([tool, *device_args("openFPGALoader", device, cable="ft232"),
+                         "-m", bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 import os
-import subprocess
 import shutil
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 __all__ = ["ColorLightI9Platform"]
 
@@ -13,8 +17,10 @@ class ColorLightI9Platform(LatticeECP5Platform):
     speed                  = "8"
     default_clk            = "clk25"
     device                 = "LFE5U-45F"
+    config_interface = ConfigInterface(flash=None, size=None, max_clock=None, bus_width=1,
+                                       compression=True)
 
-    resources = [
+    resources = LazyTable(lambda cls: [
         Resource("clk25", 0, Pins("P3", dir="i"), Clock(25e6), Attrs(IO_TYPE="LVCMOS33")),
 
         *LEDResources(pins="L2",
@@ -45,9 +51,9 @@ class ColorLightI9Platform(LatticeECP5Platform):
             dq="B6 A5 A6 A7 C7 B8 B5 A8 D8 D7 E8 D6 C6 D5 E7 C5 C10 D9 E11 D11 C11 D12 E9 C12 E14 C15 E13 D15 E12 B17 D14 D13",
             attrs=Attrs(PULLMODE="NONE", DRIVE="4", SLEWRATE="FAST", IO_TYPE="LVCMOS33")
         ),
-    ]
+    ])
 
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("ddr2-sodimm-200p", 0, (
             "-   -   -   -   -   -   -   -   -   -   " #   1- 10
             "-   -   -   -   -   -   -   -   -   -   " #  11- 20
@@ -70,7 +76,7 @@ class ColorLightI9Platform(LatticeECP5Platform):
             "-   -   -   -   -   -   -   -   -   A4  " # 181-190
             "D10 M5  E10 C9  -   A15 -   -   -   -   " # 191-200
             ))
-    ]
+    ])
 
     @property
     def required_tools(self):
@@ -78,15 +84,18 @@ class ColorLightI9Platform(LatticeECP5Platform):
             "openFPGALoader"
         ]
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, **kwargs):
         overrides = dict(ecppack_opts="--compress")
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
         overrides.update(kwargs)
         return super().toolchain_prepare(fragment, name, **overrides)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         tool = os.environ.get("OPENFPGALOADER", "openFPGALoader")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([tool, '-m', bitstream_filename])
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([tool, *device_args("openFPGALoader", device),
+                         '-m', bitstream_filename])
 
 if __name__ == "__main__":
     from .test.blinky import *
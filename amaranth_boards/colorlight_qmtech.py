@@ -1,13 +1,17 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from .config import fast_config_overrides
 
 from amaranth_boards.qmtech_daughterboard import QMTechDaughterboard
 from amaranth_boards.colorlight_i5 import ColorLightI5Platform
 from amaranth_boards.colorlight_i9 import ColorLightI9Platform
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 __all__ = ["ColorlightQMTechPlatform"]
 
@@ -25,12 +29,14 @@ class ColorlightQMTechPlatform(LatticeECP5Platform):
     resources      = []
     connectors     = []
     toolchain      = "Trellis"
+    config_interface = None
 
     def __init__(self, colorlight, daughterboard=False, extra_resources=None, test=False) -> None:
         self.package        = colorlight.package
         self.speed          = colorlight.speed
         self.default_clk    = colorlight.default_clk
         self.device         = colorlight.device
+        self.config_interface = colorlight.config_interface
 
         assert not (daughterboard and test), "daughterboard and test cannot be active at the same time"
 
@@ -58,7 +64,7 @@ class ColorlightQMTechPlatform(LatticeECP5Platform):
     # daughterboard they stay the same, which we need to connect the
     # daughterboard peripherals to the core board.
     # On this board J2 is J2 and J3 is J1
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("J", 2, {
              # odd row     even row
               "7": "T1",    "8": "U1",
@@ -118,7 +124,7 @@ class ColorlightQMTechPlatform(LatticeECP5Platform):
             "55": "E2",    "56": "D1",
             "57": "F2",    "58": "E1",
         })
-    ]
+    ])
 
     @property
     def required_tools(self):
@@ -126,15 +132,18 @@ class ColorlightQMTechPlatform(LatticeECP5Platform):
             "openFPGALoader"
         ]
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, **kwargs):
         overrides = dict(ecppack_opts="--compress")
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
         overrides.update(kwargs)
         return super().toolchain_prepare(fragment, name, **overrides)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         tool = os.environ.get("OPENFPGALOADER", "openFPGALoader")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([tool, '-m', bitstream_filename])
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([tool, *device_args("openFPGALoader", device),
+                         '-m', bitstream_filename])
 
 if __name__ == "__main__":
     from .test.blinky import *
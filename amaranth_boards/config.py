@@ -0,0 +1,64 @@
+from collections import namedtuple
+
+from ._overrides import append_override
+
+
+__all__ = ["ConfigInterface", "fast_config_overrides"]
+
+
+class ConfigInterface(namedtuple("ConfigInterface",
+                                 ("flash", "size", "max_clock", "bus_width", "compression"))):
+    """How a board configures its FPGA from flash at power-up.
+
+    ``flash`` is the configuration flash part (or ``None`` if it varies or is not known),
+    ``size`` its size in MiB, ``max_clock`` the fastest configuration clock the board is known
+    to work with, in MHz and as accepted by the vendor tool (or ``None`` to keep the tool's
+    default), ``bus_width`` the SPI bus width in bits, and ``compression`` whether the
+    bitstream can be compressed.
+    """
+
+
+def _vivado_overrides(config, overrides):
+    script = []
+    if config.compression:
+        script.append("set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]")
+    if config.max_clock is not None:
+        script.append("set_property BITSTREAM.CONFIG.CONFIGRATE {} [current_design]"
+                      .format(config.max_clock))
+    script.append("set_property BITSTREAM.CONFIG.SPI_BUSWIDTH {} [current_design]"
+                  .format(config.bus_width))
+    if config.size is not None and config.size > 16:
+        script.append("set_property BITSTREAM.CONFIG.SPI_32BIT_ADDR YES [current_design]")
+    append_override(overrides, "script_before_bitstream", "\n".join(script))
+
+
+def _trellis_overrides(config, overrides):
+    opts = []
+    if config.compression:
+        opts.append("--compress")
+    if config.bus_width == 4:
+        opts += ["--spimode", "qspi"]
+    elif config.bus_width == 2:
+        opts += ["--spimode", "dual-spi"]
+    if config.max_clock is not None:
+        opts += ["--freq", str(config.max_clock)]
+    # ecppack rejects options given twice, so these replace the board's defaults.
+    overrides["ecppack_opts"] = " ".join(opts)
+
+
+def fast_config_overrides(platform, **overrides):
+    """Return ``overrides``, changed so that the bitstream configures the FPGA as fast as
+    ``platform.config_interface`` allows.
+    """
+    config = getattr(platform, "config_interface", None)
+    if config is None:
+        raise ValueError("{} does not declare a configuration interface, so fast configuration "
+                         "is not supported".format(type(platform).__name__))
+    if platform.toolchain == "Vivado":
+        _vivado_overrides(config, overrides)
+    elif platform.toolchain == "Trellis":
+        _trellis_overrides(config, overrides)
+    else:
+        raise ValueError("Fast configuration is not supported for the {} toolchain"
+                         .format(platform.toolchain))
+    return overrides
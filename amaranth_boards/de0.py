@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["DE0Platform"]
@@ -14,7 +17,7 @@ class DE0Platform(IntelPlatform):
     package     = "F484"   # FBGA-484
     speed       = "C6"
     default_clk = "clk50"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("G21", dir="i"),
                  Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
         Resource("clk50", 1, Pins("B12", dir="i"),
@@ -85,8 +88,8 @@ class DE0Platform(IntelPlatform):
             a="P7 P5 P6 N7 N5 N6 M8 M4 P2 N2 N1 M3 M2 M1 L7 L6 AA2 M5 M6 P1 P3 R2",
             dq="R7 P8 R8 U1 V2 V3 W1 Y1 T5 T7 T4 U2 V1 V4 W2 Y2",
             attrs=Attrs(io_standard="3.3-V LVTTL")),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("j", 4,
             "AB12 AB16 AA12 AA16 AA15 AB15 AA14 AB14 AB13 AA13 -    -    "
             "AB10 AA10 AB8  AA8  AB5  AA5  AB3  AB4  AA3  AA4  V14  U14  "
@@ -97,13 +100,14 @@ class DE0Platform(IntelPlatform):
             "Y17  W17  U15  T15  W15  V15  R16  AB9  T16  AA9  AA7  AB7  "
             "T14  R14  U12  T12  -    -    R11  R12  U10  T10  U9   T9   "
             "Y7   U8   V6   V7  "),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                   "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                         "--operation", "P;" + bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["DE0CVPlatform"]
@@ -14,7 +17,7 @@ class DE0CVPlatform(IntelPlatform):
     package     = "F23"    # FBGA-484
     speed       = "C7"
     default_clk = "clk50"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("M9", dir="i"),
                  Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
         Resource("clk50", 1, Pins("H13", dir="i"),
@@ -73,8 +76,8 @@ class DE0CVPlatform(IntelPlatform):
             ba="T7 AB7", a="W8 T8 U11 Y10 N6 AB10 P12 P7 P8 R5 U8 P6 R7",
             dq="Y9 T10 R9 Y11 R10 R11 R12 AA12 AA9 AB8 AA8 AA7 V10 V9 U10 T9", dqm="U12 N8",
             attrs=Attrs(io_standard="3.3-V LVCMOS")),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("j", 1,
             "N16  B16  M16  C16  D17  K20  K21  K22  M20  M21  "
             "-    -    N21  R22  R21  T22  N20  N19  M22  P19  "
@@ -85,13 +88,14 @@ class DE0CVPlatform(IntelPlatform):
             "-    -    H18  J18  J19  G11  H10  J11  H14  A15  "
             "J13  L8   A14  B15  C15  E14  E15  E16  -    -    "
             "F14  F15  F13  F12  G16  G15  G13  G12  J17  K16  "),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                   "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                         "--operation", "P;" + bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 
 __all__ = ["DE0NanoPlatform"]
@@ -14,7 +17,7 @@ class DE0NanoPlatform(IntelPlatform):
     package     = "F17"
     speed       = "C6"
     default_clk = "clk50"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("R8", dir="i"),
             Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
 
@@ -64,19 +67,20 @@ class DE0NanoPlatform(IntelPlatform):
             Subsignal("ncs0",  Pins("D2")),
             Subsignal("asd0",  Pins("C1")),
             Attrs(io_standard="3.3-V LVTTL")),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         # PIN               1  2   3   4   5   6   7   8   9   10  11  12  13  14  15  16  17  18 19 20  21  22  23  24  25  26  27  28 29 30 31  32  33  34  35  36  37  38  39  40
         Connector("JP", 1, "A8 D3  B8  C3  A2  A3  B3  B4  A4  B5  -   -   A5  D5  B6  A6  B7  D6 A7 C6  C8  E6  E7  D8  E8  F8  F9  E9  - -  C9  D9  E11 E10 C11 B11 A12 D11 D12 B12"),
         Connector("JP", 2, "T9 F13 R9  T15 T14 T13 R13 T12 R12 T11 -   -   T10 R11 P11 R10 N12 P9 N9 N11 L16 K16 R16 L15 P15 P16 R14 N16 - -  N15 P14 L14 N14 M10 L13 J16 K15 J13 J14"),
         Connector("JP", 3, "-  E15 E16 M16 A14 B16 C14 C16 C15 D16 D15 D14 F15 F16 F14 G16 G15 -  -  -   -   -   -   -   -   -")
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                    "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                          "--operation", "P;" + bitstream_filename])
 
 if __name__ == "__main__":
     from amaranth_boards.test.blinky import Blinky
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["DE10LitePlatform"]
@@ -15,7 +18,7 @@ class DE10LitePlatform(IntelPlatform):
     speed       = "C7"
     suffix      = "G"
     default_clk = "clk50"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk10", 0, Pins("N5", dir="i"),
                  Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
         Resource("clk50", 0, Pins("P11", dir="i"),
@@ -68,20 +71,21 @@ class DE10LitePlatform(IntelPlatform):
             b="P1 T1 P4 N2",
             hs="N3", vs="N1",
             attrs=Attrs(io_standard="3.3-V LVTTL"))
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("gpio", 0,
             "V10 W10 V9 W9 V8 W8 V7 W7 W6 V5 W5 AA15 AA14 W13 W12 AB13 AB12 Y11 AB11 W11 AB10 "
             "AA10 AA9 Y8 AA8 Y7 AA7 Y6 AA6 Y5 AA5 Y4 AB3 Y3 AB2 AA2"),
         Connector("gpio", 5,
             "AB5 AB6 AB7 AB8 AB9 Y10 AA11 AA12 AB17 AA17 AB19 AA19 Y19 AB20 AB21 AA20 F16"),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                   "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                         "--operation", "P;" + bitstream_filename])
 
 
 if __name__ == "__main__":
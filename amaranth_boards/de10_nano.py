@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["DE10NanoPlatform"]
@@ -15,7 +18,7 @@ class DE10NanoPlatform(IntelPlatform):
     package     = "U23"     # UBGA-484
     speed       = "I7"
     default_clk = "clk50"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("V11", dir="i"),
                  Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
         Resource("clk50", 1, Pins("Y13", dir="i"),
@@ -61,8 +64,8 @@ class DE10NanoPlatform(IntelPlatform):
             Subsignal("scl", Pins("U10", dir="io")),
             Subsignal("sda", Pins("AA4", dir="io")),
             Attrs(io_standard="3.3-V LVTTL")),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         # Located on the top of the board, above the chip.
         Connector("gpio", 0,
             "V12  E8   W12  D11  D8   AH13 AF7  AH14 AF4  AH3  "
@@ -79,15 +82,16 @@ class DE10NanoPlatform(IntelPlatform):
             "AG13 AF13 AG10 AG9  U14  U13  AG8  AH8  "
             "AF17 AE15 AF15 AG16 AH11 AH12 AH9  AG11 "
             "AH7"),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
             # The @2 selects the second device in the JTAG chain, because this chip
             # puts the ARM cores first.
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                   "--operation", "P;" + bitstream_filename + "@2"])
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                         "--operation", "P;" + bitstream_filename + "@2"])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["DE1SoCPlatform"]
@@ -14,7 +17,7 @@ class DE1SoCPlatform(IntelPlatform):
     package     = "F31"     # FBGA-896
     speed       = "C6"
     default_clk = "clk50"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("AF14", dir="i"),
                  Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
         Resource("clk50", 1, Pins("AA16", dir="i"),
@@ -57,8 +60,8 @@ class DE1SoCPlatform(IntelPlatform):
             a="V25", b="AA28", c="Y27", d="AB27", e="AB26",
             f="AA26", g="AA25", invert=True,
             attrs=Attrs(io_standard="3.3-V LVTTL")),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         # Located on the right hand side of the board
         Connector("gpio", 0,
             "AC18 Y17  AD17 Y18  AK16 AK18 AK19 AJ19 AJ17 AJ16 "
@@ -71,15 +74,16 @@ class DE1SoCPlatform(IntelPlatform):
             "-    -    AG26 AH24 AH27 AJ27 AK29 AK28 AK27 AJ26 "
             "AK26 AH25 AJ25 AJ24 AK24 AG23 AK23 AH23  -    -   "
             "AK22 AJ22 AH22 AG22 AF24 AF23 AE22 AD21 AA20 AC22 "),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
             # The @2 selects the second device in the JTAG chain, because this chip
             # puts the ARM cores first.
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                   "--operation", "P;" + bitstream_filename + "@2"])
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                         "--operation", "P;" + bitstream_filename + "@2"])
 
 
 if __name__ == "__main__":
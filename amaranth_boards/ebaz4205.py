@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["EBAZ4205Platform"]
@@ -14,7 +17,7 @@ class EBAZ4205Platform(XilinxPlatform):
     package     = "clg400"
     speed       = "1"
     default_clk = "clk33_333"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk33_333", 0,
             Pins("N18", dir="i"), Clock(33.333e6), Attrs(IOSTANDARD="LVCMOS33")),
 
@@ -25,14 +28,15 @@ class EBAZ4205Platform(XilinxPlatform):
         UARTResource(0,
             rx="B19", tx="B20",
             attrs=Attrs(IOSTANDARD="LVCMOS33")),
-    ]
+    ])
     connectors = [
     ]
 
-    def toolchain_program(self, products, name, **kwargs):
+    def toolchain_program(self, products, name, *, device=None, **kwargs):
         xc3sprog = os.environ.get("XC3SPROG", "xc3sprog")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.run([xc3sprog, "-c", "jtaghs1_fast", "-p", "1", bitstream_filename], check=True)
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([xc3sprog, *device_args("xc3sprog", device, cable="jtaghs1_fast"),
+                         "-p", "1", bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ECP55GEVNPlatform"]
@@ -42,7 +44,7 @@ class ECP55GEVNPlatform(LatticeECP5Platform):
     def bank6_iostandard(self):
         return self._vccio_to_iostandard(self._VCCIO6)
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("rst", 0, PinsN("G2", dir="i"), Attrs(IO_TYPE="LVCMOS33")),
         Resource("clk12", 0, Pins("A10", dir="i"),
                  Clock(12e6), Attrs(IO_TYPE="LVCMOS33")),
@@ -52,13 +54,13 @@ class ECP55GEVNPlatform(LatticeECP5Platform):
                  Attrs(IO_TYPE="LVCMOS33")),
 
         *LEDResources(pins="A13 A12 B19 A18 B18 C17 A17 B17", invert=True,
-                      attrs=Attrs(IO_TYPE=bank1_iostandard)),
+                      attrs=Attrs(IO_TYPE=cls.bank1_iostandard)),
         *ButtonResources(pins="P4", invert=True,
-                         attrs=Attrs(IO_TYPE=bank6_iostandard)),
+                         attrs=Attrs(IO_TYPE=cls.bank6_iostandard)),
         *SwitchResources(pins={1: "J1", 2: "H1", 3: "K1"}, invert=True,
-                         attrs=Attrs(IO_TYPE=bank6_iostandard)),
+                         attrs=Attrs(IO_TYPE=cls.bank6_iostandard)),
         *SwitchResources(pins={4: "E15", 5: "D16", 6: "B16", 7: "C16", 8: "A16"}, invert=True,
-                         attrs=Attrs(IO_TYPE=bank1_iostandard)),
+                         attrs=Attrs(IO_TYPE=cls.bank1_iostandard)),
 
         # In order to use the UART as a UART you need to swap two resistor jumpers,
         # and potentially reconfigure the onboard FTDI chip, see section 6.2 in the
@@ -66,7 +68,7 @@ class ECP55GEVNPlatform(LatticeECP5Platform):
         # https://github.com/trabucayre/fixFT2232_ecp5evn to reconfigure the FTDI.
         UARTResource(0,
             rx="P2", tx="P3",
-            attrs=Attrs(IO_TYPE=bank6_iostandard, PULLMODE="UP")
+            attrs=Attrs(IO_TYPE=cls.bank6_iostandard, PULLMODE="UP")
         ),
 
         *SPIFlashResources(0,
@@ -95,8 +97,8 @@ class ECP55GEVNPlatform(LatticeECP5Platform):
         Resource("serdes_clk", 1, DiffPairs("Y19", "W20", dir="i")), # 200 MHz
 
         # TODO: add other resources
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         # Expansion connectors
         Connector("J", 39, "- - - D15 B15 C15 B13 B20 D11 E11 B12 C12 D12 E12 C13 D13 E13 A14 A9 B10 - - - - - - - - E7 - A11 - A19 - - - - - - -"),
         Connector("J", 40, "K2 - A15 F1 H2 G1 J4 J5 J3 K3 L4 L5 M4 N5 N4 P5 N3 M3 - - K5 - M5 - L3 - N2 M1 L2 - L1 N1 C14 - P1 E14 D14 - K4 -"),
@@ -120,7 +122,7 @@ class ECP55GEVNPlatform(LatticeECP5Platform):
         Connector("J", 1, "- V4 R5 - - U5 - T5"),
         # Parallel configuration
         Connector("J", 38, "W3 R2 T3 Y3 R1 V3 T1 V2 U1 W2 V1 T2 W1 U2 Y2 R2 U3 R3 - -"), # Connect pin 2 / R2 with jumper when needed
-    ]
+    ])
 
     @property
     def file_templates(self):
@@ -141,9 +143,9 @@ class ECP55GEVNPlatform(LatticeECP5Platform):
 
     def toolchain_program(self, products, name):
         openocd = os.environ.get("OPENOCD", "openocd")
-        with products.extract("{}-openocd.cfg".format(name), "{}.svf".format(name)) \
+        with extract(products, "{}-openocd.cfg".format(name), "{}.svf".format(name)) \
                 as (config_filename, vector_filename):
-            subprocess.check_call([openocd,
+            run_command([openocd,
                 "-f", config_filename,
                 "-c", "transport select jtag; init; svf -quiet {}; exit".format(vector_filename)
             ])
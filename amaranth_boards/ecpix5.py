@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ECPIX585Platform", "ECPIX545Platform"]
@@ -15,7 +18,7 @@ class _ECPIX5Platform(LatticeECP5Platform):
     default_clk = "clk100"
     default_rst = "rst"
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("rst", 0, PinsN("AB1", dir="i"), Attrs(IO_TYPE="LVCMOS33")),
         Resource("clk100", 0, Pins("K23", dir="i"), Clock(100e6), Attrs(IO_TYPE="LVCMOS33")),
 
@@ -108,9 +111,9 @@ class _ECPIX5Platform(LatticeECP5Platform):
             Subsignal("lnd",   DiffPairs( "AF6",  "AF7", dir="i"), Attrs(IO_TYPE="LVCMOS18D")),
             Attrs(IO_TYPE="LVCMOS33")
         ),
-    ]
+    ])
 
-    connectors  = [
+    connectors  = LazyTable(lambda cls: [
         Connector("pmod", 0, "T25 U25 U24 V24 - - T26 U26 V26 W26 - -"),
         Connector("pmod", 1, "U23 V23 U22 V21 - - W25 W24 W23 W22 - -"),
         Connector("pmod", 2, "J24 H22 E21 D18 - - K22 J21 H21 D22 - -"),
@@ -119,18 +122,19 @@ class _ECPIX5Platform(LatticeECP5Platform):
         Connector("pmod", 5, "D19 C21 B21 C22 - - D21 A21 A22 A23 - -"),
         Connector("pmod", 6, "C16 B17 C18 B19 - - A17 A18 A19 C19 - -"),
         Connector("pmod", 7, "D14 B14 E14 B16 - - C14 A14 A15 A16 - -"),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
-        import os, subprocess
+    def toolchain_program(self, products, name, *, device=None):
+        import os
         tool = os.environ.get("OPENFPGALOADER", "openFPGALoader")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([tool, '-c', 'ft2232', '-m', bitstream_filename])
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([tool, *device_args("openFPGALoader", device, cable="ft2232"),
+                         '-m', bitstream_filename])
 
 class ECPIX545Platform(_ECPIX5Platform):
     device      = "LFE5UM5G-45F"
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         *_ECPIX5Platform.resources,
 
         # The IT6613E HDMI transmitter has access to 8 bits per color channel.
@@ -154,13 +158,13 @@ class ECPIX545Platform(_ECPIX5Platform):
             Subsignal("int",   PinsN("C4", dir="i")),
             Attrs(IO_TYPE="LVTTL33")
         ),
-    ]
+    ])
 
 
 class ECPIX585Platform(_ECPIX5Platform):
     device      = "LFE5UM5G-85F"
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         *_ECPIX5Platform.resources,
 
         # The IT6613E HDMI transmitter has access to 12 bits per color channel. The LFE5UM5G-85F
@@ -185,7 +189,7 @@ class ECPIX585Platform(_ECPIX5Platform):
             Subsignal("int",   PinsN("C4", dir="i")),
             Attrs(IO_TYPE="LVTTL33")
         ),
-    ]
+    ])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+import os
+import re
+import sys
+import argparse
+import tempfile
+import subprocess
+
+from .program import Device, _device_lock
+
+
+__all__ = ["FlashState", "compose", "changed_sectors", "program_flash"]
+
+
+class FlashState:
+    """A copy, kept in the directory ``path``, of what was last written to the configuration
+    flash of each device.
+
+    As with :class:`~amaranth_boards.program.ProgramState`, devices are identified by their
+    :class:`~amaranth_boards.program.Device` selector, and flash written by other means is not
+    noticed; :meth:`forget` a device whose flash may have changed.
+    """
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+    def _image_path(self, device):
+        return os.path.join(self.path, "{}.img".format(re.sub(r"[^\w.-]", "_", str(device))))
+
+    def get(self, device):
+        """Return the image last written to ``device``, or ``None``."""
+        try:
+            with open(self._image_path(device), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def record(self, device, image):
+        """Record that ``device`` holds ``image``."""
+        os.makedirs(self.path, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=self.path)
+        with os.fdopen(fd, "wb") as f:
+            f.write(image)
+        os.replace(temp, self._image_path(device))
+
+    def forget(self, device):
+        """Forget what ``device`` holds, so that it is written in full next time."""
+        try:
+            os.unlink(self._image_path(device))
+        except FileNotFoundError:
+            pass
+
+
+def compose(regions, fill=0xff):
+    """Lay out ``regions``, a list of ``(offset, data)`` pairs, in a single flash image; gaps
+    between them are filled with ``fill`` (the contents of erased flash).
+
+    This is used to place user data after the bitstream, e.g.
+    ``compose([(0, bitstream), (0x100000, data)])``.
+    """
+    image = bytearray()
+    end = 0
+    for offset, data in sorted(regions, key=lambda region: region[0]):
+        if offset < end:
+            raise ValueError("Flash region at {:#x} overlaps the previous one, which ends at "
+                             "{:#x}".format(offset, end))
+        image += bytes([fill]) * (offset - end) + data
+        end = offset + len(data)
+    return bytes(image)
+
+
+def changed_sectors(old, new, sector_size):
+    """Return the ``(offset, length)`` runs of whole sectors in which ``new`` differs from
+    ``old`` (or all of ``new``, if ``old`` is ``None``).
+
+    Where ``new`` is shorter than ``old``, the rest of ``old`` is assumed to stay in place;
+    a sector that ``new`` only partly covers is compared, and rewritten, with that rest.
+    """
+    if old is not None:
+        new = new + old[len(new):]
+    runs = []
+    for offset in range(0, len(new), sector_size):
+        sector = new[offset:offset + sector_size]
+        if old is not None and old[offset:offset + sector_size] == sector:
+            continue
+        if runs and runs[-1][0] + runs[-1][1] == offset:
+            runs[-1] = (runs[-1][0], runs[-1][1] + len(sector))
+        else:
+            runs.append((offset, len(sector)))
+    return runs
+
+
+def program_flash(platform, image, device=None, *, state=None, sector_size=0x10000):
+    """Write ``image`` to the configuration flash of ``device`` (or of the first device found,
+    if ``None``) with ``platform.toolchain_program_flash``.
+
+    If ``state`` (a :class:`FlashState`) holds what was last written to ``device``, only the
+    ``sector_size`` sectors that changed are erased and written. ``sector_size`` must not be
+    smaller than the sectors the board's programmer erases (64 KiB for ``iceprog``, and for
+    ``openFPGALoader`` with most flash chips). Returns the ``(offset, length)`` runs that were
+    written.
+    """
+    if not hasattr(platform, "toolchain_program_flash"):
+        raise ValueError("{} cannot program its configuration flash"
+                         .format(type(platform).__name__))
+    image = bytes(image)
+    with _device_lock(device):
+        old = None
+        if state is not None and device is not None:
+            old = state.get(device)
+            # If writing fails partway, what the flash holds is no longer known.
+            state.forget(device)
+        runs = changed_sectors(old, image, sector_size)
+        merged = image if old is None else image + old[len(image):]
+        kwargs = {} if device is None else {"device": device}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for offset, length in runs:
+                filename = os.path.join(temp_dir, "{:08x}.bin".format(offset))
+                with open(filename, "wb") as f:
+                    f.write(merged[offset:offset + length])
+                platform.toolchain_program_flash(filename, offset=offset, **kwargs)
+        if state is not None and device is not None:
+            state.record(device, merged)
+    return runs
+
+
+def _region(spec):
+    offset, sep, path = spec.partition(":")
+    if not sep:
+        raise argparse.ArgumentTypeError("{!r} is not OFFSET:FILE".format(spec))
+    try:
+        offset = int(offset, 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError("{!r} is not a valid offset".format(offset)) from None
+    return offset, path
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def main():
+    from . import get_platform
+
+    parser = argparse.ArgumentParser(prog="python -m {}".format(__spec__.name),
+        description="Write a bitstream, and optionally user data, to the configuration flash "
+                    "of a board, erasing and writing only the sectors that changed.")
+    parser.add_argument("platform", metavar="PLATFORM",
+        help="platform name (e.g. `icebreaker`)")
+    parser.add_argument("-b", "--build-dir", metavar="DIR", default="build",
+        help="write the flash image `NAME.bin` built in DIR (default: %(default)s)")
+    parser.add_argument("-n", "--name", metavar="NAME", default="top",
+        help="name of the design (default: %(default)s)")
+    parser.add_argument("--data", metavar="OFFSET:FILE", type=_region, action="append",
+        default=[],
+        help="also write the contents of FILE at OFFSET; may be repeated")
+    parser.add_argument("-d", "--device", metavar="DEVICE",
+        help="program DEVICE instead of the first device found")
+    parser.add_argument("--state", metavar="DIR",
+        help="keep a copy of what was written to each device in DIR, and only write the "
+             "sectors that changed since")
+    parser.add_argument("--sector-size", metavar="BYTES", type=lambda x: int(x, 0),
+        default=0x10000,
+        help="compare and write the flash in sectors of BYTES (default: %(default)s)")
+    args = parser.parse_args()
+
+    try:
+        platform = get_platform(args.platform)()
+        device = None if args.device is None else Device.parse(args.device)
+        regions = [(0, os.path.join(args.build_dir, "{}.bin".format(args.name)))]
+        regions += args.data
+        image = compose([(offset, _read(path)) for offset, path in regions])
+    except (OSError, KeyError, ValueError) as e:
+        parser.error(str(e))
+    if args.state is not None and device is None:
+        parser.error("--state requires --device")
+    state = None if args.state is None else FlashState(args.state)
+
+    try:
+        runs = program_flash(platform, image, device, state=state,
+                             sector_size=args.sector_size)
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        sys.exit(str(e))
+    written = sum(length for offset, length in runs)
+    print("Wrote {} of {} bytes in {} run(s)".format(written, len(image), len(runs)))
+
+
+if __name__ == "__main__":
+    main()
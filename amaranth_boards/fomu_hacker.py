@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["FomuHackerPlatform"]
@@ -13,7 +16,7 @@ class FomuHackerPlatform(LatticeICE40Platform):
     device      = "iCE40UP5K"
     package     = "UWG30"
     default_clk = "clk48"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk48", 0, Pins("F5", dir="i"),
                  Clock(48e6), Attrs(GLOBAL=True, IO_STANDARD="SB_LVCMOS")),
 
@@ -31,19 +34,20 @@ class FomuHackerPlatform(LatticeICE40Platform):
             cs_n="C1", clk="D1", copi="F1", cipo="E1",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS"),
         ),
-    ]
+    ])
 
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("pin", 0, "F4"),
         Connector("pin", 1, "E5"),
         Connector("pin", 2, "E4"),
         Connector("pin", 3, "F2"),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         dfu_util = os.environ.get("DFU_UTIL", "dfu-util")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([dfu_util, "-D", bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([dfu_util, *device_args("dfu-util", device),
+                         "-D", bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["FomuPVTPlatform"]
@@ -13,7 +16,7 @@ class FomuPVTPlatform(LatticeICE40Platform):
     device      = "iCE40UP5K"
     package     = "UWG30"
     default_clk = "clk48"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk48", 0, Pins("F4", dir="i"),
                  Clock(48e6), Attrs(GLOBAL=True, IO_STANDARD="SB_LVCMOS")),
 
@@ -36,14 +39,15 @@ class FomuPVTPlatform(LatticeICE40Platform):
         Resource("touch", 1, Pins("D5")),
         Resource("touch", 2, Pins("E5")),
         Resource("touch", 3, Pins("F5")),
-    ]
+    ])
 
     connectors = []
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         dfu_util = os.environ.get("DFU_UTIL", "dfu-util")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([dfu_util, "-D", bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([dfu_util, *device_args("dfu-util", device),
+                         "-D", bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .bram import bram_overrides
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["Genesys2Platform"]
@@ -28,7 +32,9 @@ class Genesys2Platform(XilinxPlatform):
 
     default_rst = "rst"
     default_clk = "clk"
-    resources = [
+    config_interface = ConfigInterface(flash="S25FL256S", size=32, max_clock=50, bus_width=4,
+                                       compression=True)
+    resources = LazyTable(lambda cls: [
         Resource("rst", 0, PinsN("R19", dir="i"),
                  Attrs(IOSTANDARD="LVCMOS33")),
         Resource("clk", 0, DiffPairs(p="AD12 ", n="AD11", dir="i"),
@@ -38,9 +44,9 @@ class Genesys2Platform(XilinxPlatform):
                 1: "B19",
                 2: "C19",
                 3: "M19",
-                4: "M20"}, attrs=Attrs(IOSTANDARD=bank15_16_17_iostandard)),
+                4: "M20"}, attrs=Attrs(IOSTANDARD=cls.bank15_16_17_iostandard)),
         *SwitchResources(pins="G19 G25 H24 K19 N19 P19",
-                         attrs=Attrs(IOSTANDARD=bank15_16_17_iostandard)),
+                         attrs=Attrs(IOSTANDARD=cls.bank15_16_17_iostandard)),
         *SwitchResources(pins={
                 6: "P26",
                 7: "P27"}, attrs=Attrs(IOSTANDARD="LVCMOS33")),
@@ -154,9 +160,9 @@ class Genesys2Platform(XilinxPlatform):
                  Subsignal("rx_clk", Pins("AG10", dir="i")),
                  Subsignal("rx_ctl", Pins("AH11", dir="i")),
                  Subsignal("rx_data", Pins("AJ14 AH14 AK13 AJ13", dir="i")),
-                 Attrs(IOSTANDARD="LVCMOS15"))]
+                 Attrs(IOSTANDARD="LVCMOS15"))])
 
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("pmod", 0,  # JA
                   "U27 U28 T26 T27 - - "
                   "T22 T23 T20 T21 - -"),
@@ -314,9 +320,10 @@ class Genesys2Platform(XilinxPlatform):
                    "ha21_p": "G28",
                    "ha21_n": "F28",
                    "ha23_p": "G18",
-                   "ha23_n": "F18"})]
+                   "ha23_n": "F18"})])
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False,
+                          patchable_memories=None, **kwargs):
         overrides = {
             "script_after_read": "auto_detect_xpm",
             "script_before_bitstream":
@@ -329,6 +336,10 @@ class Genesys2Platform(XilinxPlatform):
             set_property CFGBVS VCCO [current_design]
             set_property CONFIG_VOLTAGE 3.3 [current_design]
             """}
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
+        if patchable_memories is not None:
+            overrides = bram_overrides(self, name, patchable_memories, **overrides)
         return super().toolchain_prepare(
             fragment, name, **overrides, **kwargs)
 
@@ -349,10 +360,10 @@ class Genesys2Platform(XilinxPlatform):
 
     def toolchain_program(self, products, name):
         openocd = os.environ.get("OPENOCD", "openocd")
-        with products.extract("{}-openocd.cfg".format(name),
-                              "{}.bit".format(name)) as (
-                                  config_filename, bitstream_filename):
-            subprocess.check_call([
+        with extract(products, "{}-openocd.cfg".format(name),
+                     "{}.bit".format(name)) as (
+                             config_filename, bitstream_filename):
+            run_command([
                 openocd,
                 "-f", config_filename,
                 "-c", "init; pld load 0 {}; exit".format(bitstream_filename)])
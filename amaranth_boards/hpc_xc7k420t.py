@@ -1,9 +1,15 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
+from amaranth_boards.config import ConfigInterface, fast_config_overrides
+from amaranth_boards.multiboot import multiboot_overrides
+from amaranth_boards.bram import bram_overrides
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 __all__ = ["HPCStoreXC7K420TPlatform"]
 
@@ -16,6 +22,8 @@ class HPCStoreXC7K420TPlatform(XilinxPlatform):
     package     = "ffg901"
     speed       = "2"
     default_clk = "clk100"
+    config_interface = ConfigInterface(flash=None, size=32, max_clock=66, bus_width=4,
+                                       compression=True)
     IO_3V3      = True
 
     resources   = [ ]
@@ -28,7 +36,7 @@ class HPCStoreXC7K420TPlatform(XilinxPlatform):
         if io_voltage == "2.5V":
             self.IO_3V3 = False
 
-        self.resources += [
+        self.resources = self.resources + [
             Resource("clk100", 0, Pins("U24", dir="i"),
                     Clock(100e6), Attrs(IOSTANDARD=self.get_lvcmos())),
 
@@ -139,7 +147,7 @@ class HPCStoreXC7K420TPlatform(XilinxPlatform):
     #      │ 1                            79  │
     #      └──────────────────────────────────┘
     #
-    connectors  = [
+    connectors  = LazyTable(lambda cls: [
         # Connector on the SFP side
         Connector("BTB", 0, {
           # "1":  "GND",   "2": "GND",
@@ -227,9 +235,10 @@ class HPCStoreXC7K420TPlatform(XilinxPlatform):
           # "77": "VCC12V", "78": "VCC3.3V",
           # "79": "VCC12V", "80": "VCC3.3V",
         }),
-    ]
+    ])
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, multiboot=None,
+                          patchable_memories=None, **kwargs):
         overrides = {
             "script_before_bitstream":
                 """
@@ -248,12 +257,25 @@ class HPCStoreXC7K420TPlatform(XilinxPlatform):
                 "write_cfgmem -force -format bin -interface spix4 -size 32 "
                 "-loadbit \"up 0x0 {name}.bit\" -file {name}.bin".format(name=name),
         }
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
+        if multiboot is not None:
+            overrides = multiboot_overrides(self, *multiboot, **overrides)
+        if patchable_memories is not None:
+            overrides = bram_overrides(self, name, patchable_memories, **overrides)
         return super().toolchain_prepare(fragment, name, **overrides, **kwargs)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         loader = os.environ.get("OPENFPGALOADER", "openFPGALoader")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.run([loader, "-v", "-c", "ft232", bitstream_filename], check=True)
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([loader, *device_args("openFPGALoader", device, cable="ft232"),
+                         "-v", bitstream_filename])
+
+    def toolchain_program_flash(self, filename, *, offset=0, device=None):
+        loader = os.environ.get("OPENFPGALOADER", "openFPGALoader")
+        run_command([loader, *device_args("openFPGALoader", device, cable="ft232"),
+                     "--fpga-part", "{}{}".format(self.device, self.package),
+                     "-f", "-o", str(offset), filename])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ICE40HX1KBlinkEVNPlatform"]
@@ -13,7 +15,7 @@ class ICE40HX1KBlinkEVNPlatform(LatticeICE40Platform):
     device      = "iCE40HX1K"
     package     = "VQ100"
     default_clk = "clk3p3"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk3p3", 0, Pins("13", dir="i"), Clock(3.3e6),
                  Attrs(GLOBAL=True, IO_STANDARD="SB_LVCMOS")),
 
@@ -28,19 +30,19 @@ class ICE40HX1KBlinkEVNPlatform(LatticeICE40Platform):
             cs_n="49", clk="48", copi="45", cipo="46",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("pmod",  1, "10  9  8  7 - -  4  3  2  1 - -"), # J1
         Connector("pmod",  5, "40 42 62 64 - - 37 41 63 45 - -"), # J5
         Connector("pmod",  6, "25 24 21 20 - - 26 27 28 33 - -"), # J6
         Connector("pmod", 11, "49 45 46 48 - -"), # J11
         Connector("pmod", 12, "59 56 53 51 - -"), # J12
-    ]
+    ])
 
     def toolchain_program(self, products, name):
         iceburn = os.environ.get("ICEBURN", "iCEburn")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([iceburn, "-evw", bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([iceburn, "-evw", bitstream_filename])
 
 
 if __name__ == "__main__":
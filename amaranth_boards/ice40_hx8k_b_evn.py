@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ICE40HX8KBEVNPlatform"]
@@ -13,7 +16,7 @@ class ICE40HX8KBEVNPlatform(LatticeICE40Platform):
     device      = "iCE40HX8K"
     package     = "CT256"
     default_clk = "clk12"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk12", 0, Pins("J3", dir="i"),
                  Clock(12e6), Attrs(GLOBAL=True, IO_STANDARD="SB_LVCMOS")),
 
@@ -32,8 +35,8 @@ class ICE40HX8KBEVNPlatform(LatticeICE40Platform):
             cs_n="R12", clk="R11", copi="P12", cipo="P11",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("j", 1, # J1
             "A16 -   A15 B15 B13 B14 -   -   B12 B11 "
             "A11 B10 A10 C9  -   -   A9  B9  B8  A7  "
@@ -54,13 +57,14 @@ class ICE40HX8KBEVNPlatform(LatticeICE40Platform):
             "M2  M1  L3  L1  -   -   K3  K1  J2  J1  "
             "H2  J3  -   -   G2  H1  F2  G1  E2  F1  "
             "-   -   D1  D2  C1  C2  B1  B2  -   -   "),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         iceprog = os.environ.get("ICEPROG", "iceprog")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
             # TODO: this should be factored out and made customizable
-            subprocess.check_call([iceprog, "-S", bitstream_filename])
+            run_command([iceprog, *device_args("iceprog", device),
+                         "-S", bitstream_filename])
 
 
 if __name__ == "__main__":
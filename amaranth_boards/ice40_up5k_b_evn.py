@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ICE40UP5KBEVNPlatform"]
@@ -13,7 +16,7 @@ class ICE40UP5KBEVNPlatform(LatticeICE40Platform):
     device      = "iCE40UP5K"
     package     = "SG48"
     default_clk = "clk12"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         # J51 must be connected to use clk12 (it is by default)
         Resource("clk12", 0, Pins("35", dir="i"),
                  Clock(12e6), Attrs(GLOBAL=True, IO_STANDARD="SB_LVCMOS")),
@@ -41,8 +44,8 @@ class ICE40UP5KBEVNPlatform(LatticeICE40Platform):
             cs_n="16", clk="15", copi="14", cipo="17",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("aardvark", 0, # J1
             "- - - - 14 - 15 17 16 -"),
         Connector("pmod", 0, # U6 (board), U11 (schematic)
@@ -53,12 +56,12 @@ class ICE40UP5KBEVNPlatform(LatticeICE40Platform):
             "- - 23 - 25 - 26 36 27 42 32 38 31 28 37 15 34 - 43 -"),
         Connector("j", 2, # 'Header C' (J3)
             "- 12 3 21 3 13 48 20 45 19 47 18 44 11 46 10 2 9 - 6"),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         iceprog = os.environ.get("ICEPROG", "iceprog")
-        with products.extract("{}.bin".format(name)) as bitstream_fn:
-            subprocess.check_call([iceprog, bitstream_fn])
+        with extract(products, "{}.bin".format(name)) as bitstream_fn:
+            run_command([iceprog, *device_args("iceprog", device), bitstream_fn])
 
 
 if __name__ == "__main__":
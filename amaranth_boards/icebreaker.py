@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ICEBreakerPlatform"]
@@ -13,7 +16,7 @@ class ICEBreakerPlatform(LatticeICE40Platform):
     device      = "iCE40UP5K"
     package     = "SG48"
     default_clk = "clk12"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk12", 0, Pins("35", dir="i"),
                  Clock(12e6), Attrs(GLOBAL=True, IO_STANDARD="SB_LVCMOS")),
 
@@ -33,12 +36,12 @@ class ICEBreakerPlatform(LatticeICE40Platform):
             cs_n="16", clk="15", copi="14", cipo="17", wp_n="12", hold_n="13",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS")
         ),
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("pmod", 0, " 4  2 47 45 - -  3 48 46 44 - -"),  # PMOD1A
         Connector("pmod", 1, "43 38 34 31 - - 42 36 32 28 - -"), # PMOD1B
         Connector("pmod", 2, "27 25 21 19 - - 26 23 20 18 - -"), # PMOD2
-    ]
+    ])
     # The attached LED/button section can be either used standalone or as a PMOD.
     # Attach to platform using:
     # p.add_resources(p.break_off_pmod)
@@ -62,10 +65,14 @@ class ICEBreakerPlatform(LatticeICE40Platform):
                          attrs=Attrs(IO_STANDARD="SB_LVCMOS")),
     ]
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
+        iceprog = os.environ.get("ICEPROG", "iceprog")
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([iceprog, *device_args("iceprog", device), bitstream_filename])
+
+    def toolchain_program_flash(self, filename, *, offset=0, device=None):
         iceprog = os.environ.get("ICEPROG", "iceprog")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([iceprog, bitstream_filename])
+        run_command([iceprog, *device_args("iceprog", device), "-o", str(offset), filename])
 
 
 if __name__ == "__main__":
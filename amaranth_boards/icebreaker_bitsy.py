@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ICEBreakerBitsyPlatform"]
@@ -13,7 +16,7 @@ class ICEBreakerBitsyPlatform(LatticeICE40Platform):
     device      = "iCE40UP5K"
     package     = "SG48"
     default_clk = "clk12"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk12", 0, Pins("35", dir="i"),
                  Clock(12e6), Attrs(GLOBAL=True, IO_STANDARD="SB_LVCMOS")),
 
@@ -32,8 +35,8 @@ class ICEBreakerBitsyPlatform(LatticeICE40Platform):
         Resource("led_g", 0, PinsN("6", dir="o"), Attrs(IO_STANDARD="SB_LVCMOS")),
 
         *ButtonResources(pins="2", invert=True, attrs=Attrs(IO_STANDARD="SB_LVCMOS")),
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("edge", 0,  # Pins bottom P0 - P12,
             {"0":"47",  "1":"44",  "2":"48",  "3":"45",  "4": "4",  "5": "3",
              "6": "9",  "7":"10",  "8":"11",  "9":"12", "10":"21", "11":"13",
@@ -43,9 +46,10 @@ class ICEBreakerBitsyPlatform(LatticeICE40Platform):
         Connector("pmod", 1, " 0  2  4  6 - -  1  3  5  7 - -", conn=("edge", "0")), # PMOD 1
         Connector("pmod", 2, "22 19 16 17 - - 21 18 15 20 - -", conn=("edge", "0")), # PMOD 2
         Connector("pmod", 3, "14  9 11  8 - - 13 10 12 23 - -", conn=("edge", "0"))  # PMOD 3
-    ]
+    ])
 
-    def toolchain_program(self, products, name, run_vid=None, run_pid=None, dfu_vid="1d50", dfu_pid="6146", reset=True):
+    def toolchain_program(self, products, name, run_vid=None, run_pid=None, dfu_vid="1d50", dfu_pid="6146", reset=True,
+                          device=None):
         dfu_util = os.environ.get("DFU_UTIL", "dfu-util")
 
         # Construct the device runtime and DFU vid pid string
@@ -55,14 +59,14 @@ class ICEBreakerBitsyPlatform(LatticeICE40Platform):
         dev_str += ",{}:{}".format(dfu_vid or "", dfu_pid or "")
 
         # Construct the argument list for dfu-util
-        args = [dfu_util, "-d", dev_str, "-a", "0"]
+        args = [dfu_util, *device_args("dfu-util", device), "-d", dev_str, "-a", "0"]
         if reset: args.append("-R")
         args.append("-D")
 
         # Run dfu-util
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
             args.append(bitstream_filename)
-            subprocess.check_call(args)
+            run_command(args)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ICEStickPlatform"]
@@ -13,7 +16,7 @@ class ICEStickPlatform(LatticeICE40Platform):
     device      = "iCE40HX1K"
     package     = "TQ144"
     default_clk = "clk12"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk12", 0, Pins("21", dir="i"),
                  Clock(12e6), Attrs(GLOBAL=True, IO_STANDARD="SB_LVCMOS")),
 
@@ -34,18 +37,22 @@ class ICEStickPlatform(LatticeICE40Platform):
             cs_n="71", clk="70", copi="67", cipo="68",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("pmod", 0, "78 79 80 81 - - 87 88 90 91 - -"),  # J2
 
         Connector("j", 1, "- - 112 113 114 115 116 117 118 119"), # J1
         Connector("j", 3, "- -  62  61  60  56  48  47  45  44"), # J3
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         iceprog = os.environ.get("ICEPROG", "iceprog")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([iceprog, bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([iceprog, *device_args("iceprog", device), bitstream_filename])
+
+    def toolchain_program_flash(self, filename, *, offset=0, device=None):
+        iceprog = os.environ.get("ICEPROG", "iceprog")
+        run_command([iceprog, *device_args("iceprog", device), "-o", str(offset), filename])
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
-import subprocess
-
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ICESugarPlatform"]
@@ -13,7 +14,7 @@ class ICESugarPlatform(LatticeICE40Platform):
     package     = "SG48"
     default_clk = "clk12"
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk12", 0, Pins("35", dir="i"),
                  Clock(12e6), Attrs(GLOBAL=True, IO_STANDARD="LVCMOS33")),
 
@@ -45,18 +46,18 @@ class ICESugarPlatform(LatticeICE40Platform):
             Subsignal("pullup", Pins("11", dir="o")),
             Attrs(IO_STANDARD="LVCMOS33")
         ),
-    ]
+    ])
 
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("pmod", 0, "10  6  3 48 - -  9  4  2 47 - -"), # PMOD1 - IO pins shared by USB
         Connector("pmod", 1, "46 44 42 37 - - 45 43 38 36 - -"), # PMOD2
         Connector("pmod", 2, "34 31 27 25 - - 32 28 26 23 - -"), # PMOD3
         Connector("pmod", 3, "21 20 19 18 - -  -  -  -  - - -"), # PMOD4 - IO pins used for switches via jumpers
-    ]
+    ])
 
     def toolchain_program(self, products, name):
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call(["icesprog", bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command(["icesprog", bitstream_filename])
 
 
 if __name__ == "__main__":
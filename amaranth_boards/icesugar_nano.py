@@ -1,9 +1,11 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["ICESugarNanoPlatform"]
@@ -14,7 +16,7 @@ class ICESugarNanoPlatform(LatticeICE40Platform):
     package     = "CM36"
     default_clk = "clk12"
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk12", 0, Pins("D1", dir="i"),
                  Clock(12e6), Attrs(GLOBAL=True, IO_STANDARD="LVCMOS33")),
 
@@ -29,18 +31,18 @@ class ICESugarNanoPlatform(LatticeICE40Platform):
             cs_n="D5", clk="E5", copi="E4", cipo="F5",
             attrs=Attrs(IO_STANDARD="LVCMOS33")
         ),
-    ]
+    ])
 
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("pmod", 0, "E2 D1 B1 A1 - -"),                    # PMOD1
         Connector("pmod", 1, "B3 A3 B6 C5 - -"),                    # PMOD2
         Connector("pmod", 2, "B4 B5 E1 B1 - - C6 E3 C2 A1 - -"),    # PMOD3
-    ]
+    ])
 
     def toolchain_program(self, products, name):
         icesprog = os.environ.get("ICESPROG", "icesprog")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([icesprog, bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([icesprog, bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,172 @@
+import os
+import ast
+import sys
+import json
+import inspect
+import textwrap
+import argparse
+import functools
+from fnmatch import fnmatchcase
+
+from . import platforms, get_platform
+
+
+__all__ = ["build_index", "load_index", "find_platforms"]
+
+
+INDEX_FILENAME = os.path.join(os.path.dirname(__file__), "index.json")
+
+
+def _tool_default(node):
+    # The default of an `os.environ.get("TOOL", default)` override: either a string, or
+    # a `shutil.which("tool")` lookup.
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and
+            node.func.attr == "which" and node.args and isinstance(node.args[0], ast.Constant)):
+        return node.args[0].value
+    return None
+
+
+def _program_tool(cls):
+    # Look for the tool in the source of `toolchain_program` rather than running it: either
+    # the default of an `os.environ.get("TOOL", "tool")` override, or the first string in
+    # the argument list passed to `run_command`. Helper functions of the board module that
+    # `toolchain_program` calls (e.g. one that locates the tool) are searched too. Platforms
+    # that cannot be programmed have no tool.
+    for base in cls.__mro__:
+        if "toolchain_program" in vars(base):
+            method = vars(base)["toolchain_program"]
+            break
+    else:
+        return None
+    if not method.__module__.startswith(__package__):
+        return None
+
+    functions = [method]
+    commands  = []
+    while functions:
+        function = functions.pop(0)
+        tree = ast.parse(textwrap.dedent(inspect.getsource(function)))
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call):
+                continue
+            if (isinstance(node.func, ast.Attribute) and node.func.attr == "get" and
+                    isinstance(node.func.value, ast.Attribute) and
+                    node.func.value.attr == "environ" and len(node.args) == 2):
+                tool = _tool_default(node.args[1])
+                if tool is not None:
+                    return tool
+            if (isinstance(node.func, ast.Name) and node.func.id == "run_command" and
+                    node.args and isinstance(node.args[0], ast.List) and node.args[0].elts):
+                command = node.args[0].elts[0]
+                if isinstance(command, ast.Constant):
+                    commands.append(command.value)
+            if isinstance(node.func, ast.Name):
+                helper = function.__globals__.get(node.func.id)
+                if (inspect.isfunction(helper) and helper.__module__ == method.__module__ and
+                        helper is not function):
+                    functions.append(helper)
+    return commands[0] if commands else None
+
+
+def _describe(info):
+    cls = get_platform(info.name)
+    try:
+        platform = cls()
+    except TypeError:
+        # The platform has required parameters (e.g. `ColorlightQMTechPlatform`); describe
+        # what is known from the class alone.
+        platform = None
+
+    if platform is not None:
+        resources  = list(platform.resources.values())
+        connectors = list(platform.connectors.values())
+        try:
+            default_clk_frequency = platform.default_clk_frequency
+        except (AttributeError, ValueError, NotImplementedError, KeyError):
+            default_clk_frequency = None
+        source = platform
+    else:
+        resources  = list(cls.resources)
+        connectors = list(cls.connectors)
+        default_clk_frequency = None
+        source = cls
+
+    return {
+        "module":      info.module,
+        "variant":     info.variant,
+        "class":       info.cls_name,
+        "family":      info.family,
+        "device":      info.device,
+        "package":     getattr(source, "package", None) or None,
+        "speed":       getattr(source, "speed",   None) or None,
+        "default_clk": getattr(source, "default_clk", None) or None,
+        "default_clk_frequency": default_clk_frequency,
+        "resources":   [[res.name, res.number] for res in resources],
+        "clocks":      [[res.name, res.number, res.clock.frequency]
+                        for res in resources if res.clock is not None],
+        "connectors":  [[conn.name, conn.number, len(conn.mapping)] for conn in connectors],
+        "program_tool": _program_tool(cls),
+    }
+
+
+def build_index():
+    """Describe every registered platform. This imports all board modules."""
+    return {info.name: _describe(info) for info in platforms()}
+
+
+def _dumps(index):
+    return json.dumps(index, indent=1, sort_keys=True) + "\n"
+
+
+@functools.lru_cache(maxsize=None)
+def load_index():
+    """Load the precomputed index without importing any board module or Amaranth itself."""
+    with open(INDEX_FILENAME) as f:
+        return json.load(f)
+
+
+def find_platforms(*, family="*", device="*", resource=None, clock=None):
+    """Return the names of the indexed platforms matching all of the given criteria.
+
+    ``family`` and ``device`` are shell-style patterns. ``resource`` selects platforms that
+    have at least one resource with that name, and ``clock`` selects platforms that have
+    a clock resource with that frequency, in Hz.
+    """
+    names = []
+    for name, entry in load_index().items():
+        if not fnmatchcase(entry["family"], family):
+            continue
+        if device != "*" and (entry["device"] is None or not fnmatchcase(entry["device"], device)):
+            continue
+        if resource is not None and not any(res_name == resource
+                                            for res_name, _ in entry["resources"]):
+            continue
+        if clock is not None and not any(frequency == clock
+                                         for _, _, frequency in entry["clocks"]):
+            continue
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m {}".format(__spec__.name),
+        description="Regenerate the precomputed board index.")
+    parser.add_argument("--check", action="store_true",
+        help="do not write the index; exit with an error if it is out of date")
+    args = parser.parse_args()
+
+    contents = _dumps(build_index())
+    if args.check:
+        with open(INDEX_FILENAME) as f:
+            if f.read() != contents:
+                sys.exit("{} is out of date; run `python -m {}` to regenerate it"
+                         .format(os.path.relpath(INDEX_FILENAME), __spec__.name))
+    else:
+        with open(INDEX_FILENAME, "w") as f:
+            f.write(contents)
+
+
+if __name__ == "__main__":
+    main()
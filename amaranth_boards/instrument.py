@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import subprocess
+from collections import namedtuple
+from contextlib import contextmanager
+
+from ._products import LocalProducts, extract
+from ._script import split_script, command_tool, command_script
+
+try:
+    import resource
+except ImportError: # :nocov:
+    resource = None
+
+
+__all__ = ["Stage", "Profiler", "build"]
+
+
+class Stage(namedtuple("Stage", ("name", "wall", "cpu", "max_rss"))):
+    """The cost of one stage of a build or program cycle.
+
+    ``wall`` and ``cpu`` are in seconds; ``cpu`` counts both user and system time. ``max_rss``
+    is the peak resident set size in bytes, or ``None`` where it cannot be measured.
+    """
+
+
+def _rss_bytes(usage):
+    # `ru_maxrss` is in kilobytes everywhere except macOS.
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+class _ProfiledProducts:
+    def __init__(self, products, profiler):
+        self._products = products
+        self._profiler = profiler
+
+    def get(self, filename, mode="b"):
+        return self._products.get(filename, mode)
+
+    @contextmanager
+    def extract(self, *filenames):
+        with self._profiler.stage("extract {}".format(" ".join(filenames))):
+            context = extract(self._products, *filenames)
+            result  = context.__enter__()
+        try:
+            yield result
+        finally:
+            context.__exit__(*sys.exc_info())
+
+
+class Profiler:
+    """Records the wall-clock time, CPU time and peak memory of each stage of building and
+    programming a board.
+
+    Stages that run an external tool (see :meth:`run`) are measured exactly, as the tool's own
+    resource usage. Stages that run Python code (see :meth:`stage`) measure the CPU time of this
+    process and of the tools it waited for during the stage, and report the peak memory of this
+    process or of the largest tool it ran so far, whichever is larger.
+    """
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the code run in the ``with`` block as the stage ``name``."""
+        wall = time.monotonic()
+        if resource is not None:
+            before = [resource.getrusage(who)
+                      for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+        else:
+            cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.monotonic() - wall
+            if resource is not None:
+                after = [resource.getrusage(who)
+                         for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+                cpu = sum(a.ru_utime + a.ru_stime - b.ru_utime - b.ru_stime
+                          for a, b in zip(after, before))
+                max_rss = max(_rss_bytes(usage) for usage in after)
+            else:
+                cpu = time.process_time() - cpu
+                max_rss = None
+            self.stages.append(Stage(name, wall, cpu, max_rss))
+
+    def run(self, name, args, **kwargs):
+        """Run the command ``args`` as the stage ``name``, like :func:`subprocess.run` with
+        ``check=True``.
+        """
+        if not hasattr(os, "wait4"): # :nocov:
+            with self.stage(name):
+                return subprocess.run(args, check=True, **kwargs)
+
+        wall = time.monotonic()
+        process = subprocess.Popen(args, **kwargs)
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        wall = time.monotonic() - wall
+        # The process was reaped by `wait4`; let `subprocess` know.
+        if os.WIFSIGNALED(status):
+            process.returncode = -os.WTERMSIG(status)
+        else:
+            process.returncode = os.WEXITSTATUS(status)
+        self.stages.append(Stage(name, wall, usage.ru_utime + usage.ru_stime,
+                                 _rss_bytes(usage)))
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, args)
+        return process
+
+    def products(self, products):
+        """Wrap ``products`` so that every ``extract`` is measured as a stage."""
+        return _ProfiledProducts(products, self)
+
+    def write(self, path, **fields):
+        """Append the stages, and any other ``fields``, to the JSON Lines file ``path``."""
+        record = dict(fields, stages=[stage._asdict() for stage in self.stages])
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def build(platform, elaboratable, name="top", build_dir="build", *, profiler=None,
+          do_program=False, program_opts=None, **kwargs):
+    """Build (and optionally program) ``elaboratable`` for ``platform`` like
+    ``platform.build``, measuring each stage with ``profiler``.
+
+    The stages are ``prepare`` (elaboration and generation of the design files and
+    constraints), ``write`` (writing them to ``build_dir``), one stage per command of the build
+    script, named after its tool (e.g. ``yosys``, ``nextpnr-ecp5``, ``ecppack``), and, when
+    programming, ``extract <files>`` and ``program``. Returns the build products and the
+    :class:`Profiler`.
+    """
+    if profiler is None:
+        profiler = Profiler()
+
+    with profiler.stage("prepare"):
+        plan = platform.prepare(elaboratable, name, **kwargs)
+    with profiler.stage("write"):
+        plan.execute_local(build_dir, run_script=False)
+
+    script = plan.files["{}.sh".format(plan.script)]
+    if isinstance(script, bytes):
+        script = script.decode("utf-8")
+    header, commands = split_script(platform, script)
+    for command in commands:
+        with command_script(header, command) as args:
+            profiler.run(command_tool(platform, command), args, cwd=build_dir)
+
+    products = LocalProducts(build_dir)
+    if do_program:
+        with profiler.stage("program"):
+            platform.toolchain_program(profiler.products(products), name, **(program_opts or {}))
+    return products, profiler
@@ -1,9 +1,11 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["KC705Platform"]
@@ -14,7 +16,7 @@ class KC705Platform(XilinxPlatform):
     package     = "ffg900"
     speed       = "2"
     default_clk = "clk156"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk156", 0, DiffPairs("K28", "K29", dir="i"),
                  Clock(156e6), Attrs(IOSTANDARD="LVDS_25")),
 
@@ -25,13 +27,13 @@ class KC705Platform(XilinxPlatform):
             rx="M19", tx="K24",
             attrs=Attrs(IOSTANDARD="LVCMOS33")
         ),
-    ]
+    ])
     connectors  = []
 
     def toolchain_program(self, products, name):
         openocd = os.environ.get("OPENOCD", "openocd")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([openocd,
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([openocd,
                 "-c", "source [find board/kc705.cfg]; init; pld load 0 {}; exit"
                       .format(bitstream_filename)
             ])
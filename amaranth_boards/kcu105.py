@@ -1,9 +1,11 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["KCU105Platform"]
@@ -14,19 +16,19 @@ class KCU105Platform(XilinxPlatform):
     package     = "ffva1156"
     speed       = "2-e"
     default_clk = "clk125"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk125", 0, DiffPairs("G10", "F10", dir="i"),
                  Clock(125e6), Attrs(IOSTANDARD="LVDS")),
 
         *LEDResources(pins="AP8 H23 P20 P21 N22 M22 R23 P23",
                       attrs=Attrs(IOSTANDARD="LVCMOS18")),
-    ]
+    ])
     connectors  = []
 
     def toolchain_program(self, products, name):
         openocd = os.environ.get("OPENOCD", "openocd")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([openocd,
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([openocd,
                 "-c", "source [find board/kcu105.cfg]; init; pld load 0 {}; exit"
                       .format(bitstream_filename)
             ])
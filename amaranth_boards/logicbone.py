@@ -1,9 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["LogicbonePlatform", "Logicbone85FPlatform"]
@@ -16,8 +20,10 @@ class LogicbonePlatform(LatticeECP5Platform):
     speed       = "8"
 
     default_clk = "refclk"
+    config_interface = ConfigInterface(flash=None, size=None, max_clock=38.8, bus_width=4,
+                                       compression=True)
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("refclk", 0, Pins("M19", dir="i"),
                  Clock(25e6), Attrs(IO_TYPE="LVCMOS18")),
 
@@ -89,8 +95,8 @@ class LogicbonePlatform(LatticeECP5Platform):
             Subsignal("odt",     Pins("C5", dir="o")),
             Attrs(IO_TYPE="SSTL135_I")
         )
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("P8", 0, """
         -   -   C20 D19 D20 E19 E20 F19 F20 G20 -   -   -   -   -   -
         -   -   -   -   -   -   G19 H20 J20 K20 C18 D17 D18 E17 E18 F18
@@ -101,18 +107,21 @@ class LogicbonePlatform(LatticeECP5Platform):
         B9  C11 A8  -   -   D9  C8  B8  A7  A6  B6  D8  C7  D7  C6  D6
         -   -   -   -   -   -   -   -   -   B10 E10 -   -   -
         """),
-    ]
+    ])
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, **kwargs):
         overrides = dict(ecppack_opts="--compress --spimode qspi --freq 38.8")
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
         overrides.update(kwargs)
         return super().toolchain_prepare(fragment, name, **overrides)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         dfu_util = os.environ.get("DFU_UTIL", "dfu-util")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([
-                dfu_util, "-d", "1d50:615d", "-a", "0", "-R",
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([
+                dfu_util, *device_args("dfu-util", device),
+                "-d", "1d50:615d", "-a", "0", "-R",
                 "-D", bitstream_filename
             ])
 
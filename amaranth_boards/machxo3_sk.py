@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_machxo_2_3l import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["MachXO3SKPlatform"]
@@ -14,7 +17,7 @@ class MachXO3SKPlatform(LatticeMachXO3LPlatform):
     package     = "BG256"
     speed       = "5"
     default_clk = "clk12"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk12", 0, Pins("C8", dir="i"),
             Clock(12e6), Attrs(IO_TYPE="LVCMOS33")
         ),
@@ -39,8 +42,8 @@ class MachXO3SKPlatform(LatticeMachXO3LPlatform):
             cs_n="R5", clk="P6", copi="T13", cipo="T6",
             attrs=Attrs(IO_TYPE="LVCMOS33")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("j", 3, # J3
              "-  -  A13 C13 F8  B12 C12 E11 E10 D10 "
              "-  -  F9  C10 E8  E9  E7  D8  D7  C7  "
@@ -61,12 +64,13 @@ class MachXO3SKPlatform(LatticeMachXO3LPlatform):
              "-  -  K4  J1  K1  J2  J3  H3  H2  H1  "
              "-  -  G2  G1  F2  F1  E2  E1  D2  D1  "
              "-  -  C2  C1  G3  B1  D3  E3  F3  F5  "),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         openFPGALoader = os.environ.get("OPENFPGALOADER", "openFPGALoader")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([openFPGALoader, bitstream_filename])
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([openFPGALoader, *device_args("openFPGALoader", device),
+                         bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["MercuryPlatform"]
@@ -30,7 +32,7 @@ class MercuryPlatform(XilinxPlatform):
     speed   = "4"
 
     default_clk = "clk50"
-    resources = [
+    resources = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("P43", dir="i"),
                  Attrs(IOSTANDARD="LVCMOS33"), Clock(50e6)),
 
@@ -64,11 +66,11 @@ class MercuryPlatform(XilinxPlatform):
         # GPIO pins (including gpio:30 and gpio:20).
         Resource("bussw_oe", 0, PinsN("P30N", dir="o"),
             Attrs(IOSTANDARD="LVTTL"))
-    ]
+    ])
 
     # Perhaps define some connectors as having a specific purpose- i.e. a 5V GPIO
     # bus with data, peripheral-select, and control signals?
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("gpio", 0, """P59 P60 P61 P62 P64 P57
                                 P56 P52 P50 P49 P85 P84
                                 P83 P78 P77 P65 P70 P71
@@ -83,7 +85,7 @@ class MercuryPlatform(XilinxPlatform):
         # as well- LVTTL.
         Connector("pmod", 0, "P5 P4 P6 P98 P94 P93 P90 P89")  # Baseboard PMOD.
         # Overlaps w/ GPIO bus.
-    ]
+    ])
 
     # Some default useful extensions. Attach to platform using:
     # p.add_resources(p.leds)
@@ -203,8 +205,8 @@ class MercuryPlatform(XilinxPlatform):
     def toolchain_program(self, products, name):
         # https://github.com/cr1901/mercpcl
         mercpcl = os.environ.get("MERCPCL", "mercpcl")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([mercpcl, bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([mercpcl, bitstream_filename])
 
 
 if __name__ == "__main__":
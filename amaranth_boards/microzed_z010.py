@@ -1,5 +1,6 @@
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
+from ._table import LazyTable
 
 
 __all__ = ["MicroZedZ010Platform"]
@@ -10,7 +11,7 @@ class MicroZedZ010Platform(XilinxPlatform):
     package    = "clg400"
     speed      = "1"
     resources  = []
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("JX1", 0,
             "F9  J6  "
             "F6  G6  "
@@ -115,4 +116,4 @@ class MicroZedZ010Platform(XilinxPlatform):
             "-   -   "
             "-   -   "
         ),
-    ]
+    ])
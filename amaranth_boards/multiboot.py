@@ -0,0 +1,275 @@
+import os
+import tempfile
+import subprocess
+from collections import namedtuple
+
+from amaranth.hdl import *
+
+from ._overrides import append_override
+
+
+__all__ = ["FlashLayout", "multiboot_overrides", "multiboot_image",
+           "Series7Warmboot", "ICE40Warmboot"]
+
+
+_SECTOR_SIZE = 0x10000
+
+
+class FlashLayout(namedtuple("FlashLayout", ("offsets", "boot"))):
+    """Where each of several bitstreams is placed in the configuration flash.
+
+    ``offsets`` are the byte offsets of the images; image 0 is the golden image, which the FPGA
+    falls back to if another image fails to configure, and the others are update images.
+    ``boot`` is the index of the image that is loaded at power-up. The vendor flows constrain
+    the layout:
+
+    * On 7-series devices, the golden image must be at offset 0; it jumps to the image being
+      booted, if that is another one.
+    * On ECP5 devices, the image being booted must be at offset 0 (it holds the multiboot
+      jump table), and the golden image is placed elsewhere.
+    * On iCE40 devices, there are at most 4 images, placed by ``icemulti`` after its header at
+      multiples of a power of 2, i.e. the offsets must be ``[n, 2 * n, ...]``.
+
+    Every offset must be a multiple of the 64 KiB erase sector, so that an image can be
+    rewritten without erasing part of another one.
+    """
+    def __new__(cls, offsets, boot=0):
+        offsets = tuple(offsets)
+        if not offsets:
+            raise ValueError("Flash layout must have at least one image")
+        for offset in offsets:
+            if offset < 0 or offset % _SECTOR_SIZE:
+                raise ValueError("Flash layout image offset {:#x} is not a multiple of the "
+                                 "{:#x} byte erase sector"
+                                 .format(offset, _SECTOR_SIZE))
+        if len(set(offsets)) != len(offsets):
+            raise ValueError("Flash layout images must be at distinct offsets, not {}"
+                             .format(", ".join("{:#x}".format(offset) for offset in offsets)))
+        if not 0 <= boot < len(offsets):
+            raise ValueError("Boot image index {} is out of range for {} images"
+                             .format(boot, len(offsets)))
+        return super().__new__(cls, offsets, boot)
+
+
+def _check_layout(platform, layout):
+    toolchain = platform.toolchain
+    if toolchain == "Vivado":
+        if getattr(platform, "family", None) != "series7":
+            raise ValueError("Multiboot is only supported for 7-series devices with the Vivado "
+                             "toolchain")
+        if layout.offsets[0] != 0:
+            raise ValueError("The golden image must be at offset 0 on 7-series devices")
+    elif toolchain == "Trellis":
+        if layout.offsets[layout.boot] != 0:
+            raise ValueError("The image booted at power-up must be at offset 0 on ECP5 devices")
+    elif toolchain == "IceStorm":
+        align = layout.offsets[0]
+        if (len(layout.offsets) > 4 or align & (align - 1) or
+                layout.offsets != tuple(align * (index + 1)
+                                        for index in range(len(layout.offsets)))):
+            raise ValueError("iCE40 devices can hold at most 4 images, at offsets `[n, 2 * n, "
+                             "...]` where n is a power of 2")
+    else:
+        raise ValueError("Multiboot is not supported for the {} toolchain".format(toolchain))
+    return toolchain
+
+
+def multiboot_overrides(platform, layout, index, **overrides):
+    """Return ``overrides``, changed so that the bitstream can be used as image ``index`` of
+    ``layout``.
+    """
+    if _check_layout(platform, layout) == "Vivado":
+        script = ["set_property BITSTREAM.CONFIG.CONFIGFALLBACK ENABLE [current_design]"]
+        if index == 0 and layout.boot != 0:
+            script += [
+                "set_property BITSTREAM.CONFIG.NEXT_CONFIG_ADDR 0x{:08X} [current_design]"
+                .format(layout.offsets[layout.boot]),
+                "set_property BITSTREAM.CONFIG.NEXT_CONFIG_REBOOT ENABLE [current_design]",
+            ]
+        append_override(overrides, "script_before_bitstream", "\n".join(script))
+    # `ecpmulti` and `icemulti` add the multiboot headers when the images are combined.
+    return overrides
+
+
+def _flash_size(platform, size, *, required=True):
+    if size is None:
+        config = getattr(platform, "config_interface", None)
+        size = None if config is None else config.size
+    if size is None and required:
+        raise ValueError("The configuration flash size of {} is not known; specify it"
+                         .format(type(platform).__name__))
+    return size
+
+
+def _check_images(layout, lengths, size):
+    # Each image must end before the next one (by offset) starts, and before the end of a flash
+    # of `size` MiB, if that is known.
+    order = sorted(range(len(layout.offsets)), key=lambda index: layout.offsets[index])
+    for index, next_index in zip(order, order[1:] + [None]):
+        offset, end = layout.offsets[index], layout.offsets[index] + lengths[index]
+        if next_index is not None and end > layout.offsets[next_index]:
+            raise ValueError("Image {} at {:#x} is {:#x} bytes long, and overlaps image {} at "
+                             "{:#x}"
+                             .format(index, offset, lengths[index], next_index,
+                                     layout.offsets[next_index]))
+        if size is not None and end > size << 20:
+            raise ValueError("Image {} at {:#x} is {:#x} bytes long, and does not fit in "
+                             "{} MiB of flash"
+                             .format(index, offset, lengths[index], size))
+
+
+def _write_cfgmem(platform, layout, bitstreams, size, output, temp_dir):
+    vivado = os.environ.get("VIVADO", "vivado")
+    config = getattr(platform, "config_interface", None)
+    bus_width = 1 if config is None else config.bus_width
+    loadbit = " ".join("up 0x{:08X} {}".format(offset, bitstream)
+                       for offset, bitstream in zip(layout.offsets, bitstreams))
+    script = os.path.join(temp_dir, "multiboot.tcl")
+    with open(script, "w") as f:
+        f.write("write_cfgmem -force -format bin -interface spix{} -size {} "
+                "-loadbit {{{}}} -file {{{}}}\n"
+                .format(bus_width, size, loadbit, output))
+    subprocess.run([vivado, "-nolog", "-nojournal", "-mode", "batch", "-source", script],
+                   cwd=temp_dir, check=True)
+
+
+def _ecpmulti(platform, layout, bitstreams, size, output, temp_dir):
+    ecpmulti = os.environ.get("ECPMULTI", "ecpmulti")
+    args = [ecpmulti, "--flashsize", str(size * 8), "--output", output,
+            "--input", bitstreams[layout.boot]]
+    for index, (offset, bitstream) in enumerate(zip(layout.offsets, bitstreams)):
+        if index == layout.boot:
+            continue
+        if index == 0:
+            args += ["--golden", bitstream, "--goldenaddr", "0x{:x}".format(offset)]
+        else:
+            args += ["--input", bitstream, "--address", "0x{:x}".format(offset)]
+    subprocess.run(args, cwd=temp_dir, check=True)
+
+
+def _icemulti(platform, layout, bitstreams, size, output, temp_dir):
+    icemulti = os.environ.get("ICEMULTI", "icemulti")
+    align = layout.offsets[0]
+    for offset, bitstream in zip(layout.offsets, bitstreams):
+        if os.path.getsize(os.path.join(temp_dir, bitstream)) > align:
+            raise ValueError("Image at {:#x} does not fit in {:#x} bytes"
+                             .format(offset, align))
+    subprocess.run([icemulti, "-p{}".format(layout.boot), "-A{}".format(align.bit_length() - 1),
+                    "-o", output, *bitstreams], cwd=temp_dir, check=True)
+
+
+def multiboot_image(platform, layout, products, name="top", *, size=None):
+    """Combine the bitstreams in ``products`` (one set of build products for each image of
+    ``layout``, built with :func:`multiboot_overrides`) into a flash image, and return it.
+
+    ``size`` is the size of the configuration flash in MiB, by default that of
+    ``platform.config_interface``. Images are combined with Vivado's ``write_cfgmem`` on
+    7-series devices, ``ecpmulti`` on ECP5 and ``icemulti`` on iCE40, which can be selected
+    with the ``VIVADO``, ``ECPMULTI`` and ``ICEMULTI`` environment variables. Raises
+    :exc:`ValueError` if an image overlaps the next one or does not fit in the flash. The result
+    can be written with :func:`amaranth_boards.flash.program_flash`.
+    """
+    toolchain = _check_layout(platform, layout)
+    products = list(products)
+    if len(products) != len(layout.offsets):
+        raise ValueError("Flash layout has {} images, but {} were given"
+                         .format(len(layout.offsets), len(products)))
+    extension, combine = {
+        "Vivado":   ("bit", _write_cfgmem),
+        "Trellis":  ("bit", _ecpmulti),
+        "IceStorm": ("bin", _icemulti),
+    }[toolchain]
+    # `icemulti` does not need to know the size of the flash.
+    size = _flash_size(platform, size, required=toolchain != "IceStorm")
+
+    # The tools are run with relative paths, since some builds of them (e.g. YoWASP ones) can
+    # only access the current directory.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bitstreams, lengths = [], []
+        for index, image_products in enumerate(products):
+            bitstream = "image{}.{}".format(index, extension)
+            contents = image_products.get("{}.{}".format(name, extension))
+            with open(os.path.join(temp_dir, bitstream), "wb") as f:
+                f.write(contents)
+            bitstreams.append(bitstream)
+            lengths.append(len(contents))
+        _check_images(layout, lengths, size)
+        combine(platform, layout, bitstreams, size, "multiboot.bin", temp_dir)
+        with open(os.path.join(temp_dir, "multiboot.bin"), "rb") as f:
+            return f.read()
+
+
+class Series7Warmboot(Elaboratable):
+    """Reconfigure a 7-series FPGA from another image in its configuration flash.
+
+    Asserting ``start`` for a cycle writes ``address`` (the offset of the image in the flash) to
+    the ``WBSTAR`` register through ``ICAPE2`` and issues an ``IPROG`` command. If the image
+    fails to configure, the FPGA falls back to the golden image.
+    """
+    def __init__(self):
+        self.start   = Signal()
+        self.address = Signal(29)
+
+    def elaborate(self, platform):
+        m = Module()
+
+        # UG470, "Reconfiguration and MultiBoot": dummy, sync, NOOP, write WBSTAR, NOOP,
+        # write CMD IPROG, NOOP.
+        address = Signal.like(self.address)
+        sequence = Array([
+            Const(0xFFFFFFFF, 32), Const(0xAA995566, 32), Const(0x20000000, 32),
+            Const(0x30020001, 32), Cat(address, Const(0, 3)),       Const(0x20000000, 32),
+            Const(0x30008001, 32), Const(0x0000000F, 32), Const(0x20000000, 32),
+        ])
+        step  = Signal(range(len(sequence) + 1), reset=len(sequence))
+        word  = Signal(32)
+        csib  = Signal(reset=1)
+
+        m.d.sync += csib.eq(1)
+        with m.If(step == len(sequence)):
+            with m.If(self.start):
+                m.d.sync += [
+                    address.eq(self.address),
+                    step.eq(0),
+                ]
+        with m.Else():
+            m.d.sync += [
+                word.eq(sequence[step]),
+                csib.eq(0),
+                step.eq(step + 1),
+            ]
+
+        m.submodules.icap = Instance("ICAPE2",
+            p_ICAP_WIDTH="X32",
+            i_CLK=ClockSignal(),
+            i_CSIB=csib,
+            i_RDWRB=0,
+            # ICAPE2 takes each byte with its bits reversed.
+            i_I=Cat(word[byte * 8:byte * 8 + 8][::-1] for byte in range(4)),
+        )
+
+        return m
+
+
+class ICE40Warmboot(Elaboratable):
+    """Reconfigure an iCE40 FPGA from image ``image`` (0 to 3) of an ``icemulti`` flash image.
+
+    Asserting ``start`` for a cycle starts the reconfiguration.
+    """
+    def __init__(self):
+        self.start = Signal()
+        self.image = Signal(2)
+
+    def elaborate(self, platform):
+        m = Module()
+
+        # SB_WARMBOOT samples the image select lines on the rising edge of BOOT.
+        boot = Signal()
+        m.d.sync += boot.eq(self.start)
+        m.submodules.warmboot = Instance("SB_WARMBOOT",
+            i_BOOT=boot,
+            i_S1=self.image[1],
+            i_S0=self.image[0],
+        )
+
+        return m
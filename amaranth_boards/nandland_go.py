@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["NandlandGoPlatform"]
@@ -13,7 +16,7 @@ class NandlandGoPlatform(LatticeICE40Platform):
     device      = "iCE40HX1K"
     package     = "VQ100"
     default_clk = "clk25"
-    resources = [
+    resources = LazyTable(lambda cls: [
         Resource("clk25", 0, Pins("15", dir="i"),
             Clock(25e6)),
 
@@ -34,15 +37,15 @@ class NandlandGoPlatform(LatticeICE40Platform):
             g="29 30 33",
             b="28 41 42",
             hs="26", vs="27"),
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("pmod", 0, "65 64 63 62 - - 78 79 80 81 - -"),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         iceprog = os.environ.get("ICEPROG", "iceprog")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([iceprog, bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([iceprog, *device_args("iceprog", device), bitstream_filename])
 
 
 if __name__ == "__main__":
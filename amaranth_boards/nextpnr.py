@@ -0,0 +1,129 @@
+import os
+import re
+import shutil
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from ._tools import tool_env_var
+from ._products import LocalProducts
+
+
+__all__ = ["ClockTiming", "SeedResult", "parse_fmax", "seed_sweep"]
+
+
+ClockTiming = namedtuple("ClockTiming", ("fmax", "target", "passed"))
+
+
+class SeedResult(namedtuple("SeedResult", ("seed", "clocks", "error"))):
+    """The outcome of placing and routing with one seed.
+
+    ``clocks`` maps each clock name to its final :class:`ClockTiming`, and ``error`` is the
+    exception the run failed with, if any (nextpnr exits with an error when timing fails).
+    """
+    @property
+    def passed(self):
+        return bool(self.clocks) and all(timing.passed for timing in self.clocks.values())
+
+    @property
+    def margin(self):
+        """The smallest ratio of achieved to required frequency over all clocks."""
+        if not self.clocks:
+            return 0.0
+        return min(timing.fmax / timing.target for timing in self.clocks.values())
+
+
+_fmax_re = re.compile(r"Max frequency for clock +'(.+?)': ([\d.]+) MHz "
+                      r"\((PASS|FAIL) at ([\d.]+) MHz\)")
+
+
+def parse_fmax(log):
+    """Parse the achieved frequency of every clock from a nextpnr log.
+
+    nextpnr reports timing after placement and again after routing; the last report wins.
+    Returns a dictionary mapping clock names to :class:`ClockTiming`, in MHz.
+    """
+    clocks = {}
+    for match in _fmax_re.finditer(log):
+        clock, fmax, result, target = match.groups()
+        clocks[clock] = ClockTiming(float(fmax), float(target), result == "PASS")
+    return clocks
+
+
+def _rank(results):
+    # Seeds that completed and met timing on every clock come first, then the other seeds that
+    # completed, then those that failed (e.g. because nextpnr exits with an error when timing
+    # fails); within each group, by the margin of their worst clock. Ties keep the order of
+    # the seeds.
+    return sorted(results, key=lambda result: (result.error is None and result.passed,
+                                               result.error is None, result.margin),
+                  reverse=True)
+
+
+def _run_script(plan, root, env):
+    subprocess.run(["sh", "{}.sh".format(plan.script)], cwd=root, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def seed_sweep(platform, elaboratable, name="top", build_dir="build", *, seeds=8, jobs=None,
+               **kwargs):
+    """Build ``elaboratable`` for a nextpnr-based (iCE40 or ECP5) ``platform``, placing and
+    routing the synthesized design with each of ``seeds`` (a number of seeds, starting at 1,
+    or an iterable of seeds) at most ``jobs`` at a time.
+
+    Synthesis runs only once. Each seed is placed, routed and packed in its own subdirectory
+    of ``build_dir``, then the products of the seed with the best timing are copied into
+    ``build_dir`` itself; a seed that meets timing on every clock is always preferred.
+    Returns the build products and the list of :class:`SeedResult`, best first.
+    """
+    if platform.toolchain not in ("IceStorm", "Trellis"):
+        raise ValueError("Seed sweeps require the IceStorm or Trellis toolchain, not {}"
+                         .format(platform.toolchain))
+    if isinstance(seeds, int):
+        seeds = range(1, seeds + 1)
+
+    # The seed is left to the shell, so that a single build script serves every seed.
+    nextpnr_opts = kwargs.get("nextpnr_opts", "")
+    if isinstance(nextpnr_opts, str):
+        nextpnr_opts = "{} --seed $NEXTPNR_SEED".format(nextpnr_opts).strip()
+    else:
+        nextpnr_opts = [*nextpnr_opts, "--seed", "$NEXTPNR_SEED"]
+    plan = platform.prepare(elaboratable, name, **{**kwargs, "nextpnr_opts": nextpnr_opts})
+
+    # Every tool is invoked through its environment variable, so a step is skipped by
+    # substituting `true` for its tool.
+    synth_env = dict(os.environ, NEXTPNR_SEED="1")
+    for tool in platform.required_tools:
+        if tool != "yosys":
+            synth_env[tool_env_var(tool)] = "true"
+    plan.execute_local(build_dir, run_script=False)
+    _run_script(plan, build_dir, synth_env)
+
+    def run_seed(seed):
+        seed_dir = os.path.join(build_dir, "seed_{}".format(seed))
+        shutil.rmtree(seed_dir, ignore_errors=True)
+        shutil.copytree(build_dir, seed_dir,
+                        ignore=shutil.ignore_patterns("seed_*"))
+        seed_env = dict(os.environ, NEXTPNR_SEED=str(seed))
+        seed_env[tool_env_var("yosys")] = "true"
+        error = None
+        try:
+            _run_script(plan, seed_dir, seed_env)
+        except subprocess.CalledProcessError as e:
+            error = e
+        try:
+            with open(os.path.join(seed_dir, "{}.tim".format(name))) as f:
+                clocks = parse_fmax(f.read())
+        except FileNotFoundError:
+            clocks = {}
+        return SeedResult(seed, clocks, error)
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        results = _rank(executor.map(run_seed, seeds))
+
+    best = results[0]
+    if best.error is not None:
+        raise best.error
+    shutil.copytree(os.path.join(build_dir, "seed_{}".format(best.seed)), build_dir,
+                    dirs_exist_ok=True)
+    return LocalProducts(build_dir), results
@@ -1,9 +1,14 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .bram import bram_overrides
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["Nexys4DDRPlatform"]
@@ -15,7 +20,9 @@ class Nexys4DDRPlatform(XilinxPlatform):
     speed       = "1"
     default_clk = "clk100"
     default_rst = "rst"
-    resources   = [
+    config_interface = ConfigInterface(flash="S25FL128S", size=16, max_clock=33, bus_width=4,
+                                       compression=True)
+    resources   = LazyTable(lambda cls: [
         Resource("clk100", 0,
             Pins("E3", dir="i"), Clock(100e6), Attrs(IOSTANDARD="LVCMOS33")),
         Resource("rst", 0,
@@ -148,15 +155,16 @@ class Nexys4DDRPlatform(XilinxPlatform):
             Subsignal("dm",  Pins("T6 U1", dir="o")),
             Subsignal("odt", Pins("R5",    dir="o")),
             Attrs(IOSTANDARD="SSTL18_I", SLEW="FAST"))
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("pmod", 0, "C17 D18 E18 G17 - - D17 E17 F18 G18 - -"),  # JA
         Connector("pmod", 1, "D14 F16 G16 H14 - - E16 F13 G13 H16 - -"),  # JB
         Connector("pmod", 2, "K1  F6  J2  G6  - - E7  J3  J4  E6  - -"),  # JC
         Connector("pmod", 3, "H4  H1  G1  G3  - - H2  G4  G2  F3  - -")   # JD
-    ]
+    ])
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False,
+                          patchable_memories=None, **kwargs):
         overrides = {
             "script_before_bitstream":
                 "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
@@ -170,12 +178,17 @@ class Nexys4DDRPlatform(XilinxPlatform):
                 set_property CONFIG_VOLTAGE 3.3 [current_design]
                 """
         }
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
+        if patchable_memories is not None:
+            overrides = bram_overrides(self, name, patchable_memories, **overrides)
         return super().toolchain_prepare(fragment, name, **overrides, **kwargs)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         xc3sprog = os.environ.get("XC3SPROG", "xc3sprog")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.run([xc3sprog, "-c", "nexys4", bitstream_filename], check=True)
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([xc3sprog, *device_args("xc3sprog", device, cable="nexys4"),
+                         bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ import subprocess
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
 
 
 __all__ = ["NumatoMimasPlatform"]
@@ -14,7 +15,7 @@ class NumatoMimasPlatform(XilinxPlatform):
     package     = "tqg144"
     speed       = "2"
     default_clk = "clk100"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk100", 0, Pins("P126", dir="i"),
                  Clock(100e6), Attrs(IOSTANDARD="LVCMOS33")),
 
@@ -27,8 +28,8 @@ class NumatoMimasPlatform(XilinxPlatform):
             cs_n="P38", clk="P70", copi="P64", cipo="65",
             attrs=Attrs(IOSTANDARD="LVCMOS33")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("p", 1,
             "-    -    P35  P34  P33  P32  P30  P29  P27  P26  "
             "P24  P23  P22  P21  P17  P16  P15  P14  P12  P11  "
@@ -41,7 +42,7 @@ class NumatoMimasPlatform(XilinxPlatform):
             "P82  P83  P84  P85  P87  P88  P92  P93  P94  P95  "
             "P97  P98  P99  P100 P101 P102 P104 P105 -    -    "
         )
-    ]
+    ])
 
     # Programming this board is not currently supported.
 
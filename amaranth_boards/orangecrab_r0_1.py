@@ -1,10 +1,14 @@
 import os
-import subprocess
 import shutil
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["OrangeCrabR0_1Platform"]
@@ -15,7 +19,9 @@ class OrangeCrabR0_1Platform(LatticeECP5Platform):
     package     = "MG285"
     speed       = "8"
     default_clk = "clk"
-    resources   = [
+    config_interface = ConfigInterface(flash="W25Q128JV", size=16, max_clock=38.8, bus_width=1,
+                                       compression=True)
+    resources   = LazyTable(lambda cls: [
         Resource("clk", 0, Pins("A9", dir="i"),
                  Clock(48e6), Attrs(IO_TYPE="LVCMOS33")),
 
@@ -65,8 +71,8 @@ class OrangeCrabR0_1Platform(LatticeECP5Platform):
         ),
 
         DirectUSBResource(0, d_p="N1", d_n="M2", pullup="N2", attrs=Attrs(IO_TYPE="LVCMOS33"))
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("io", 0, {
             "0":    "N17",
             "1":    "M18",
@@ -89,7 +95,7 @@ class OrangeCrabR0_1Platform(LatticeECP5Platform):
             "2":    "A11",
             "3":    "B11",
         }),
-    ]
+    ])
 
     @property
     def required_tools(self):
@@ -106,15 +112,18 @@ class OrangeCrabR0_1Platform(LatticeECP5Platform):
             """
         ]
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, **kwargs):
         overrides = dict(ecppack_opts="--compress --freq 38.8")
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
         overrides.update(kwargs)
         return super().toolchain_prepare(fragment, name, **overrides)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         dfu_util = os.environ.get("DFU_UTIL", "dfu-util")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([dfu_util, "-D", bitstream_filename])
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([dfu_util, *device_args("dfu-util", device),
+                         "-D", bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 import os
-import subprocess
 import shutil
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 # NOTE: Keep OrangeCrabR0_2Platform for backwards compatibility
 # Originally, there was only OrangeCrabR0_2Platform, but the 85F variant
@@ -15,7 +19,11 @@ class _OrangeCrabR0_2Platform(LatticeECP5Platform):
     package     = "MG285"
     speed       = "8"
     default_clk = "clk"
-    resources   = [
+    # The flash can do quad SPI, but quad mode depends on the QE bit being set in the flash,
+    # which is not guaranteed; these are conservative values known to boot every board.
+    config_interface = ConfigInterface(flash="W25Q128JV", size=16, max_clock=38.8, bus_width=1,
+                                       compression=True)
+    resources   = LazyTable(lambda cls: [
         Resource("clk", 0, Pins("A9", dir="i"),
                  Clock(48e6), Attrs(IO_TYPE="LVCMOS33")),
 
@@ -76,8 +84,8 @@ class _OrangeCrabR0_2Platform(LatticeECP5Platform):
         ),
 
         DirectUSBResource(0, d_p="N1", d_n="M2", pullup="N2", attrs=Attrs(IO_TYPE="LVCMOS33"))
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("io", 0, {
             "0":    "N17",
             "1":    "M18",
@@ -99,7 +107,7 @@ class _OrangeCrabR0_2Platform(LatticeECP5Platform):
             "scl":  "C9",
             "sda":  "C10"
         })
-    ]
+    ])
 
     @property
     def required_tools(self):
@@ -116,15 +124,18 @@ class _OrangeCrabR0_2Platform(LatticeECP5Platform):
             """
         ]
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, **kwargs):
         overrides = dict(ecppack_opts="--compress --freq 38.8")
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
         overrides.update(kwargs)
         return super().toolchain_prepare(fragment, name, **overrides)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         dfu_util = os.environ.get("DFU_UTIL", "dfu-util")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([dfu_util, "-a 0", "-D", bitstream_filename])
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([dfu_util, *device_args("dfu-util", device),
+                         "-a 0", "-D", bitstream_filename])
 
 class OrangeCrabR0_2Platform(_OrangeCrabR0_2Platform):
     device      = "LFE5U-25F"
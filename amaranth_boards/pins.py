@@ -0,0 +1,227 @@
+import weakref
+from collections import namedtuple
+
+from amaranth.build import Pins, DiffPairs, Subsignal, ResourceError
+
+
+__all__ = ["PinUse", "PinConflict", "connector_table", "resolve_pins", "pin_index",
+           "resource_pins", "connector_pins", "aliases", "find_conflicts", "check_requests"]
+
+
+class PinUse(namedtuple("PinUse", ("resource", "subsignal", "bit", "conn_pin"))):
+    """One use of a physical pin by a resource.
+
+    ``resource`` is the ``(name, number)`` pair of the resource, ``subsignal`` the tuple of
+    subsignal names leading to the pin (ending in ``"p"`` or ``"n"`` for differential pairs),
+    ``bit`` the index of the pin within its ``Pins``, and ``conn_pin`` the connector pin it was
+    specified as (e.g. ``"pmod_0:1"``), or ``None`` if it was specified as a physical pin.
+    """
+    def __str__(self):
+        name = "{}_{}".format(*self.resource)
+        if self.subsignal:
+            name += "." + ".".join(self.subsignal)
+        name += "[{}]".format(self.bit)
+        if self.conn_pin is not None:
+            name += " ({})".format(self.conn_pin)
+        return name
+
+
+PinConflict = namedtuple("PinConflict", ("pin", "first", "second"))
+
+
+def _iter_pins(ios, path=()):
+    for io in ios:
+        if isinstance(io, Subsignal):
+            yield from _iter_pins(io.ios, path + (io.name,))
+        elif isinstance(io, Pins):
+            yield path, io
+        elif isinstance(io, DiffPairs):
+            yield path + ("p",), io.p
+            yield path + ("n",), io.n
+
+
+def _flatten(connectors):
+    conn_pins = {}
+    for connector in connectors:
+        conn_pins.update(connector)
+
+    # Each connector pin is followed to the end of its chain once; every pin visited on the way
+    # is resolved at the same time, so the whole table is built in linear time. Connectors that
+    # (indirectly) refer to themselves would make a chain go round forever, so the pins of the
+    # current chain are tracked to detect that.
+    table = {}
+    for conn_pin in conn_pins:
+        chain = []
+        visited = set()
+        name = conn_pin
+        while name in conn_pins and name not in table:
+            if name in visited:
+                cycle = chain[chain.index(name):] + [name]
+                raise ValueError("Connector pins refer to each other in a cycle: {}"
+                                 .format(" -> ".join(cycle)))
+            chain.append(name)
+            visited.add(name)
+            name = conn_pins[name]
+        phys_name = table.get(name, name)
+        for name in chain:
+            table[name] = phys_name
+    return table
+
+
+def _resolve(table, names, resource):
+    phys_names = []
+    for name in names:
+        if ":" in name:
+            name = table.get(name, name)
+            if ":" in name and resource is not None:
+                raise NameError("Resource {!r} refers to nonexistent connector pin {}"
+                                .format(resource, name))
+            if ":" in name:
+                raise NameError("Nonexistent connector pin {}".format(name))
+        phys_names.append(name)
+    return phys_names
+
+
+class _PinIndex:
+    def __init__(self, platform):
+        table = connector_table(platform)
+
+        self.by_conn_pin = {}
+        for conn_pin, phys_name in table.items():
+            self.by_conn_pin.setdefault(phys_name, []).append(conn_pin)
+
+        self.by_pin = {}
+        self.by_resource = {}
+        self.errors = {}
+        for resource in platform.resources.values():
+            res_key = resource.name, resource.number
+            try:
+                uses = [(phys_name, PinUse(res_key, path, bit, name if ":" in name else None))
+                        for path, pins in _iter_pins(resource.ios)
+                        for bit, (name, phys_name) in enumerate(zip(pins.names,
+                            _resolve(table, pins.names, resource)))
+                        # `-` marks a pin that is not connected, e.g. an optional reset.
+                        if phys_name != "-"]
+            except NameError as e:
+                # Like `request()`, only complain about a broken resource if it is asked for.
+                self.errors[res_key] = e
+                continue
+            for phys_name, use in uses:
+                self.by_pin.setdefault(phys_name, []).append(use)
+            self.by_resource[res_key] = frozenset(phys_name for phys_name, use in uses)
+
+
+# Both caches are keyed by the number of entries in the tables they were built from, so that
+# they can be checked for staleness cheaply: resources and connectors can only ever be added to
+# a platform, never removed or replaced.
+_connector_tables = weakref.WeakKeyDictionary()
+_indices = weakref.WeakKeyDictionary()
+
+
+def _cached(cache, platform, key, build):
+    entry = cache.get(platform)
+    if entry is None or entry[0] != key:
+        entry = cache[platform] = key, build(platform)
+    return entry[1]
+
+
+def _get_index(platform):
+    return _cached(_indices, platform, (len(platform.resources), len(platform.connectors)),
+                   _PinIndex)
+
+
+def connector_table(platform):
+    """Map every connector pin of ``platform`` (e.g. ``"pmod_0:1"``) directly to the physical
+    pin it resolves to, however many connectors it goes through on the way.
+
+    The table is built on first use and cached until connectors are added. A connector pin
+    that refers to a nonexistent connector pin is mapped to the last name in its chain.
+    Raises :exc:`ValueError` if connector pins refer to each other in a cycle.
+    """
+    return _cached(_connector_tables, platform, len(platform.connectors),
+                   lambda platform: _flatten(platform.connectors.values()))
+
+
+def resolve_pins(platform, names):
+    """Return the physical pins of ``platform`` that ``names`` (physical or connector pins,
+    such as the ``names`` of a :class:`Pins`) refer to, with one lookup per pin.
+    """
+    return _resolve(connector_table(platform), names, None)
+
+
+def pin_index(platform):
+    """Map every physical pin of ``platform`` to the list of its uses, as :class:`PinUse`.
+
+    The index is built on first use and cached until resources or connectors are added.
+    Pins that are not connected (``-``) are left out.
+    """
+    return _get_index(platform).by_pin
+
+
+def resource_pins(platform, name, number=0):
+    """Return the set of physical pins used by resource ``name#number`` of ``platform``."""
+    index = _get_index(platform)
+    if (name, number) in index.errors:
+        raise index.errors[name, number]
+    if (name, number) not in index.by_resource:
+        raise ResourceError("Resource {}#{} does not exist".format(name, number))
+    return index.by_resource[name, number]
+
+
+def connector_pins(platform, pin):
+    """Return the connector pins of ``platform`` (e.g. ``"gpio_0:0+"``) that resolve, possibly
+    through other connectors, to physical pin ``pin``.
+    """
+    return list(_get_index(platform).by_conn_pin.get(pin, []))
+
+
+def aliases(platform, name, number=0):
+    """Return the ``(name, number)`` pairs of every other resource sharing a physical pin with
+    resource ``name#number`` of ``platform``.
+    """
+    index = _get_index(platform)
+    result = set()
+    for pin in resource_pins(platform, name, number):
+        result.update(use.resource for use in index.by_pin[pin])
+    result.discard((name, number))
+    return sorted(result, key=lambda res_key: (res_key[0], str(res_key[1])))
+
+
+def _normalize_request(request):
+    if isinstance(request, str):
+        return request, 0
+    name, number = request
+    return name, number
+
+
+def find_conflicts(platform, requests):
+    """Find the physical pins that would be claimed twice if ``requests`` were made.
+
+    ``requests`` is an iterable of resource names (meaning number 0) or ``(name, number)``
+    pairs, in the order the design would request them. Returns a list of
+    :class:`PinConflict`, each naming the pin, the use that would claim it first, and the one
+    that would then fail.
+    """
+    index = _get_index(platform)
+    claimed = {}
+    conflicts = []
+    for request in requests:
+        res_key = _normalize_request(request)
+        for pin in resource_pins(platform, *res_key):
+            use = next(use for use in index.by_pin[pin] if use.resource == res_key)
+            if pin in claimed:
+                conflicts.append(PinConflict(pin, claimed[pin], use))
+            else:
+                claimed[pin] = use
+    return conflicts
+
+
+def check_requests(platform, requests):
+    """Like :func:`find_conflicts`, but raise a :class:`ResourceError` describing every
+    conflict, if there are any.
+    """
+    conflicts = find_conflicts(platform, requests)
+    if conflicts:
+        raise ResourceError("Requested resources conflict:\n" + "\n".join(
+            "  physical pin {} is used by {} and by {}".format(pin, first, second)
+            for pin, first, second in conflicts))
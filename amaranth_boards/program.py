@@ -0,0 +1,420 @@
+import os
+import re
+import json
+import time
+import signal
+import asyncio
+import hashlib
+import inspect
+import tempfile
+import threading
+import subprocess
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ._command import record_commands
+
+
+__all__ = ["Device", "device_args", "ProgramState", "ProgramResult", "CommandResult",
+           "program", "program_all", "program_async"]
+
+
+class Device(namedtuple("Device", ("serial", "usb_path", "cable"))):
+    """A programming target, for boards that may share a host with others of the same kind.
+
+    ``serial`` is the USB serial number of the programmer, ``usb_path`` the port it is plugged
+    into, as in ``/sys/bus/usb/devices`` (e.g. ``"1-2.3"``, which stays the same when the board
+    is replugged into the same port), and ``cable`` the name of the cable as understood by the
+    programming tool. Any of them may be ``None``.
+    """
+    def __new__(cls, serial=None, usb_path=None, cable=None):
+        return super().__new__(cls, serial, usb_path, cable)
+
+    _keys = {"serial": "serial", "usb": "usb_path", "cable": "cable"}
+
+    @classmethod
+    def parse(cls, spec):
+        """Parse a comma-separated list of ``serial:SERIAL``, ``usb:PATH`` and ``cable:NAME``.
+        A value without a key is a serial number.
+        """
+        fields = {}
+        for item in spec.split(","):
+            key, sep, value = item.partition(":")
+            if not sep:
+                key, value = "serial", item
+            if key not in cls._keys:
+                raise ValueError("Unknown device selector {!r}; expected one of {}"
+                                 .format(key, ", ".join(cls._keys)))
+            fields[cls._keys[key]] = value
+        return cls(**fields)
+
+    def __str__(self):
+        return ",".join("{}:{}".format(key, getattr(self, field))
+                        for key, field in self._keys.items()
+                        if getattr(self, field) is not None)
+
+
+def _usb_busdev(usb_path):
+    # Most tools address a USB device by bus and device number, which change whenever the device
+    # is replugged, so they are looked up from the port the device is plugged into.
+    sysfs = os.path.join("/sys/bus/usb/devices", usb_path)
+    try:
+        with open(os.path.join(sysfs, "busnum")) as busnum, \
+                open(os.path.join(sysfs, "devnum")) as devnum:
+            return int(busnum.read()), int(devnum.read())
+    except FileNotFoundError:
+        raise ValueError("No USB device is plugged into port {}".format(usb_path)) from None
+
+
+def _openfpgaloader_args(device, cable):
+    args = []
+    if device.cable is not None or cable is not None:
+        args += ["-c", device.cable or cable]
+    if device.serial is not None:
+        args += ["--ftdi-serial", device.serial]
+    if device.usb_path is not None:
+        args += ["--busdev-num", "{}:{}".format(*_usb_busdev(device.usb_path))]
+    return args
+
+
+def _iceprog_args(device, usb_id):
+    if device.cable is not None:
+        raise ValueError("iceprog cannot select a cable")
+    if device.serial is not None and device.usb_path is not None:
+        raise ValueError("iceprog can select a device either by serial or by USB port, "
+                         "not both")
+    if device.serial is not None:
+        return ["-d", "s:0x{:04x}:0x{:04x}:{}".format(*usb_id, device.serial)]
+    if device.usb_path is not None:
+        return ["-d", "d:{:03}/{:03}".format(*_usb_busdev(device.usb_path))]
+    return []
+
+
+def _dfu_util_args(device):
+    if device.cable is not None:
+        raise ValueError("dfu-util cannot select a cable")
+    args = []
+    if device.serial is not None:
+        args += ["-S", device.serial]
+    if device.usb_path is not None:
+        args += ["-p", device.usb_path]
+    return args
+
+
+def _xc3sprog_args(device, cable):
+    if device.usb_path is not None:
+        raise ValueError("xc3sprog cannot select a device by USB port")
+    args = []
+    if device.cable is not None or cable is not None:
+        args += ["-c", device.cable or cable]
+    if device.serial is not None:
+        args += ["-s", device.serial]
+    return args
+
+
+def _quartus_pgm_args(device, cable):
+    if device.serial is not None or device.usb_path is not None:
+        raise ValueError("quartus_pgm can only select a device by cable name (as listed by "
+                         "`jtagconfig`)")
+    if device.cable is not None or cable is not None:
+        return ["-c", device.cable or cable]
+    return []
+
+
+def device_args(tool, device, *, cable=None, usb_id=(0x0403, 0x6010)):
+    """Return the command line arguments that make ``tool`` program ``device``.
+
+    ``cable`` is the cable the board uses if ``device`` does not name one, and ``usb_id`` the
+    USB vendor and product ID of its programmer, which iceprog needs to select it by serial.
+    If ``device`` is ``None``, the tool talks to the first device it finds.
+    """
+    if device is None:
+        device = Device()
+    if tool == "openFPGALoader":
+        return _openfpgaloader_args(device, cable)
+    if tool == "iceprog":
+        return _iceprog_args(device, usb_id)
+    if tool == "dfu-util":
+        return _dfu_util_args(device)
+    if tool == "xc3sprog":
+        return _xc3sprog_args(device, cable)
+    if tool == "quartus_pgm":
+        return _quartus_pgm_args(device, cable)
+    raise ValueError("Selecting a device is not supported for {}".format(tool))
+
+
+# The files `toolchain_program` writes to a device, by extension. Logs and intermediate files
+# are left out of the digest, since they differ between builds of the same design.
+_BITSTREAM_EXTENSIONS = ("bit", "bin", "sof", "rbf", "svf", "fs", "jed", "dfu")
+
+
+class ProgramState:
+    """A record, kept in the JSON file ``path``, of what was last programmed into each device.
+
+    Devices are identified by their :class:`Device` selector, so devices that are only known as
+    "the first device found" are never recorded. The record cannot tell whether a device was
+    reprogrammed by other means or, for boards programmed into volatile memory, power cycled
+    since; see the ``confirm`` argument of :func:`program`.
+    """
+    def __init__(self, path):
+        self.path  = os.path.abspath(path)
+        self._lock = threading.Lock()
+
+    def digest(self, platform, products, name="top", **kwargs):
+        """Return the digest of programming ``products`` with ``platform`` and ``kwargs``."""
+        hasher = hashlib.sha256()
+        hasher.update("{}\0{!r}".format(type(platform).__name__, sorted(kwargs.items()))
+                      .encode())
+        for extension in _BITSTREAM_EXTENSIONS:
+            filename = "{}.{}".format(name, extension)
+            try:
+                contents = products.get(filename)
+            except FileNotFoundError:
+                continue
+            hasher.update("\0{}\0".format(filename).encode())
+            hasher.update(contents)
+        return hasher.hexdigest()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def get(self, device):
+        """Return the digest last recorded for ``device``, or ``None``."""
+        with self._lock:
+            return self._load().get(str(device))
+
+    def record(self, device, digest):
+        """Record that ``device`` was programmed with ``digest``."""
+        with self._lock:
+            # Other processes may have recorded other devices since the file was last read.
+            state = self._load()
+            state[str(device)] = digest
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=os.path.dirname(self.path))
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(temp, self.path)
+
+
+class ProgramResult(namedtuple("ProgramResult", ("platform", "device", "elapsed", "error",
+                                                 "skipped", "commands"),
+                               defaults=(None,))):
+    """The outcome of programming ``device`` (or the first device found, if ``None``) with
+    ``platform``; ``elapsed`` is in seconds and includes waiting for the device to be free.
+    ``skipped`` is true if the device already held the same bitstream. ``commands`` is the list
+    of :class:`CommandResult` for the programmer commands that were run, if they were captured
+    (see :func:`program_async`).
+    """
+    @property
+    def ok(self):
+        return self.error is None
+
+
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def _device_lock(device):
+    # Programs that target "the first device found" share the lock for `None`, since any of them
+    # could end up on the same board.
+    with _locks_lock:
+        return _locks.setdefault(device, threading.Lock())
+
+
+CommandResult = namedtuple("CommandResult", ("args", "returncode", "output"))
+CommandResult.__doc__ = """A programmer command run by :func:`program_async`, with its exit
+status and every line it printed.
+"""
+
+
+def _check_device(platform, device):
+    if device is not None:
+        if "device" not in inspect.signature(platform.toolchain_program).parameters:
+            raise ValueError("{} cannot select the device to program"
+                             .format(type(platform).__name__))
+
+
+def _is_current(state, confirm, platform, products, name, device, kwargs):
+    # Returns the digest to record once programmed, or `None` if programming can be skipped.
+    digest = state.digest(platform, products, name, **kwargs)
+    if state.get(device) == digest and (confirm is None or confirm(platform, device)):
+        return None
+    return digest
+
+
+def program(platform, products, name="top", device=None, *, state=None, confirm=None,
+            **kwargs):
+    """Program ``device`` with ``products``, waiting until no other thread is programming it.
+
+    If ``state`` is a :class:`ProgramState` and records that ``device`` was last programmed
+    with the same bitstream, programming is skipped, unless ``confirm`` is not ``None`` and
+    ``confirm(platform, device)`` returns false (e.g. because reading back the ID or the flash
+    signature of the device shows that its contents changed). Returns whether the device was
+    programmed. ``kwargs`` are passed to ``platform.toolchain_program``.
+    """
+    _check_device(platform, device)
+    with _device_lock(device):
+        digest = None
+        if state is not None and device is not None:
+            digest = _is_current(state, confirm, platform, products, name, device, kwargs)
+            if digest is None:
+                return False
+        if device is not None:
+            platform.toolchain_program(products, name, device=device, **kwargs)
+        else:
+            platform.toolchain_program(products, name, **kwargs)
+        if digest is not None:
+            state.record(device, digest)
+        return True
+
+
+def program_all(targets, name="top", *, jobs=None, state=None, confirm=None, **kwargs):
+    """Program every ``(platform, products, device)`` target in ``targets``, at most ``jobs``
+    at a time (one per target by default).
+
+    Different devices are programmed concurrently and the same device one target after another.
+    Returns a :class:`ProgramResult` per target, in the same order; a failure does not stop the
+    remaining targets from being programmed. ``state`` and ``confirm`` are passed to
+    :func:`program`.
+    """
+    targets = list(targets)
+
+    def run(target):
+        platform, products, device = target
+        start = time.monotonic()
+        skipped = False
+        try:
+            skipped = not program(platform, products, name, device, state=state,
+                                  confirm=confirm, **kwargs)
+        except Exception as e:
+            error = e
+        else:
+            error = None
+        return ProgramResult(platform, device, time.monotonic() - start, error, skipped)
+
+    if not targets:
+        return []
+    with ThreadPoolExecutor(max_workers=jobs or len(targets)) as executor:
+        return list(executor.map(run, targets))
+
+
+async def _acquire_device_lock(device):
+    # The lock `program()` uses, so that threads and tasks, in any event loop, never program
+    # the same device at once. A thread waits for it, so that the event loop keeps running.
+    lock = _device_lock(device)
+    if lock.acquire(blocking=False):
+        return lock
+
+    acquired = Future()
+    def acquire():
+        lock.acquire()
+        acquired.set_result(None)
+    threading.Thread(target=acquire, daemon=True).start()
+    try:
+        await asyncio.shield(asyncio.wrap_future(acquired))
+    except BaseException:
+        # Cancelled or timed out while waiting; give the lock back once the thread gets it.
+        acquired.add_done_callback(lambda future: lock.release())
+        raise
+    return lock
+
+
+async def _run_command_async(command, output):
+    process = await asyncio.create_subprocess_exec(*command.args,
+        stdin=subprocess.DEVNULL if command.input is None else subprocess.PIPE,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        # Programmers are often shell wrappers; their children must be killed along with them.
+        start_new_session=os.name == "posix")
+    lines = []
+    def emit(line):
+        line = line.decode("utf-8", errors="replace")
+        lines.append(line)
+        if output is not None:
+            output(line)
+
+    try:
+        if command.input is not None:
+            process.stdin.write(command.input)
+            await process.stdin.drain()
+            process.stdin.close()
+        # Programmers redraw their progress bars with carriage returns; report every update.
+        pending = b""
+        while True:
+            chunk = await process.stdout.read(4096)
+            if not chunk:
+                break
+            *complete, pending = re.split(rb"[\r\n]", pending + chunk)
+            for line in complete:
+                if line:
+                    emit(line)
+        if pending:
+            emit(pending)
+        returncode = await process.wait()
+    except BaseException:
+        # Cancelled or timed out: do not leave the programmer running.
+        if process.returncode is None:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+            await process.wait()
+        raise
+    return CommandResult(command.args, returncode, lines)
+
+
+async def _program_async(platform, products, name, device, state, confirm, output, results,
+                         kwargs):
+    lock = await _acquire_device_lock(device)
+    try:
+        digest = None
+        if state is not None and device is not None:
+            digest = _is_current(state, confirm, platform, products, name, device, kwargs)
+            if digest is None:
+                return False
+        if device is not None:
+            kwargs = dict(kwargs, device=device)
+        # The board runs its programmer commands through `run_command()`; record them and run
+        # them here, while the files they use are kept until the end of the block.
+        with record_commands() as recording:
+            platform.toolchain_program(products, name, **kwargs)
+            for command in recording.commands:
+                result = await _run_command_async(command, output)
+                results.append(result)
+                if result.returncode != 0:
+                    raise subprocess.CalledProcessError(result.returncode, command.args,
+                                                        "\n".join(result.output))
+        if digest is not None:
+            state.record(device, digest)
+        return True
+    finally:
+        lock.release()
+
+
+async def program_async(platform, products, name="top", device=None, *, timeout=None,
+                        output=None, state=None, confirm=None, **kwargs):
+    """Program ``device`` like :func:`program`, running the programmer as an asyncio subprocess.
+
+    Every line the programmer prints (including progress updates) is passed to ``output``, if
+    given. If programming takes longer than ``timeout`` seconds, or the task is cancelled, the
+    programmer is killed. Returns a :class:`ProgramResult` with the :class:`CommandResult` of
+    each programmer command; a timeout is reported as an :exc:`asyncio.TimeoutError` in its
+    ``error``, while cancellation is propagated.
+    """
+    _check_device(platform, device)
+    start = time.monotonic()
+    results = []
+    skipped = False
+    try:
+        skipped = not await asyncio.wait_for(
+            _program_async(platform, products, name, device, state, confirm, output, results,
+                           kwargs),
+            timeout)
+    except Exception as e:
+        error = e
+    else:
+        error = None
+    return ProgramResult(platform, device, time.monotonic() - start, error, skipped, results)
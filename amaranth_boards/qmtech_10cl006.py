@@ -1,10 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
 from amaranth_boards.qmtech_daughterboard import QMTechDaughterboard
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 
 __all__ = ["QMTech10CL006Platform"]
@@ -29,7 +32,7 @@ class QMTech10CL006Platform(IntelPlatform):
 
         super().__init__()
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("E1", dir="i"),
             Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
 
@@ -50,14 +53,14 @@ class QMTech10CL006Platform(IntelPlatform):
             ba="N8 L8", a="R7 T7 R8 T8 R6 T5 R5 T4 R4 T3 T6 R3 T2",
             dq="K5 L3 L4 K6 N3 M6 P3 N5 N2 N1 L1 L2 K1 K2 J1 J2", dqm="N6 P1",
             attrs=Attrs(io_standard="3.3-V LVTTL")),
-    ]
+    ])
 
     # The connectors are named after the daughterboard, not the core board
     # because on the different core boards the names vary, but on the
     # daughterboard they stay the same, which we need to connect the
     # daughterboard peripherals to the core board.
     # On this board J2 is U7 and J3 is U8
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("J", 2, {
              # odd row     even row
               "7": "G1",   "8": "G2",
@@ -118,13 +121,14 @@ class QMTech10CL006Platform(IntelPlatform):
             "57": "E16",   "58": "E15",
             "59": "D16",   "60": "D15",
         })
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                    "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                          "--operation", "P;" + bitstream_filename])
 
 if __name__ == "__main__":
     from amaranth_boards.test.blinky import Blinky
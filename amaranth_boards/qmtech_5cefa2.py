@@ -1,10 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
 from amaranth_boards.qmtech_daughterboard import QMTechDaughterboard
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 
 __all__ = ["QMTech5CEFA2Platform"]
@@ -29,7 +32,7 @@ class QMTech5CEFA2Platform(IntelPlatform):
 
         super().__init__()
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("M9", dir="i"),
             Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
 
@@ -50,14 +53,14 @@ class QMTech5CEFA2Platform(IntelPlatform):
             ba="T7 P9", a="P8 P7 N8 N6 U6 U7 V6 U8 T8 W8 R6 T9 Y9",
             dq="AA12 Y11 AA10 AB10 Y10 AA9 AB8 AA8 U10 T10 U11 R12 U12 P12 R10 R11", dqm="AB7 V10",
             attrs=Attrs(io_standard="3.3-V LVTTL")),
-    ]
+    ])
 
     # The connectors are named after the daughterboard, not the core board
     # because on the different core boards the names vary, but on the
     # daughterboard they stay the same, which we need to connect the
     # daughterboard peripherals to the core board.
     # On this board J2 is U7 and J3 is U8
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("J", 2, {
              # odd row     even row
               "7": "AA2",  "8": "AA1",
@@ -118,13 +121,14 @@ class QMTech5CEFA2Platform(IntelPlatform):
             "57": "K22",   "58": "K21",
             "59": "M16",   "60": "N16",
         })
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                    "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                          "--operation", "P;" + bitstream_filename])
 
 if __name__ == "__main__":
     from amaranth_boards.test.blinky import Blinky
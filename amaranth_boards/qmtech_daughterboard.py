@@ -1,5 +1,6 @@
 from amaranth.build import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
 
 __all__ = ["QMTechDaughterboard"]
 
@@ -61,7 +62,7 @@ class QMTechDaughterboard:
                                 attrs=attrs),
         ]
 
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("pmod", 0, "J_2:17 J_2:19 J_2:21 J_2:23 - - J_2:18 J_2:20 J_2:22 J_2:24 - -"), #J10
         Connector("pmod", 1, "J_2:7  J_2:9  J_2:11 J_2:13 - - J_2:8  J_2:10 J_2:12 J_2:14 - -"), #J11
         Connector("J", 1, {
@@ -82,7 +83,7 @@ class QMTechDaughterboard:
             "17": "J_2:46",
             "18": "J_2:45"
         }), #J1
-    ]
+    ])
 
 if __name__ == "__main__":
     print("The class in this file serves as an extension to other platforms only and cannot be built on its own.")
@@ -1,10 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
 from amaranth_boards.qmtech_daughterboard import QMTechDaughterboard
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 
 __all__ = ["QMTechEP4CEPlatform"]
@@ -33,7 +36,7 @@ class QMTechEP4CEPlatform(IntelPlatform):
 
         super().__init__()
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("T2", dir="i"),
             Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
 
@@ -54,14 +57,14 @@ class QMTechEP4CEPlatform(IntelPlatform):
             ba="Y1 W2", a="V2 V1 U2 U1 V3 V4 Y2 AA1 Y3 V5 W1 Y4 V6",
             dq="AA10 AB9 AA9 AB8 AA8 AB7 AA7 AB5 Y7 W8 Y8 V9 V10 Y10 W10 V11", dqm="AA5 W7",
             attrs=Attrs(io_standard="3.3-V LVTTL")),
-    ]
+    ])
 
     # The connectors are named after the daughterboard, not the core board
     # because on the different core boards the names vary, but on the
     # daughterboard they stay the same, which we need to connect the
     # daughterboard peripherals to the core board.
     # On this board J2 is U7 and J3 is U8
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("J", 2, {
              # odd row     even row
               "7": "R1",   "8": "R2",
@@ -122,13 +125,14 @@ class QMTechEP4CEPlatform(IntelPlatform):
             "57": "N20",   "58": "N19",
             "59": "M20",   "60": "M19",
         })
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                    "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                          "--operation", "P;" + bitstream_filename])
 
 if __name__ == "__main__":
     from amaranth_boards.test.blinky import Blinky
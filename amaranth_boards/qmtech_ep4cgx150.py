@@ -1,10 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
 from amaranth_boards.qmtech_daughterboard import QMTechDaughterboard
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 
 __all__ = ["QMTechEP4CGX150Platform"]
@@ -32,7 +35,7 @@ class QMTechEP4CGX150Platform(IntelPlatform):
 
         super().__init__()
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("B14", dir="i"),
             Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
 
@@ -53,14 +56,14 @@ class QMTechEP4CGX150Platform(IntelPlatform):
             ba="J25 J26", a="L25 L26 M25 M26 N22 N23 N24 M22 M24 L23 K26 L24 K23",
             dq="B25 B26 C25 C26 D25 D26 E25 E26 H23 G24 G22 F24 F23 E24 D24 C24", dqm="F26 H24",
             attrs=Attrs(io_standard="3.3-V LVTTL")),
-    ]
+    ])
 
     # The connectors are named after the daughterboard, not the core board
     # because on the different core boards the names vary, but on the
     # daughterboard they stay the same, which we need to connect the
     # daughterboard peripherals to the core board.
     # On this board J2 is U7 and J3 is U8
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("J", 2, {
              # odd row     even row
               "7": "AF24",   "8": "AF25",
@@ -121,13 +124,14 @@ class QMTechEP4CGX150Platform(IntelPlatform):
             "57": "D1",    "58": "C1",
             "59": "E2",    "60": "E1",
         })
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                    "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                          "--operation", "P;" + bitstream_filename])
 
 if __name__ == "__main__":
     from amaranth_boards.test.blinky import Blinky
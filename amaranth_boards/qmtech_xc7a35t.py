@@ -1,10 +1,16 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
+from amaranth_boards.config import ConfigInterface, fast_config_overrides
+from amaranth_boards.multiboot import multiboot_overrides
+from amaranth_boards.bram import bram_overrides
 from amaranth_boards.qmtech_daughterboard import QMTechDaughterboard
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 __all__ = ["QMTechXC7A35TCorePlatform"]
 
@@ -14,6 +20,8 @@ class QMTechXC7A35TPlatform(XilinxPlatform):
     speed       = "1"
     default_clk = "clk50"
     default_rst = "rst"
+    config_interface = ConfigInterface(flash=None, size=16, max_clock=33, bus_width=4,
+                                       compression=True)
 
     def __init__(self, standalone=True, toolchain="Vivado"):
         if not standalone:
@@ -26,7 +34,7 @@ class QMTechXC7A35TPlatform(XilinxPlatform):
 
         super().__init__(toolchain=toolchain)
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("N11", dir="i"),
                  Clock(50e6), Attrs(IOSTANDARD="LVCMOS33")),
 
@@ -64,14 +72,14 @@ class QMTechXC7A35TPlatform(XilinxPlatform):
             Subsignal("odt",    Pins("C13", dir="o")),
             Attrs(IOSTANDARD="SSTL135", SLEW="FAST"),
         ),
-    ]
+    ])
 
     # The connectors are named after the daughterboard, not the core board
     # because on the different core boards the names vary, but on the
     # daughterboard they stay the same, which we need to connect the
     # daughterboard peripherals to the core board.
     # On this board J2 is U7 and J3 is U8
-    connectors  = [
+    connectors  = LazyTable(lambda cls: [
         Connector("J", 2, {
              # odd row     even row
              "7": "M12",   "8": "N13",
@@ -133,9 +141,10 @@ class QMTechXC7A35TPlatform(XilinxPlatform):
             "57": "L4",  "58": "M4",
             "59": "N3",  "60": "N2",
         })
-    ]
+    ])
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, multiboot=None,
+                          patchable_memories=None, **kwargs):
         overrides = {
             "script_before_bitstream":
                 "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
@@ -149,12 +158,19 @@ class QMTechXC7A35TPlatform(XilinxPlatform):
                 set_property CONFIG_VOLTAGE 3.3 [current_design]
                 """
         }
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
+        if multiboot is not None:
+            overrides = multiboot_overrides(self, *multiboot, **overrides)
+        if patchable_memories is not None:
+            overrides = bram_overrides(self, name, patchable_memories, **overrides)
         return super().toolchain_prepare(fragment, name, **overrides, **kwargs)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         loader = os.environ.get("OPENFPGALOADER", "openFPGALoader")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.run([loader, "-v", "-c", "ft232", bitstream_filename], check=True)
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([loader, *device_args("openFPGALoader", device, cable="ft232"),
+                         "-v", bitstream_filename])
 
 
 if __name__ == "__main__":
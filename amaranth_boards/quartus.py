@@ -0,0 +1,67 @@
+import os
+import shutil
+
+from ._overrides import append_override
+
+
+__all__ = ["recompile_overrides", "build_recompile"]
+
+
+# Quartus keeps the results of every compilation stage in these directories; smart and rapid
+# recompilation reuse them.
+_DATABASE_DIRS = ("db", "incremental_db")
+
+
+def recompile_overrides(*, jobs=None, smart_recompile=True, rapid_recompile=False, **kwargs):
+    """Return ``kwargs``, with Quartus template overrides added that let Quartus use ``jobs``
+    processors (all of them by default) and reuse the results of earlier compilations.
+
+    Smart recompilation skips the stages whose inputs did not change. Rapid recompilation
+    also reuses placement and routing of the unchanged parts of the design, but is only
+    supported for some device families (e.g. Cyclone V), so it has to be requested.
+    An ``nproc`` override already in ``kwargs`` takes precedence over ``jobs``.
+    """
+    kwargs.setdefault("nproc", str(jobs or os.cpu_count()))
+    settings = []
+    if smart_recompile:
+        settings.append("set_global_assignment -name SMART_RECOMPILE ON")
+    if rapid_recompile:
+        settings.append("set_global_assignment -name RAPID_RECOMPILE_MODE ON")
+    if settings:
+        append_override(kwargs, "add_settings", "\n".join(settings))
+    return kwargs
+
+
+def _replace_tree(src, dst):
+    shutil.rmtree(dst, ignore_errors=True)
+    shutil.copytree(src, dst)
+
+
+def build_recompile(platform, elaboratable, name="top", build_dir="build", *, db_dir=None,
+                    jobs=None, smart_recompile=True, rapid_recompile=False, **kwargs):
+    """Build ``elaboratable`` for a Quartus ``platform`` with :func:`recompile_overrides`.
+
+    Quartus keeps its databases in ``build_dir``, so rebuilding in the same directory reuses
+    them. If ``db_dir`` is not ``None``, the databases are also kept as
+    ``{db_dir}/{platform}/{name}``, where ``platform`` is the platform class name, and restored
+    from there before the build, so that a fresh ``build_dir`` can be used every time.
+    """
+    if platform.toolchain != "Quartus":
+        raise ValueError("Recompilation requires the Quartus toolchain, not {}"
+                         .format(platform.toolchain))
+
+    if db_dir is not None:
+        stash = os.path.join(db_dir, type(platform).__name__, name)
+        for dirname in _DATABASE_DIRS:
+            if os.path.isdir(os.path.join(stash, dirname)):
+                _replace_tree(os.path.join(stash, dirname), os.path.join(build_dir, dirname))
+
+    products = platform.build(elaboratable, name, build_dir,
+                              **recompile_overrides(jobs=jobs, smart_recompile=smart_recompile,
+                                                    rapid_recompile=rapid_recompile, **kwargs))
+
+    if db_dir is not None and kwargs.get("do_build", True):
+        for dirname in _DATABASE_DIRS:
+            if os.path.isdir(os.path.join(build_dir, dirname)):
+                _replace_tree(os.path.join(build_dir, dirname), os.path.join(stash, dirname))
+    return products
@@ -1,10 +1,12 @@
 import os
 import sys
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.quicklogic import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 
 __all__ = ["QuickfeatherPlatform"]
@@ -18,12 +20,12 @@ class QuickfeatherPlatform(QuicklogicPlatform):
     # clock divider. Resulting frequency is: 60MHz / 12 = 5MHz
     osc_freq    = int(60e6)
     osc_div     = 12
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("J", 2, "- 28 22 21 37 36 42 40 7 2 4 5"),
         Connector("J", 3, "- 8 9 17 16 20 6 55 31 25 47 - - - - 41"),
         Connector("J", 8, "27 26 33 32 23 57 56 3 64 62 63 61 59 - - -"),
-    ]
-    resources   = [
+    ])
+    resources   = LazyTable(lambda cls: [
         *ButtonResources(pins="62"),
 
         RGBLEDResource(0, r="34", g="39", b="38"),
@@ -53,16 +55,16 @@ class QuickfeatherPlatform(QuicklogicPlatform):
             Subsignal("clk", Pins("54", dir="io")),
             Subsignal("io",  Pins("53", dir="io")),
         ),
-    ]
+    ])
 
     # This programmer requires OpenOCD with support for eos-s3:
     # https://github.com/antmicro/openocd/tree/eos-s3-support
     def toolchain_program(self, products, name):
         openocd = os.environ.get("OPENOCD", "openocd")
-        with products.extract("{}.openocd".format(name),
-                              "{}_iomux.openocd".format(name)) as \
+        with extract(products, "{}.openocd".format(name),
+                     "{}_iomux.openocd".format(name)) as \
                 (bitstream_openocd_filename, iomux_openocd_filename):
-            subprocess.check_call([
+            run_command([
                 openocd,
                 "-s", "tcl",
                 "-f", "interface/ftdi/antmicro-ftdi-adapter.cfg",
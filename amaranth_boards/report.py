@@ -0,0 +1,463 @@
+import re
+import sys
+import json
+import argparse
+from collections import namedtuple
+
+from .nextpnr import parse_fmax
+
+
+__all__ = ["ClockReport", "CriticalPath", "Utilisation", "BuildReport", "read_report"]
+
+
+class ClockReport(namedtuple("ClockReport", ("name", "fmax", "constraint", "slack",
+                                             "resource"))):
+    """The timing of one clock domain.
+
+    ``name`` is the clock as named by the toolchain, ``fmax`` the achieved frequency and
+    ``constraint`` the required one, both in Hz, and ``slack`` the worst setup slack in ns.
+    ``resource`` is the ``(name, number)`` of the board resource the clock comes from, in which
+    case ``constraint`` is the frequency of its :class:`Clock`; it is ``None`` for derived
+    clocks, whose constraint is the one reported by the toolchain. Any of ``fmax``,
+    ``constraint`` and ``slack`` may be ``None`` if the toolchain does not report it.
+    """
+    @property
+    def met(self):
+        if self.slack is not None:
+            return self.slack >= 0
+        if self.fmax is not None and self.constraint is not None:
+            return self.fmax >= self.constraint
+        return None
+
+
+class CriticalPath(namedtuple("CriticalPath", ("clock", "source", "destination", "delay",
+                                               "slack"))):
+    """The worst path of a clock domain, from ``source`` to ``destination``; ``delay`` and
+    ``slack`` are in ns, and ``slack`` is ``None`` if the toolchain does not report it.
+    """
+
+
+class Utilisation(namedtuple("Utilisation", ("used", "available"))):
+    """How much of one kind of resource the design uses; ``available`` is ``None`` if the
+    toolchain does not report it.
+    """
+    @property
+    def fraction(self):
+        if not self.available:
+            return None
+        return self.used / self.available
+
+
+class BuildReport(namedtuple("BuildReport", ("toolchain", "clocks", "utilisation",
+                                             "critical_paths"))):
+    """The timing and utilisation of a build.
+
+    ``clocks`` is a list of :class:`ClockReport`, ``critical_paths`` a list of
+    :class:`CriticalPath`, and ``utilisation`` maps ``"lut"``, ``"ff"``, ``"bram"`` and
+    ``"dsp"`` to a :class:`Utilisation`, for those the toolchain reports. Counts are in the
+    toolchain's own units (e.g. logic cells for iCE40, ALMs for Cyclone V).
+    """
+    @property
+    def worst_slack(self):
+        slacks = [clock.slack for clock in self.clocks if clock.slack is not None]
+        return min(slacks) if slacks else None
+
+    @property
+    def met(self):
+        """Whether every clock meets its constraint (``None`` if this is not known)."""
+        results = [clock.met for clock in self.clocks]
+        if False in results:
+            return False
+        if not results or None in results:
+            return None
+        return True
+
+    def as_dict(self):
+        return {
+            "toolchain":      self.toolchain,
+            "clocks":         [dict(clock._asdict(), met=clock.met) for clock in self.clocks],
+            "utilisation":    {kind: usage._asdict()
+                               for kind, usage in self.utilisation.items()},
+            "critical_paths": [path._asdict() for path in self.critical_paths],
+        }
+
+
+def _number(text):
+    return float(text.replace(",", ""))
+
+
+def _count(text):
+    # Vivado counts half-used block RAM tiles as 0.5.
+    text = text.replace(",", "")
+    return float(text) if "." in text else int(text)
+
+
+def _classify(label, patterns, utilisation, used, available):
+    # The first line matching a kind of resource wins; later ones are usually breakdowns.
+    for kind, pattern in patterns:
+        if kind not in utilisation and re.search(pattern, label, re.I):
+            utilisation[kind] = Utilisation(used, available)
+            return
+
+
+# nextpnr
+
+_nextpnr_util_patterns = [
+    ("lut",  r"^(ICESTORM_LC|TRELLIS_COMB|LUT4|MISTRAL_COMB)$"),
+    ("ff",   r"^(TRELLIS_FF|DFF|MISTRAL_FF)$"),
+    ("bram", r"^(ICESTORM_RAM|DP16KD|BSRAM|MISTRAL_M10K)$"),
+    ("dsp",  r"^(ICESTORM_DSP|MULT18X18D|MULT\w+|MISTRAL_MUL\w+)$"),
+]
+_nextpnr_util_re = re.compile(r"^Info:\s+(\w+):\s+(\d+)/\s*(\d+)", re.M)
+_nextpnr_path_re = re.compile(r"Critical path report for clock '(.+?)' \(.*?\):\n"
+                              r"(.*?)([\d.]+) ns logic, ([\d.]+) ns routing", re.S)
+
+
+def _parse_nextpnr(files):
+    log = files("{name}.tim")
+    if log is None:
+        return [], {}, []
+
+    clocks = [(clock, timing.fmax * 1e6, timing.target * 1e6,
+               1e3 / timing.target - 1e3 / timing.fmax)
+              for clock, timing in parse_fmax(log).items()]
+
+    # Utilisation is reported after packing, and again by some architectures after placement.
+    utilisation = {}
+    section = log.rpartition("Device utilisation:")[2]
+    for match in _nextpnr_util_re.finditer(section):
+        _classify(match.group(1), _nextpnr_util_patterns, utilisation,
+                  int(match.group(2)), int(match.group(3)))
+
+    paths = {}
+    for match in _nextpnr_path_re.finditer(log):
+        clock, body, logic, routing = match.groups()
+        sources = re.findall(r"\bSource (\S+)", body)
+        sinks   = re.findall(r"\bSink (\S+)", body)
+        if sources and sinks:
+            slack = next((slack for name, _, _, slack in clocks if name == clock), None)
+            paths[clock] = CriticalPath(clock, sources[0], sinks[-1],
+                                        float(logic) + float(routing), slack)
+    return clocks, utilisation, list(paths.values())
+
+
+# Vivado
+
+def _vivado_tables(report, title):
+    # Yields the rows of the whitespace-separated tables following each `title` line, as
+    # dictionaries keyed by column header.
+    lines = report.splitlines()
+    for index, line in enumerate(lines):
+        if line.strip().lstrip("| ") != title:
+            continue
+        rows = iter(lines[index + 1:])
+        for line in rows:
+            if line.strip() and not line.lstrip().startswith(("-", "|")):
+                header = line.split()
+                break
+        else:
+            return
+        next(rows, None) # the `-----` underline
+        for line in rows:
+            if not line.strip():
+                break
+            cells = line.split()
+            # Clock waveforms (`{0.000 5.000}`) contain a space.
+            if "{" in line:
+                start, end = line.index("{"), line.index("}") + 1
+                cells = line[:start].split() + [line[start:end]] + line[end:].split()
+            yield dict(zip(header, cells))
+
+
+_vivado_util_patterns = [
+    ("lut",  r"^(Slice|CLB) LUTs\*?$"),
+    ("ff",   r"^(Slice|CLB) Registers\*?$"),
+    ("bram", r"^Block RAM Tile$"),
+    ("dsp",  r"^DSPs$"),
+]
+
+_vivado_path_re = re.compile(
+    r"^Slack(?: \(\w+\))?\s*:\s*(-?[\d.]+)ns.*?\n"
+    r"\s*Source:\s+(\S+).*?\n"
+    r"\s*Destination:\s+(\S+).*?\n"
+    r"\s*Path Group:\s+(\S+).*?\n"
+    r"\s*Path Type:\s+Setup.*?"
+    r"Data Path Delay:\s+([\d.]+)ns", re.M | re.S)
+
+
+def _parse_vivado(files):
+    clocks, utilisation, paths = [], {}, {}
+
+    report = files("{name}_timing.rpt")
+    if report is not None:
+        periods = {row["Clock"]: _number(row["Period(ns)"])
+                   for row in _vivado_tables(report, "Clock Summary")
+                   if "Period(ns)" in row}
+        for row in _vivado_tables(report, "Intra Clock Table"):
+            clock = row.get("Clock")
+            if clock not in periods or row.get("WNS(ns)") in (None, "NA"):
+                continue
+            period, slack = periods[clock], _number(row["WNS(ns)"])
+            clocks.append((clock, 1e9 / (period - slack), 1e9 / period, slack))
+        for match in _vivado_path_re.finditer(report):
+            slack, source, destination, clock, delay = match.groups()
+            if clock not in paths:
+                paths[clock] = CriticalPath(clock, source, destination, float(delay),
+                                            float(slack))
+
+    report = files("{name}_utilization_place.rpt")
+    if report is not None:
+        header = None
+        for line in report.splitlines():
+            if not line.startswith("|"):
+                continue
+            cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+            if cells[0] == "Site Type":
+                header = cells
+            elif header is not None and len(cells) == len(header):
+                row = dict(zip(header, cells))
+                try:
+                    used, available = _count(row["Used"]), _count(row["Available"])
+                except (KeyError, ValueError):
+                    continue
+                _classify(row["Site Type"], _vivado_util_patterns, utilisation,
+                          used, available)
+
+    return clocks, utilisation, list(paths.values())
+
+
+# ISE
+
+_ise_util_patterns = [
+    ("lut",  r"^(Slice LUTs|4 input LUTs)$"),
+    ("ff",   r"^(Slice Registers|Slice Flip Flops)$"),
+    ("bram", r"^RAMB"),
+    ("dsp",  r"^(DSP48|MULT18X18)"),
+]
+_ise_util_re = re.compile(r"^\s*Number of ([^:]+?):\s+([\d,]+) out of\s+([\d,]+)", re.M)
+_ise_timing_re = re.compile(r"^\s*\*?\s*TS(\S+) = PERIOD .*?\|\s*SETUP\s*\|\s*(-?[\d.]+)ns\|"
+                            r"\s*([\d.]+)ns\|", re.M)
+
+
+def _parse_ise(files):
+    clocks, utilisation = [], {}
+
+    # PAR ends its log with the timing constraint summary; Amaranth names each period
+    # constraint `TS<clock net>`.
+    log = files("{name}_par.par")
+    if log is not None:
+        for match in _ise_timing_re.finditer(log):
+            constraint, slack, period = match.groups()
+            slack, period = float(slack), float(period)
+            clocks.append((constraint, 1e9 / period if period else None,
+                           1e9 / (period + slack) if period + slack > 0 else None, slack))
+
+    report = files("{name}_map.mrp")
+    if report is not None:
+        for match in _ise_util_re.finditer(report):
+            _classify(match.group(1), _ise_util_patterns, utilisation,
+                      _count(match.group(2)), _count(match.group(3)))
+
+    return clocks, utilisation, []
+
+
+# Quartus
+
+_quartus_util_patterns = [
+    ("lut",  r"^(Total logic elements|Logic utilization \(in ALMs\))$"),
+    ("ff",   r"^Total registers$"),
+    ("bram", r"^(Total RAM Blocks|Total block memory bits|Total memory bits)$"),
+    ("dsp",  r"^(Total DSP Blocks|Embedded Multiplier 9-bit elements)$"),
+]
+_quartus_util_re = re.compile(r"^([^:;]+?)\s*:\s*([\d,]+)(?:\s*/\s*([\d,]+))?", re.M)
+_quartus_fmax_re = re.compile(r"^; ([\d.]+) MHz\s*; ([\d.]+) MHz\s*; (.+?)\s*;", re.M)
+_quartus_slack_re = re.compile(r"^Type\s*: .*? Setup '(.+?)'\nSlack\s*: (-?[\d.]+)", re.M)
+_quartus_path_re = re.compile(r"^; .*? Setup: '(.+?)'\s*;\n(?:[+;].*\n)*?"
+                              r"; (-?[\d.]+)\s*; (.+?)\s*; (.+?)\s*;"
+                              r"(?: [^;]*;){4} (-?[\d.]+)\s*;", re.M)
+
+
+def _parse_quartus(files):
+    clocks, utilisation, paths = {}, {}, {}
+
+    # The slack summary and Fmax tables cover every timing model; keep the worst of each.
+    summary = files("{name}.sta.summary")
+    slacks = {}
+    if summary is not None:
+        for clock, slack in _quartus_slack_re.findall(summary):
+            slacks[clock] = min(float(slack), slacks.get(clock, float("inf")))
+
+    report = files("{name}.sta.rpt")
+    fmaxes = {}
+    if report is not None:
+        for section in report.split("Fmax Summary")[1:]:
+            table = section.split("\n\n")[0]
+            for _, restricted, clock in _quartus_fmax_re.findall(table):
+                fmaxes[clock] = min(float(restricted) * 1e6, fmaxes.get(clock, float("inf")))
+        for clock, slack, source, destination, delay in _quartus_path_re.findall(report):
+            if clock not in paths or float(slack) < paths[clock].slack:
+                paths[clock] = CriticalPath(clock, source, destination, float(delay),
+                                            float(slack))
+
+    for clock in sorted(set(slacks) | set(fmaxes)):
+        fmax, slack = fmaxes.get(clock), slacks.get(clock)
+        constraint = None
+        if fmax is not None and slack is not None:
+            constraint = 1e9 / (1e9 / fmax + slack)
+        clocks[clock] = (clock, fmax, constraint, slack)
+
+    summary = files("{name}.fit.summary")
+    if summary is not None:
+        for label, used, available in _quartus_util_re.findall(summary):
+            _classify(label, _quartus_util_patterns, utilisation,
+                      _count(used), _count(available) if available else None)
+
+    return list(clocks.values()), utilisation, list(paths.values())
+
+
+# Diamond
+
+_diamond_util_patterns = [
+    ("lut",  r"^LUT4s$"),
+    ("ff",   r"^registers$"),
+    ("bram", r"^(block RAMs|EBRs)$"),
+    ("dsp",  r"^(DSP|MULT)"),
+]
+_diamond_util_re = re.compile(r"^\s*(?:Number of )?([^:\n]+?):\s+(\d+) out of\s+(\d+)", re.M)
+_diamond_pref_re = re.compile(r'^Preference: FREQUENCY (?:NET|PORT) "(.+?)" ([\d.]+) MHz',
+                              re.M)
+
+
+def _parse_diamond(files):
+    clocks, utilisation, paths = [], {}, []
+
+    report = files("{name}_impl/{name}_impl.twr")
+    if report is not None:
+        sections = _diamond_pref_re.split(report)
+        for clock, constraint, body in zip(sections[1::3], sections[2::3], sections[3::3]):
+            fmax = re.search(r"Report:\s+([\d.]+)MHz is the maximum frequency", body)
+            slack = re.search(r"(meets|exceeds) requirements by (-?[\d.]+)ns", body)
+            if slack is not None:
+                slack = float(slack.group(2)) * (1 if slack.group(1) == "meets" else -1)
+            clocks.append((clock, fmax and float(fmax.group(1)) * 1e6,
+                           float(constraint) * 1e6, slack))
+            source = re.search(r"Source:\s+.*?(\S+)\s+\(from", body)
+            destination = re.search(r"Destination:\s+.*?(\S+)\s+\(to", body)
+            delay = re.search(r"Delay:\s+([\d.]+)ns", body)
+            if source and destination and delay:
+                paths.append(CriticalPath(clock, source.group(1), destination.group(1),
+                                          float(delay.group(1)), slack))
+
+    report = files("{name}_impl/{name}_impl.mrp")
+    if report is not None:
+        for match in _diamond_util_re.finditer(report):
+            _classify(match.group(1), _diamond_util_patterns, utilisation,
+                      int(match.group(2)), int(match.group(3)))
+
+    return clocks, utilisation, paths
+
+
+_parsers = {
+    "IceStorm": _parse_nextpnr,
+    "Trellis":  _parse_nextpnr,
+    "Apicula":  _parse_nextpnr,
+    "Mistral":  _parse_nextpnr,
+    "Vivado":   _parse_vivado,
+    "ISE":      _parse_ise,
+    "Quartus":  _parse_quartus,
+    "Diamond":  _parse_diamond,
+}
+
+
+def _clock_resources(platform):
+    # Toolchains name clocks after the port or net they are constrained on, which is named
+    # after the resource, e.g. `clk12_0__io` or `cd_sync_clk12_0__i` for `clk12` number 0.
+    return [((name, number), resource.clock.frequency,
+             re.compile(r"(^|[^A-Za-z0-9]){}_{}__".format(re.escape(name), number)))
+            for (name, number), resource in platform.resources.items()
+            if resource.clock is not None]
+
+
+def read_report(platform, products, name="top"):
+    """Parse the timing and utilisation reports of a build of ``platform``, and return a
+    :class:`BuildReport`.
+
+    Reports that are missing from ``products`` (e.g. because the build failed before writing
+    them) are skipped. Supported toolchains are those based on nextpnr (IceStorm, Trellis,
+    Apicula, Mistral), Vivado, ISE, Quartus and Diamond.
+    """
+    try:
+        parser = _parsers[platform.toolchain]
+    except KeyError:
+        raise ValueError("Reports of the {} toolchain cannot be parsed"
+                         .format(platform.toolchain)) from None
+
+    def files(filename):
+        try:
+            contents = products.get(filename.format(name=name), "t")
+        except FileNotFoundError:
+            return None
+        return contents.replace("\r\n", "\n")
+
+    clocks, utilisation, critical_paths = parser(files)
+    resources = _clock_resources(platform)
+    clock_reports = []
+    for clock, fmax, constraint, slack in clocks:
+        resource = None
+        for key, frequency, pattern in resources:
+            if pattern.search(clock):
+                resource, constraint = key, frequency
+                break
+        clock_reports.append(ClockReport(clock, fmax, constraint, slack, resource))
+    return BuildReport(platform.toolchain, clock_reports, utilisation, critical_paths)
+
+
+def _format_frequency(frequency):
+    return "-" if frequency is None else "{:.2f} MHz".format(frequency / 1e6)
+
+
+def main():
+    from amaranth.build.run import LocalBuildProducts
+
+    from . import get_platform
+
+    parser = argparse.ArgumentParser(prog="python -m {}".format(__spec__.name),
+        description="Summarise the timing and utilisation reports of a build.")
+    parser.add_argument("platform", metavar="PLATFORM",
+        help="platform name (e.g. `icebreaker`)")
+    parser.add_argument("-b", "--build-dir", metavar="DIR", default="build",
+        help="read the reports of the build in DIR (default: %(default)s)")
+    parser.add_argument("-n", "--name", metavar="NAME", default="top",
+        help="name of the design (default: %(default)s)")
+    parser.add_argument("--json", action="store_true",
+        help="print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        platform = get_platform(args.platform)()
+        report = read_report(platform, LocalBuildProducts(args.build_dir), args.name)
+    except (KeyError, ValueError) as e:
+        parser.error(str(e))
+
+    if args.json:
+        json.dump(report.as_dict(), sys.stdout, indent=2)
+        print()
+    else:
+        for clock in report.clocks:
+            print("{:40} {:>12} / {:>12}  slack {:>8}  {}".format(
+                clock.name, _format_frequency(clock.fmax), _format_frequency(clock.constraint),
+                "-" if clock.slack is None else "{:.3f}".format(clock.slack),
+                {True: "met", False: "FAILED", None: ""}[clock.met]))
+        for kind, usage in report.utilisation.items():
+            print("{:40} {:>12} / {:>12}".format(kind, usage.used,
+                                                 "-" if usage.available is None
+                                                 else usage.available))
+        for path in report.critical_paths:
+            print("{}: {} -> {} ({:.3f} ns)".format(path.clock, path.source,
+                                                    path.destination, path.delay))
+    if report.met is False:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
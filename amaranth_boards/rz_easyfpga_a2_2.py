@@ -1,9 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
+from ._overrides import append_override
 
 
 __all__ = ["RZEasyFPGAA2_2Platform"]
@@ -15,7 +19,7 @@ class RZEasyFPGAA2_2Platform(IntelPlatform):
     speed       = "C8"
     default_clk = "clk50"  # 50MHz builtin clock
     default_rst = "rst"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         # Clock
         Resource("clk50", 0, Pins("23", dir="i"),
                  Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
@@ -80,9 +84,9 @@ class RZEasyFPGAA2_2Platform(IntelPlatform):
         Resource("cir", 0,
             Subsignal("rx", Pins("100", dir="i"))
         ),
-    ]
+    ])
 
-    connectors  = [
+    connectors  = LazyTable(lambda cls: [
         # Located above the chip.
         Connector("gpio", 0,
             "-   -   11  7   2   144 142 138 136 133 129 127 125 121 119 114 112 110 -  "
@@ -105,20 +109,20 @@ class RZEasyFPGAA2_2Platform(IntelPlatform):
         Connector("gpio", 2,
             "30 32 34 39 43 46 50 52 54 58 60 65 67 71 73 75 77 83 -  -  - "
             "28 31 33 38 42 44 51 53 55 59 64 66 68 70 72 74 76 80 -  -  - "),
-    ]
+    ])
 
     def toolchain_prepare(self, fragment, name, **kwargs):
-        overrides = {
-            "add_settings":
-                '''set_global_assignment -name CYCLONEII_RESERVE_NCEO_AFTER_CONFIGURATION "USE AS REGULAR IO"'''
-        }
-        return super().toolchain_prepare(fragment, name, **overrides, **kwargs)
+        overrides = dict(kwargs)
+        append_override(overrides, "add_settings",
+            '''set_global_assignment -name CYCLONEII_RESERVE_NCEO_AFTER_CONFIGURATION "USE AS REGULAR IO"''')
+        return super().toolchain_prepare(fragment, name, **overrides)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                   "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                         "--operation", "P;" + bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ import subprocess
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
 
 
 __all__ = ["SK_XC6SLX9Platform"]
@@ -14,7 +15,7 @@ class SK_XC6SLX9Platform(XilinxPlatform):
     package     = "tqg144"
     speed       = "2"
     default_clk = "clk50"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("P134", dir="i"),
             Clock(50e6), Attrs(IOSTANDARD="LVCMOS33")
         ),
@@ -30,8 +31,8 @@ class SK_XC6SLX9Platform(XilinxPlatform):
             d="P46 P47 P48 P50 P75 P74 P69 P67",
             attrs=Attrs(IOSTANDARD="LVCMOS33")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("x", 7,
             "-    -    P34  -    P33  P32  P30  P29  P27  P26  "
             "P24  P23  P22  P21  P17  P16  P15  P14  P12  P11  "
@@ -50,6 +51,6 @@ class SK_XC6SLX9Platform(XilinxPlatform):
             "P99  P100 P97  P98  P94  P95  -    -    -    -    "
             "-    -    -    -    -    -    -    -    -    -    "
         ),
-    ]
+    ])
 
     # This board doesn't have an integrated programmer.
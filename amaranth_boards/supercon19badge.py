@@ -1,9 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["Supercon19BadgePlatform"]
@@ -14,6 +18,8 @@ class Supercon19BadgePlatform(LatticeECP5Platform):
     package     = "BG381"
     speed       = "8"
     default_clk = "clk8"
+    config_interface = ConfigInterface(flash=None, size=None, max_clock=38.8, bus_width=1,
+                                       compression=True)
 
     # The badge's LEDs are wired in a non-straightforward way. Here, the
     # LEDResources represent each of the common anodes of a collection of RGB LEDs.
@@ -40,7 +46,7 @@ class Supercon19BadgePlatform(LatticeECP5Platform):
         {'r': 1, 'g': 0, 'b': 2}, # LED11: by default, green
     ]
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk8", 0, Pins("U18"), Clock(8e6), Attrs(IO_TYPE="LVCMOS33")),
 
         # Used to trigger FPGA reconfiguration.
@@ -130,9 +136,9 @@ class Supercon19BadgePlatform(LatticeECP5Platform):
             dq="C5 B5 A5 C6 B10 C10 D10 A9", dqm="A10",
             attrs=Attrs(IO_TYPE="LVCMOS33", SLEWRATE="FAST")
         )
-    ]
+    ])
 
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("pmod", 0, "A15 C16 A14 D16 B15 C15 A13 B13"),
         Connector("cartridge", 0,
             "- - - - - - - - C5 B5 A5 C6 B6 A6 D6 C7 A7 C8 B8 A8 D9 C9 B9 A9" # continued:
@@ -149,17 +155,20 @@ class Supercon19BadgePlatform(LatticeECP5Platform):
             "sda":   "A16", "scl":   "B17", "gpio0": "B18",
             "gpio1": "A17", "gpio2": "B16", "gpio3": "C17"
         })
-    ]
+    ])
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, **kwargs):
         overrides = dict(ecppack_opts="--compress --freq 38.8")
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
         overrides.update(kwargs)
-        return super().toolchain_prepare(fragment, name, **overrides, **kwargs)
+        return super().toolchain_prepare(fragment, name, **overrides)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         dfu_util = os.environ.get("DFU_UTIL", "dfu-util")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([dfu_util, "-d", "1d50:614b", "-a", "0", "-D", bitstream_filename])
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([dfu_util, *device_args("dfu-util", device),
+                         "-d", "1d50:614b", "-a", "0", "-D", bitstream_filename])
 
 
 if __name__ == "__main__":
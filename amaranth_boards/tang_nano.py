@@ -1,7 +1,10 @@
-import subprocess
 from amaranth.vendor.gowin import GowinPlatform
 from amaranth.build import *
 from .resources import *
+from ._table import LazyTable
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 class TangNanoPlatform(GowinPlatform):
@@ -9,7 +12,7 @@ class TangNanoPlatform(GowinPlatform):
     family      = "GW1N-1"
     default_clk = "OSC"
     osc_frequency = 24_000_000
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         # This clock is shared with the USB-JTAG MCU and stops when the USB bus is suspended.
         # It probably should not be used, but is included for completeness.
         Resource("clk24", 0, Pins("35", dir="i"), Clock(24_000_000),
@@ -40,7 +43,7 @@ class TangNanoPlatform(GowinPlatform):
 
         Resource("lcd_backlight", 0, Pins("47", dir="o"),
                  Attrs(IO_TYPE="LVCMOS33")),
-    ]
+    ])
     connectors  = []
 
     def toolchain_prepare(self, fragment, name, **kwargs):
@@ -52,10 +55,11 @@ class TangNanoPlatform(GowinPlatform):
         }
         return super().toolchain_prepare(fragment, name, **overrides, **kwargs)
 
-    def toolchain_program(self, products, name):
-        with products.extract("{}.fs".format(name)) as bitstream_filename:
-            subprocess.check_call(["openFPGALoader", "-b", "tangnano",
-                                   bitstream_filename])
+    def toolchain_program(self, products, name, *, device=None):
+        with extract(products, "{}.fs".format(name)) as bitstream_filename:
+            run_command(["openFPGALoader", *device_args("openFPGALoader", device),
+                         "-b", "tangnano",
+                         bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
 from .resources import *
+from ._table import LazyTable
 
 
 __all__ = ["TE0714_03_50_2IPlatform"]
@@ -11,15 +12,15 @@ class TE0714_03_50_2IPlatform(XilinxPlatform):
     package     = "csg325"
     speed       = "2"
     default_clk = "clk25"
-    resources = [
+    resources = LazyTable(lambda cls: [
         Resource("clk25", 0, Pins("T14", dir="i"), Clock(25e6), Attrs(IOSTANDARD="LVCMOS18")),
         *LEDResources(pins="K18", attrs=Attrs(IOSTANDARD="LVCMOS18")),
         *SPIFlashResources(0,
             cs_n="L15", clk="E8", copi="K16", cipo="K17", wp_n="J15", hold_n="J16",
             attrs=Attrs(IOSTANDARD="LVCMOS18")
         )
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("JM1", 0,
             "G4  D6  "
             "G3  D5  "
@@ -124,7 +125,7 @@ class TE0714_03_50_2IPlatform(XilinxPlatform):
             "U10 T12 "
             "L14 R12 "
         )
-    ]
+    ])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,241 @@
+import sys
+import json
+import time
+import argparse
+import importlib
+import subprocess
+import tracemalloc
+
+from .. import platforms, get_platform
+
+
+__all__ = ["run_benchmarks", "find_regressions"]
+
+
+# Parameterised platforms are measured with each of these sets of arguments instead of with
+# the defaults, since the arguments change the resource and connector tables.
+_PARAMETERS = {
+    "genesys2":          [dict(JP6=JP6) for JP6 in ("1V2", "1V8", "2V5", "3V3")],
+    "hpc_xc7k420t":      [dict(io_voltage=io_voltage) for io_voltage in ("2.5V", "3.3V")],
+    "qmtech_ep4ce":      [dict(no_kluts=no_kluts, standalone=standalone)
+                          for no_kluts in (15, 55) for standalone in (True, False)],
+    "colorlight_qmtech": [dict(colorlight=colorlight, daughterboard=daughterboard)
+                          for colorlight in ("colorlight_i5", "colorlight_i9")
+                          for daughterboard in (False, True)],
+}
+
+# Arguments that name another platform, and are passed as that platform class.
+_PLATFORM_ARGUMENTS = {"colorlight"}
+
+
+def _configurations(info):
+    for kwargs in _PARAMETERS.get(info.name, [{}]):
+        if kwargs:
+            key = "{}({})".format(info.name, ", ".join("{}={!r}".format(*item)
+                                                      for item in kwargs.items()))
+        else:
+            key = info.name
+        yield key, {name: get_platform(value) if name in _PLATFORM_ARGUMENTS else value
+                    for name, value in kwargs.items()}
+
+
+def _request_all(platform):
+    from amaranth.build import ResourceError
+
+    requested = conflicts = errors = 0
+    for name, number in list(platform.resources):
+        try:
+            platform.request(name, number)
+            requested += 1
+        except ResourceError:
+            # Boards deliberately alias some pins between resources.
+            conflicts += 1
+        except Exception:
+            # E.g. a clock constraint on an output-only resource, which Amaranth rejects.
+            errors += 1
+    return requested, conflicts, errors
+
+
+def _measure_tables(cls):
+    # Returns the memory kept alive by building the resource and connector tables of `cls`.
+    # Tables are built once per class (and then shared by every instance), so this has to be
+    # measured before the first instance is created.
+    tracemalloc.start()
+    list(cls.resources)
+    list(cls.connectors)
+    table_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return table_memory
+
+
+def _measure_module(module, *, trace_memory):
+    # Runs in a fresh interpreter, so that the import is cold.
+    results = {}
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    importlib.import_module("{}.{}".format(__package__.rpartition(".")[0], module))
+    results["import_time"] = time.perf_counter() - start
+    if trace_memory:
+        results["import_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    results["platforms"] = {}
+    for info in platforms():
+        if info.module != module:
+            continue
+        cls = get_platform(info.name)
+        if trace_memory:
+            table_memory = _measure_tables(cls)
+        for key, kwargs in _configurations(info):
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            platform = cls(**kwargs)
+            init_time = time.perf_counter() - start
+            start = time.perf_counter()
+            requested, conflicts, errors = _request_all(platform)
+            request_time = time.perf_counter() - start
+
+            if trace_memory:
+                results["platforms"][key] = {
+                    "peak_memory":  tracemalloc.get_traced_memory()[1],
+                    "table_memory": table_memory,
+                }
+                tracemalloc.stop()
+            else:
+                results["platforms"][key] = {
+                    "init_time":    init_time,
+                    "request_time": request_time,
+                    "requested":    requested,
+                    "conflicts":    conflicts,
+                    "errors":       errors,
+                }
+    return results
+
+
+def _run_worker(module, *, trace_memory):
+    args = [sys.executable, "-m", "{}.bench".format(__package__), "--worker", module]
+    if trace_memory:
+        args.append("--trace-memory")
+    output = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if output.returncode != 0:
+        raise RuntimeError("Measuring {} failed:\n{}".format(module, output.stderr.decode()))
+    return json.loads(output.stdout)
+
+
+def run_benchmarks(modules=None, *, repeat=3, log=None):
+    """Measure every board module in ``modules`` (all of them by default).
+
+    Times are the minimum over ``repeat`` runs in fresh interpreters; memory is measured in
+    a separate run, since tracing allocations slows everything else down.
+    """
+    if modules is None:
+        modules = sorted({info.module for info in platforms()})
+
+    results = {}
+    for module in modules:
+        if log is not None:
+            log("{}...".format(module))
+        runs = [_run_worker(module, trace_memory=False) for _ in range(max(1, repeat))]
+        memory = _run_worker(module, trace_memory=True)
+
+        result = results[module] = {
+            "import_time":   min(run["import_time"] for run in runs),
+            "import_memory": memory["import_memory"],
+            "platforms":     {},
+        }
+        for key, measurement in runs[0]["platforms"].items():
+            result["platforms"][key] = {
+                "init_time":    min(run["platforms"][key]["init_time"]    for run in runs),
+                "request_time": min(run["platforms"][key]["request_time"] for run in runs),
+                "peak_memory":  memory["platforms"][key]["peak_memory"],
+                "table_memory": memory["platforms"][key]["table_memory"],
+                "requested":    measurement["requested"],
+                "conflicts":    measurement["conflicts"],
+                "errors":       measurement["errors"],
+            }
+    return results
+
+
+def find_regressions(baseline, results, *, max_slowdown=1.5, max_memory_growth=1.2,
+                     noise_floor=1e-3):
+    """Compare ``results`` against ``baseline`` and describe every regression.
+
+    A time regresses if it grew by more than ``max_slowdown`` times and by more than
+    ``noise_floor`` seconds; a memory figure regresses if it grew by more than
+    ``max_memory_growth`` times. Modules and platforms missing from ``baseline`` are ignored.
+    """
+    def compare(where, metric, old, new):
+        if metric.endswith("_time"):
+            if new > old * max_slowdown and new - old > noise_floor:
+                yield "{}: {} {:.2f} ms -> {:.2f} ms".format(where, metric, old * 1e3, new * 1e3)
+        elif metric.endswith("_memory"):
+            if new > old * max_memory_growth:
+                yield "{}: {} {:.1f} KiB -> {:.1f} KiB".format(where, metric, old / 1024,
+                                                              new / 1024)
+
+    regressions = []
+    for module, result in results.items():
+        if module not in baseline:
+            continue
+        for metric in ("import_time", "import_memory"):
+            regressions += compare(module, metric, baseline[module][metric], result[metric])
+        for key, measurement in result["platforms"].items():
+            if key not in baseline[module]["platforms"]:
+                continue
+            for metric in ("init_time", "request_time", "peak_memory", "table_memory"):
+                if metric not in baseline[module]["platforms"][key]:
+                    continue # recorded before the metric was added
+                regressions += compare(key, metric, baseline[module]["platforms"][key][metric],
+                                       measurement[metric])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m {}.bench".format(__package__),
+        description="Measure import time, instantiation time, resource request time, memory "
+                    "use, and the size of the resource and connector tables of board modules.")
+    parser.add_argument("modules", metavar="MODULE", nargs="*",
+        help="board module to measure (default: all)")
+    parser.add_argument("-o", "--output", metavar="FILE", type=argparse.FileType("w"),
+        default=sys.stdout,
+        help="write results as JSON to FILE (default: standard output)")
+    parser.add_argument("-n", "--repeat", metavar="N", type=int, default=3,
+        help="take the minimum time over N runs (default: %(default)s)")
+    parser.add_argument("--baseline", metavar="FILE", type=argparse.FileType("r"),
+        help="compare against the results in FILE and exit with an error on regressions")
+    parser.add_argument("--max-slowdown", metavar="RATIO", type=float, default=1.5,
+        help="largest acceptable ratio of a time to its baseline (default: %(default)s)")
+    parser.add_argument("--max-memory-growth", metavar="RATIO", type=float, default=1.2,
+        help="largest acceptable ratio of a memory figure to its baseline "
+             "(default: %(default)s)")
+    parser.add_argument("--noise-floor", metavar="SECONDS", type=float, default=1e-3,
+        help="ignore time differences smaller than this (default: %(default)s)")
+    parser.add_argument("--worker", metavar="MODULE",
+        help=argparse.SUPPRESS)
+    parser.add_argument("--trace-memory", action="store_true",
+        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(_measure_module(args.worker, trace_memory=args.trace_memory), sys.stdout)
+        return
+
+    results = run_benchmarks(args.modules or None, repeat=args.repeat,
+                             log=lambda message: print(message, file=sys.stderr))
+    json.dump(results, args.output, indent=1, sort_keys=True)
+    args.output.write("\n")
+
+    if args.baseline is not None:
+        regressions = find_regressions(json.load(args.baseline), results,
+                                       max_slowdown=args.max_slowdown,
+                                       max_memory_growth=args.max_memory_growth,
+                                       noise_floor=args.noise_floor)
+        if regressions:
+            sys.exit("Regressions:\n" + "\n".join("  " + line for line in regressions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import os
+import re
+import sys
+import json
+import time
+import inspect
+import argparse
+import subprocess
+
+from amaranth.build import ResourceError
+
+from .. import platforms, get_platform
+from .._tools import tool_command
+from ..instrument import build
+from ..report import read_report
+from .bench import _configurations
+from .stress import DESIGNS, StressTop, device_size
+
+
+__all__ = ["run_stress", "load_history", "append_history", "find_regressions"]
+
+
+def _skip_reason(platform):
+    if platform.default_clk is None:
+        return "no default clock"
+    if device_size(platform) is None:
+        return "size of device {!r} is not known".format(getattr(platform, "device", None))
+    if not platform.has_required_tools():
+        return "toolchain {} is not available".format(platform.toolchain)
+    return None
+
+
+def _measure_design(platform, design, build_dir):
+    parameters = {name: getattr(design, name)
+                  for name in inspect.signature(type(design)).parameters}
+    try:
+        products, profiler = build(platform, StressTop(design), build_dir=build_dir)
+    except subprocess.CalledProcessError as e:
+        return {"parameters": parameters, "error": str(e)}
+
+    result = {
+        "parameters": parameters,
+        "wall_time":  sum(stage.wall for stage in profiler.stages),
+        "stages":     {stage.name: stage.wall for stage in profiler.stages},
+    }
+    try:
+        report = read_report(platform, products)
+    except ValueError:
+        # Timing and utilisation of this toolchain are not known; build time still is.
+        return result
+    result.update(report.as_dict())
+    result["met"] = report.met
+    return result
+
+
+def run_stress(names=None, designs=None, *, build_root="build/stress", fill=0.5, log=None):
+    """Build each of ``designs`` (all of :data:`~.stress.DESIGNS` by default) for every
+    platform in ``names`` (all of them by default) whose toolchain is available.
+
+    Each design is scaled to use about ``fill`` of the logic of the device. Platforms with
+    arguments are built with their first configuration of :mod:`.bench`. Returns, for each
+    platform, the Fmax of each clock, utilisation and build time of each design as in
+    :meth:`~amaranth_boards.report.BuildReport.as_dict`, or the reason it was skipped.
+    """
+    if designs is None:
+        designs = list(DESIGNS)
+
+    results = {}
+    for info in platforms():
+        if names is not None and info.name not in names:
+            continue
+        key, kwargs = next(_configurations(info))
+        platform = get_platform(info.name)(**kwargs)
+        reason = _skip_reason(platform)
+        if reason is not None:
+            results[key] = {"skipped": reason}
+            continue
+
+        size = device_size(platform)
+        result = results[key] = {
+            "toolchain": platform.toolchain,
+            "device":    getattr(platform, "device", None),
+            "size":      size,
+            "tools":     {tool: tool_command(tool) for tool in platform.required_tools},
+            "designs":   {},
+        }
+        for design_name in designs:
+            if log is not None:
+                log("{}: {}...".format(key, design_name))
+            design = DESIGNS[design_name].scaled(int(size * fill))
+            build_dir = os.path.join(build_root, re.sub(r"[^\w.-]", "_", key), design_name)
+            try:
+                # A fresh platform for each design, since resources can only be requested once.
+                platform = get_platform(info.name)(**kwargs)
+                result["designs"][design_name] = _measure_design(platform, design, build_dir)
+            except ResourceError as e:
+                results[key] = {"skipped": str(e)}
+                break
+    return results
+
+
+def load_history(path):
+    """Return the runs recorded in the JSON Lines file ``path``, oldest first."""
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def append_history(path, results, **fields):
+    """Append ``results``, the time, and any other ``fields`` (e.g. a ``label`` naming the
+    toolchain versions) to the JSON Lines file ``path``.
+    """
+    record = dict(fields, time=time.strftime("%Y-%m-%dT%H:%M:%S%z"), results=results)
+    with open(path, "a") as f:
+        f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def _clock_key(clock):
+    # Clock nets are named by the toolchain, and the names can change with it; the board
+    # resource a clock comes from does not. JSON turns the `(name, number)` into a list.
+    if clock.get("resource") is not None:
+        return tuple(clock["resource"])
+    return clock["name"]
+
+
+def _baseline(history, key, design):
+    # The most recent successful build of `design` for `key`.
+    for record in reversed(history):
+        measurement = record["results"].get(key, {}).get("designs", {}).get(design)
+        if measurement is not None and "error" not in measurement:
+            return measurement
+    return None
+
+
+def find_regressions(history, results, *, max_fmax_drop=0.05, max_slowdown=1.5,
+                     max_growth=1.1, noise_floor=1.0):
+    """Compare ``results`` against the most recent successful build of each design in
+    ``history`` (as returned by :func:`load_history`), and describe every regression.
+
+    A clock regresses if its Fmax fell by more than ``max_fmax_drop`` (a fraction), or if it
+    no longer meets its constraint; the build time regresses if it grew by more than
+    ``max_slowdown`` times and by more than ``noise_floor`` seconds; utilisation regresses if
+    it grew by more than ``max_growth`` times. A design that no longer builds also regresses.
+    Designs without a baseline are ignored.
+    """
+    regressions = []
+    for key, result in results.items():
+        for design, measurement in result.get("designs", {}).items():
+            baseline = _baseline(history, key, design)
+            if baseline is None:
+                continue
+            where = "{}: {}".format(key, design)
+            if "error" in measurement:
+                regressions.append("{}: build failed: {}".format(where, measurement["error"]))
+                continue
+            if baseline["parameters"] != measurement["parameters"]:
+                # Scaled differently, e.g. after a change of the fill factor.
+                continue
+
+            old_clocks = {_clock_key(clock): clock for clock in baseline.get("clocks", [])}
+            for clock in measurement.get("clocks", []):
+                old = old_clocks.get(_clock_key(clock))
+                if old is None:
+                    continue
+                if (old["fmax"] is not None and clock["fmax"] is not None and
+                        clock["fmax"] < old["fmax"] * (1 - max_fmax_drop)):
+                    regressions.append("{}: {} Fmax {:.2f} MHz -> {:.2f} MHz".format(
+                        where, clock["name"], old["fmax"] / 1e6, clock["fmax"] / 1e6))
+                if old["met"] and clock["met"] is False:
+                    regressions.append("{}: {} no longer meets timing".format(
+                        where, clock["name"]))
+
+            old, new = baseline.get("wall_time"), measurement.get("wall_time")
+            if old is not None and new > old * max_slowdown and new - old > noise_floor:
+                regressions.append("{}: build time {:.1f} s -> {:.1f} s".format(where, old, new))
+
+            for kind, usage in measurement.get("utilisation", {}).items():
+                old = baseline.get("utilisation", {}).get(kind)
+                if old is not None and usage["used"] > old["used"] * max_growth:
+                    regressions.append("{}: {} {} -> {}".format(where, kind, old["used"],
+                                                                usage["used"]))
+    return regressions
+
+
+def _format_fmax(measurement):
+    clocks = measurement.get("clocks", [])
+    if not clocks:
+        return "-"
+    return ", ".join("{:.2f} MHz".format(clock["fmax"] / 1e6) if clock["fmax"] is not None
+                     else "-" for clock in clocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m {}.fmax".format(__package__),
+        description="Build scaled stress designs for every board whose toolchain is available, "
+                    "and record the Fmax, utilisation and build time of each.")
+    parser.add_argument("platforms", metavar="PLATFORM", nargs="*",
+        help="platform to build for (default: all)")
+    parser.add_argument("-d", "--design", metavar="DESIGN", dest="designs", action="append",
+        choices=list(DESIGNS),
+        help="build DESIGN (one of: %(choices)s; default: all); may be repeated")
+    parser.add_argument("-b", "--build-root", metavar="DIR", default="build/stress",
+        help="build in subdirectories of DIR (default: %(default)s)")
+    parser.add_argument("--fill", metavar="FRACTION", type=float, default=0.5,
+        help="scale designs to use about FRACTION of the logic of each device "
+             "(default: %(default)s)")
+    parser.add_argument("--history", metavar="FILE",
+        help="compare against the runs recorded in the JSON Lines file FILE, append this run "
+             "to it, and exit with an error on regressions")
+    parser.add_argument("--label", metavar="TEXT",
+        help="record TEXT (e.g. the toolchain versions) with this run in the history")
+    parser.add_argument("--max-fmax-drop", metavar="FRACTION", type=float, default=0.05,
+        help="largest acceptable fall of an Fmax from its baseline (default: %(default)s)")
+    parser.add_argument("--max-slowdown", metavar="RATIO", type=float, default=1.5,
+        help="largest acceptable ratio of a build time to its baseline (default: %(default)s)")
+    parser.add_argument("--max-growth", metavar="RATIO", type=float, default=1.1,
+        help="largest acceptable ratio of a utilisation figure to its baseline "
+             "(default: %(default)s)")
+    parser.add_argument("--noise-floor", metavar="SECONDS", type=float, default=1.0,
+        help="ignore build time differences smaller than this (default: %(default)s)")
+    args = parser.parse_args()
+
+    for name in args.platforms:
+        try:
+            get_platform(name)
+        except KeyError as e:
+            parser.error(str(e))
+
+    results = run_stress(args.platforms or None, args.designs, build_root=args.build_root,
+                         fill=args.fill, log=lambda message: print(message, file=sys.stderr))
+    for key, result in results.items():
+        if "skipped" in result:
+            print("{:30} skipped: {}".format(key, result["skipped"]))
+            continue
+        for design, measurement in result["designs"].items():
+            if "error" in measurement:
+                print("{:30} {:14} FAILED: {}".format(key, design, measurement["error"]))
+            else:
+                print("{:30} {:14} {:8.1f} s  {}".format(key, design, measurement["wall_time"],
+                                                       _format_fmax(measurement)))
+
+    if args.history is not None:
+        regressions = find_regressions(load_history(args.history), results,
+                                       max_fmax_drop=args.max_fmax_drop,
+                                       max_slowdown=args.max_slowdown,
+                                       max_growth=args.max_growth,
+                                       noise_floor=args.noise_floor)
+        append_history(args.history, results, label=args.label)
+        if regressions:
+            sys.exit("Regressions:\n" + "\n".join("  " + line for line in regressions))
+
+
+if __name__ == "__main__":
+    main()
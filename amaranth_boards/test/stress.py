@@ -0,0 +1,247 @@
+import re
+
+from amaranth import *
+from amaranth.build import ResourceError
+from amaranth.lib.fifo import SyncFIFOBuffered
+
+
+__all__ = ["device_size", "AdderTree", "WideCounter", "FIFOChain", "LFSRNetwork", "DESIGNS",
+           "StressTop"]
+
+
+_ICE40_SIZES = {
+    "iCE40LP384": 384,
+    "iCE40LP1K":  1280, "iCE40HX1K":  1280,
+    "iCE40LP4K":  3520, "iCE40HX4K":  3520,
+    "iCE40LP8K":  7680, "iCE40HX8K":  7680,
+    "iCE40UP3K":  2800, "iCE40UP5K":  5280,
+}
+
+_CYCLONE_V_SIZES = {2: 25000, 4: 49000, 5: 77000, 6: 110000, 7: 150000, 9: 301000}
+
+# Device name patterns, and the approximate number of logic cells (4-input LUT and flip-flop
+# pairs, or their vendor's equivalent) in the device given the number in its name.
+_DEVICE_SIZES = [
+    (r"^LFE5UM?(?:5G)?-(\d+)F$",             lambda n: n * 1000),
+    (r"^LCMXO\w*-(\d+)",                     lambda n: n),
+    (r"^xc7[aksz](\d+)",                     lambda n: n * 1000),
+    (r"^xc6slx(\d+)",                        lambda n: n * 1000),
+    (r"^xc3s(\d+)",                          lambda n: n * 20),
+    (r"^xcku(\d+)",                          lambda n: n * 13000),
+    (r"^(?:EP3C|EP4CE|EP4CGX|10CL|10M)(\d+)", lambda n: n * 1000),
+    (r"^5C[A-Z]*?[AC](\d)",                  _CYCLONE_V_SIZES.get),
+]
+
+
+def device_size(platform):
+    """Return the approximate number of logic cells in the device of ``platform``, or ``None``
+    if it is not known.
+    """
+    device = getattr(platform, "device", None) or ""
+    if device in _ICE40_SIZES:
+        return _ICE40_SIZES[device]
+    for pattern, size in _DEVICE_SIZES:
+        match = re.match(pattern, device, re.I)
+        if match:
+            return size(int(match.group(1)))
+    return None
+
+
+def _lfsr(m, width, seed):
+    # A Galois LFSR; the taps give a maximal length sequence for 32 bits, and a long enough
+    # one for other widths.
+    state = Signal(width, reset=seed % (2 ** width) or 1)
+    taps  = 0x80200003 & (2 ** width - 1) | 1 << (width - 1)
+    m.d.sync += state.eq(Mux(state[0], (state >> 1) ^ taps, state >> 1))
+    return state
+
+
+class AdderTree(Elaboratable):
+    """A pipelined tree that adds ``inputs`` numbers of ``width`` bits, fed from a shift
+    register. Stresses carry chains and routing between them.
+    """
+    cost = 2 # logic cells per input bit
+
+    def __init__(self, inputs, width=32):
+        if inputs < 2 or inputs & (inputs - 1):
+            raise ValueError("Adder tree inputs must be a power of 2 greater than 1, not {}"
+                             .format(inputs))
+        self.inputs = inputs
+        self.width  = width
+        self.o      = Signal()
+
+    @classmethod
+    def scaled(cls, size):
+        width  = 32
+        inputs = 2
+        while inputs * 2 * width * cls.cost <= size:
+            inputs *= 2
+        return cls(inputs, width)
+
+    def elaborate(self, platform):
+        m = Module()
+
+        source = _lfsr(m, self.width, seed=0x1234567)
+        level  = [Signal(self.width, name="in{}".format(index)) for index in range(self.inputs)]
+        m.d.sync += level[0].eq(source)
+        for prev, curr in zip(level, level[1:]):
+            m.d.sync += curr.eq(prev)
+
+        while len(level) > 1:
+            width = len(level[0]) + 1
+            sums  = [Signal(width, name="sum{}_{}".format(width, index))
+                     for index in range(len(level) // 2)]
+            for index, total in enumerate(sums):
+                m.d.sync += total.eq(level[2 * index] + level[2 * index + 1])
+            level = sums
+
+        m.d.sync += self.o.eq(level[0].xor())
+        return m
+
+
+class WideCounter(Elaboratable):
+    """``count`` free-running counters of ``width`` bits, with enables from an LFSR. Stresses
+    long carry chains.
+    """
+    cost = 1
+
+    def __init__(self, count, width=64):
+        if count < 1:
+            raise ValueError("Wide counter must have at least 1 counter, not {}".format(count))
+        self.count = count
+        self.width = width
+        self.o     = Signal()
+
+    @classmethod
+    def scaled(cls, size):
+        width = 64
+        return cls(max(1, size // (width * cls.cost)), width)
+
+    def elaborate(self, platform):
+        m = Module()
+
+        enables  = _lfsr(m, 32, seed=0x89abcdef)
+        counters = [Signal(self.width, name="counter{}".format(index))
+                    for index in range(self.count)]
+        for index, counter in enumerate(counters):
+            with m.If(enables[index % 32]):
+                m.d.sync += counter.eq(counter + index + 1)
+
+        m.d.sync += self.o.eq(Cat(counter[-1] for counter in counters).xor())
+        return m
+
+
+class FIFOChain(Elaboratable):
+    """A chain of ``count`` FIFOs of ``depth`` words of ``width`` bits, each inferring block
+    RAM. Stresses memory inference and the routing to block RAM columns.
+    """
+    # Block RAM is not counted in logic cells; most devices have a block RAM of 8 to 36 Kbit
+    # for every 500 to 1000 logic cells.
+    cost = 1000
+
+    def __init__(self, count, width=16, depth=512):
+        if count < 1:
+            raise ValueError("FIFO chain must have at least 1 FIFO, not {}".format(count))
+        self.count = count
+        self.width = width
+        self.depth = depth
+        self.o     = Signal()
+
+    @classmethod
+    def scaled(cls, size):
+        return cls(max(1, size // cls.cost))
+
+    def elaborate(self, platform):
+        m = Module()
+
+        # The buffered FIFO keeps one word out of the memory, so that the memory itself has
+        # a power of 2 depth.
+        fifos = [SyncFIFOBuffered(width=self.width, depth=self.depth + 1)
+                 for _ in range(self.count)]
+        for index, fifo in enumerate(fifos):
+            m.submodules["fifo{}".format(index)] = fifo
+
+        source = _lfsr(m, self.width, seed=0x2468ace)
+        m.d.comb += [
+            fifos[0].w_data.eq(source),
+            fifos[0].w_en.eq(source[0]),
+        ]
+        for prev, curr in zip(fifos, fifos[1:]):
+            m.d.comb += [
+                curr.w_data.eq(prev.r_data),
+                curr.w_en.eq(prev.r_rdy),
+                prev.r_en.eq(curr.w_rdy),
+            ]
+
+        sink = _lfsr(m, 32, seed=0x13579bdf)
+        m.d.comb += fifos[-1].r_en.eq(sink[0])
+        m.d.sync += self.o.eq(fifos[-1].r_data.xor() ^ fifos[-1].r_rdy)
+        return m
+
+
+class LFSRNetwork(Elaboratable):
+    """``count`` LFSRs of ``width`` bits, each also mixing in a bit of its neighbours.
+    Stresses wide XOR logic and register packing.
+    """
+    cost = 2
+
+    def __init__(self, count, width=32):
+        if count < 1:
+            raise ValueError("LFSR network must have at least 1 LFSR, not {}".format(count))
+        self.count = count
+        self.width = width
+        self.o     = Signal()
+
+    @classmethod
+    def scaled(cls, size):
+        width = 32
+        return cls(max(1, size // (width * cls.cost)), width)
+
+    def elaborate(self, platform):
+        m = Module()
+
+        states = [Signal(self.width, name="lfsr{}".format(index),
+                         reset=(0x9e3779b9 * (index + 1)) % (2 ** self.width) or 1)
+                  for index in range(self.count)]
+        taps   = 0x80200003 & (2 ** self.width - 1) | 1 << (self.width - 1)
+        for index, state in enumerate(states):
+            left  = states[index - 1][index % self.width]
+            right = states[(index + 1) % self.count][-1 - index % self.width]
+            feedback = Mux(state[0], (state >> 1) ^ taps, state >> 1)
+            m.d.sync += state.eq(feedback ^ (left ^ right))
+
+        m.d.sync += self.o.eq(Cat(state.xor() for state in states).xor())
+        return m
+
+
+DESIGNS = {
+    "adder_tree":   AdderTree,
+    "wide_counter": WideCounter,
+    "fifo_chain":   FIFOChain,
+    "lfsr_network": LFSRNetwork,
+}
+
+
+class StressTop(Elaboratable):
+    """The top level of a stress design: runs ``design`` in the default clock domain, and
+    drives the first LED of the board with its output, so that it is not optimized away.
+    """
+    def __init__(self, design):
+        self.design = design
+
+    @staticmethod
+    def _output(platform):
+        for name in ("led", "user_led", "rgb_led"):
+            try:
+                resource = platform.request(name, 0)
+            except ResourceError:
+                continue
+            return resource.r.o if name == "rgb_led" else resource.o
+        raise ResourceError("{} has no LED to drive the output of a stress design with"
+                            .format(type(platform).__name__))
+
+    def elaborate(self, platform):
+        m = Module()
+        m.submodules.design = self.design
+        m.d.comb += self._output(platform).eq(self.design.o)
+        return m
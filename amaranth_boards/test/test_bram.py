@@ -0,0 +1,65 @@
+import unittest
+
+from ..bram import PatchableMemory, bram_overrides, build
+from ..arty_a7 import ArtyA7_35Platform
+from ..icebreaker import ICEBreakerPlatform
+from ..ulx3s import ULX3S_12F_Platform
+from .blinky import Blinky
+
+
+class PatchableMemoryTestCase(unittest.TestCase):
+    def test_placeholder(self):
+        memory = PatchableMemory("mem", 8, 16)
+        self.assertEqual(memory.placeholder(), PatchableMemory("mem", 8, 16).placeholder())
+        self.assertNotEqual(memory.placeholder(), PatchableMemory("other", 8, 16).placeholder())
+
+    def test_words(self):
+        memory = PatchableMemory("mem", 16, 4)
+        self.assertEqual(memory.words(b"\x01\x02\x03"), [0x0201, 0x03, 0, 0])
+        with self.assertRaisesRegex(ValueError,
+                r"^Contents of memory mem are 5 words long, but it only holds 4$"):
+            memory.words([0] * 5)
+        with self.assertRaisesRegex(ValueError,
+                r"^Word 0x10000 does not fit in memory mem, which is 16 bits wide$"):
+            memory.words([0x10000])
+
+    def test_wrong_name(self):
+        with self.assertRaisesRegex(ValueError, r"^Memory name must be an identifier"):
+            PatchableMemory("mem 0", 8, 16)
+
+
+class BuildTestCase(unittest.TestCase):
+    def test_depth(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Memory mem is 256 words deep; `ecpbram` can only patch memories whose "
+                r"depth is a multiple of 512$"):
+            build(ULX3S_12F_Platform(), None, [PatchableMemory("mem", 8, 256)])
+        with self.assertRaisesRegex(ValueError,
+                r"^Memory mem is 128 words deep; `icebram` can only patch memories whose "
+                r"depth is a multiple of 256$"):
+            build(ICEBreakerPlatform(), None, [PatchableMemory("mem", 8, 128)])
+
+    def test_width(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Memory mem is 12 bits wide; `updatemem` can only patch memories whose "
+                r"width is a multiple of 8$"):
+            build(ArtyA7_35Platform(), None, [PatchableMemory("mem", 12, 1024)])
+
+    def test_board_overrides(self):
+        # Only the Tcl script is rendered, so that Yosys is not needed to emit Verilog.
+        class Platform(ArtyA7_35Platform):
+            @property
+            def file_templates(self):
+                return {"{{name}}.tcl": super().file_templates["{{name}}.tcl"]}
+
+        plan = Platform().prepare(Blinky(), "top",
+                                  patchable_memories=[PatchableMemory("mem", 8, 1024)])
+        script = plan.files["top.tcl"]
+        # Added to the flash image the board writes after the bitstream, not instead of it.
+        self.assertIn("write_cfgmem", script)
+        self.assertIn("_amaranth_write_mmi top.mmi {mem 8 1024}", script)
+
+    def test_overrides_other_flows(self):
+        overrides = bram_overrides(ULX3S_12F_Platform(), "top", [PatchableMemory("mem", 8, 512)],
+                                   ecppack_opts="--compress")
+        self.assertEqual(overrides, {"ecppack_opts": "--compress"})
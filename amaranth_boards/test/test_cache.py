@@ -0,0 +1,143 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ..cache import BuildCache
+
+
+class _MockPlan:
+    def __init__(self, platform, design):
+        self.platform = platform
+        self.design   = design
+        self.files    = {"build_top.sh": "build " + design}
+
+    def digest(self):
+        return self.design.encode()
+
+    def execute_local(self, build_dir):
+        self.platform.executed.append(self.design)
+        os.makedirs(build_dir, exist_ok=True)
+        for filename, contents in self.files.items():
+            with open(os.path.join(build_dir, filename), "w") as f:
+                f.write(contents)
+        with open(os.path.join(build_dir, "top.bin"), "w") as f:
+            f.write("bitstream of " + self.design)
+
+
+class _MockPlatform:
+    toolchain      = "Mock"
+    required_tools = ["mock-pnr"]
+
+    def __init__(self):
+        self.executed = []
+
+    def prepare(self, elaboratable, name="top", **kwargs):
+        return _MockPlan(self, elaboratable)
+
+
+class BuildCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir  = temp_dir.name
+        self.build_dir = os.path.join(self.temp_dir, "build")
+        self.cache     = BuildCache(os.path.join(self.temp_dir, "cache"))
+        self.platform  = _MockPlatform()
+
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        for name in ("AMARANTH_ENV_MOCK", "NMIGEN_ENV_MOCK"):
+            os.environ.pop(name, None)
+        self.set_tool_version("1.0")
+
+    def set_tool_version(self, version):
+        # A tool that reports `version`; a new command for every version, since the version of
+        # a command is only asked once.
+        path = os.path.join(self.temp_dir, "mock-pnr-{}".format(version))
+        with open(path, "w") as f:
+            f.write("#!{}\nprint('mock-pnr {}')\n".format(sys.executable, version))
+        os.chmod(path, 0o755)
+        os.environ["MOCK_PNR"] = path
+
+    def read(self, filename):
+        with open(os.path.join(self.build_dir, filename)) as f:
+            return f.read()
+
+    def test_hit(self):
+        self.cache.build(self.platform, "blinky", build_dir=self.build_dir)
+        shutil.rmtree(self.build_dir)
+        products = self.cache.build(self.platform, "blinky", build_dir=self.build_dir)
+        self.assertEqual(self.platform.executed, ["blinky"])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.read("top.bin"), "bitstream of blinky")
+        self.assertEqual(self.read("build_top.sh"), "build blinky")
+        self.assertEqual(products.build_dir, self.build_dir)
+        self.assertEqual(products.get("top.bin", "t"), "bitstream of blinky")
+
+    def test_other_files(self):
+        os.makedirs(self.build_dir)
+        with open(os.path.join(self.build_dir, "other.bin"), "w") as f:
+            f.write("other design")
+        key = self.cache.key(self.platform, self.platform.prepare("blinky"))
+        self.cache.build(self.platform, "blinky", build_dir=self.build_dir)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.cache.path, key))),
+                         ["build_top.sh", "top.bin"])
+
+        # Restoring an entry leaves other files alone.
+        with open(os.path.join(self.build_dir, "other.bin"), "w") as f:
+            f.write("other design, rebuilt")
+        self.cache.build(self.platform, "blinky", build_dir=self.build_dir)
+        self.assertEqual(self.read("other.bin"), "other design, rebuilt")
+
+    def test_design_miss(self):
+        self.cache.build(self.platform, "blinky", build_dir=self.build_dir)
+        self.cache.build(self.platform, "uart", build_dir=self.build_dir)
+        self.assertEqual(self.platform.executed, ["blinky", "uart"])
+        self.assertEqual(self.read("top.bin"), "bitstream of uart")
+
+    def test_env_var_miss(self):
+        self.cache.build(self.platform, "blinky", build_dir=self.build_dir)
+        os.environ["AMARANTH_ENV_MOCK"] = "/opt/mock/settings.sh"
+        self.cache.build(self.platform, "blinky", build_dir=self.build_dir)
+        self.assertEqual(self.platform.executed, ["blinky", "blinky"])
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_tool_version_miss(self):
+        plan = self.platform.prepare("blinky")
+        key = self.cache.key(self.platform, plan)
+        self.assertEqual(self.cache.key(self.platform, plan), key)
+        self.set_tool_version("2.0")
+        self.assertNotEqual(self.cache.key(self.platform, plan), key)
+
+        self.cache.build(self.platform, "blinky", build_dir=self.build_dir)
+        self.set_tool_version("1.0")
+        self.cache.build(self.platform, "blinky", build_dir=self.build_dir)
+        self.assertEqual(self.platform.executed, ["blinky", "blinky"])
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get("0" * 64, self.build_dir))
+        self.assertFalse(os.path.exists(self.build_dir))
+
+    def test_evict_oldest(self):
+        os.makedirs(self.build_dir)
+        with open(os.path.join(self.build_dir, "top.bin"), "w") as f:
+            f.write("x" * 100)
+
+        self.cache.max_size = 250
+        self.cache.put("a", self.build_dir, ["top.bin"])
+        self.cache.put("b", self.build_dir, ["top.bin"])
+        os.utime(os.path.join(self.cache.path, "a"), (1000, 1000))
+        os.utime(os.path.join(self.cache.path, "b"), (2000, 2000))
+        # Using an entry makes it the most recently used one.
+        self.assertIsNotNone(self.cache.get("a", self.build_dir))
+        self.cache.put("c", self.build_dir, ["top.bin"])
+        self.assertEqual(sorted(os.listdir(self.cache.path)), ["a", "c"])
+
+        self.cache.max_size = 100
+        os.utime(os.path.join(self.cache.path, "a"), (3000, 3000))
+        self.cache.evict()
+        self.assertEqual(sorted(os.listdir(self.cache.path)), ["c"])
@@ -0,0 +1,54 @@
+import inspect
+import unittest
+
+from .. import platforms, get_platform
+from ..config import ConfigInterface, fast_config_overrides
+
+
+class _MockPlatform:
+    def __init__(self, toolchain, config_interface):
+        self.toolchain = toolchain
+        self.config_interface = config_interface
+
+
+class FastConfigTestCase(unittest.TestCase):
+    def test_vivado(self):
+        config = ConfigInterface(flash=None, size=32, max_clock=50, bus_width=4, compression=True)
+        overrides = fast_config_overrides(_MockPlatform("Vivado", config),
+                                          script_before_bitstream="# board")
+        self.assertEqual(overrides["script_before_bitstream"].splitlines(), [
+            "# board",
+            "set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]",
+            "set_property BITSTREAM.CONFIG.CONFIGRATE 50 [current_design]",
+            "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
+            "set_property BITSTREAM.CONFIG.SPI_32BIT_ADDR YES [current_design]",
+        ])
+
+    def test_trellis(self):
+        config = ConfigInterface(flash=None, size=16, max_clock=38.8, bus_width=4,
+                                 compression=True)
+        overrides = fast_config_overrides(_MockPlatform("Trellis", config),
+                                          ecppack_opts="--compress")
+        self.assertEqual(overrides["ecppack_opts"], "--compress --spimode qspi --freq 38.8")
+
+    def test_no_config_interface(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^_MockPlatform does not declare a configuration interface, so fast "
+                r"configuration is not supported$"):
+            fast_config_overrides(_MockPlatform("Trellis", None))
+
+    def test_wrong_toolchain(self):
+        config = ConfigInterface(flash=None, size=None, max_clock=None, bus_width=1,
+                                 compression=False)
+        with self.assertRaisesRegex(ValueError,
+                r"^Fast configuration is not supported for the IceStorm toolchain$"):
+            fast_config_overrides(_MockPlatform("IceStorm", config))
+
+    def test_boards(self):
+        for info in platforms():
+            cls = get_platform(info.name)
+            if "fast_config" in inspect.signature(cls.toolchain_prepare).parameters:
+                with self.subTest(board=info.name):
+                    # `ColorlightQMTechPlatform` takes its interface from the module it carries.
+                    if cls.__name__ != "ColorlightQMTechPlatform":
+                        self.assertIsInstance(cls.config_interface, ConfigInterface)
@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+
+from ..flash import FlashState, compose, changed_sectors, program_flash
+from ..program import Device
+
+
+class ComposeTestCase(unittest.TestCase):
+    def test_compose(self):
+        self.assertEqual(compose([(4, b"\x01\x02"), (0, b"\x00")]),
+                         b"\x00\xff\xff\xff\x01\x02")
+        self.assertEqual(compose([(0, b"ab"), (2, b"cd")], fill=0), b"abcd")
+
+    def test_overlap(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Flash region at 0x1 overlaps the previous one, which ends at 0x2$"):
+            compose([(0, b"ab"), (1, b"c")])
+
+
+class ChangedSectorsTestCase(unittest.TestCase):
+    def test_no_old(self):
+        self.assertEqual(changed_sectors(None, bytes(10), 4), [(0, 10)])
+
+    def test_unchanged(self):
+        self.assertEqual(changed_sectors(bytes(8), bytes(8), 4), [])
+
+    def test_runs(self):
+        old = bytes(20)
+        new = b"\x00" * 4 + b"\x01" * 8 + b"\x00" * 6 + b"\x01" * 2
+        # Adjacent changed sectors are merged into one run.
+        self.assertEqual(changed_sectors(old, new, 4), [(4, 8), (16, 4)])
+
+    def test_shorter(self):
+        # The rest of the old contents stays in place, so the partly covered sector is
+        # compared, and rewritten, with it.
+        old = bytes(12)
+        self.assertEqual(changed_sectors(old, bytes(6), 4), [])
+        self.assertEqual(changed_sectors(old, b"\x00" * 5 + b"\x01", 4), [(4, 4)])
+
+    def test_longer(self):
+        self.assertEqual(changed_sectors(bytes(4), bytes(10), 4), [(4, 6)])
+
+
+class _MockPlatform:
+    def __init__(self):
+        self.writes = []
+
+    def toolchain_program_flash(self, filename, *, offset, device=None):
+        with open(filename, "rb") as f:
+            self.writes.append((offset, f.read()))
+
+
+class ProgramFlashTestCase(unittest.TestCase):
+    def test_incremental(self):
+        device = Device(serial="1234")
+        with tempfile.TemporaryDirectory() as path:
+            state = FlashState(path)
+            platform = _MockPlatform()
+
+            image = bytes(16)
+            self.assertEqual(program_flash(platform, image, device, state=state, sector_size=4),
+                             [(0, 16)])
+            self.assertEqual(state.get(device), image)
+
+            image = bytes(8) + b"\x01" * 4 + bytes(4)
+            self.assertEqual(program_flash(platform, image, device, state=state, sector_size=4),
+                             [(8, 4)])
+            self.assertEqual(platform.writes[-1], (8, b"\x01" * 4))
+            self.assertEqual(state.get(device), image)
+
+            state.forget(device)
+            self.assertIsNone(state.get(device))
+
+    def test_not_supported(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^object cannot program its configuration flash$"):
+            program_flash(object(), b"")
@@ -0,0 +1,53 @@
+import unittest
+
+from .fmax import find_regressions
+
+
+def _measurement(clocks, wall_time=10.0):
+    return {
+        "parameters":  {"width": 32},
+        "wall_time":   wall_time,
+        "clocks":      clocks,
+        "utilisation": {"logic": {"used": 100, "available": 1000}},
+    }
+
+
+def _clock(name, fmax, resource=None, met=True):
+    return {"name": name, "fmax": fmax, "resource": resource, "met": met}
+
+
+class FindRegressionsTestCase(unittest.TestCase):
+    def history(self, *clocks):
+        return [{"results": {"board": {"designs": {"adder": _measurement(list(clocks))}}}}]
+
+    def results(self, *clocks, **kwargs):
+        return {"board": {"designs": {"adder": _measurement(list(clocks), **kwargs)}}}
+
+    def test_no_regression(self):
+        history = self.history(_clock("clk", 100e6))
+        self.assertEqual(find_regressions(history, self.results(_clock("clk", 98e6))), [])
+
+    def test_fmax_drop(self):
+        history = self.history(_clock("clk", 100e6))
+        self.assertEqual(find_regressions(history, self.results(_clock("clk", 80e6, met=False))), [
+            "board: adder: clk Fmax 100.00 MHz -> 80.00 MHz",
+            "board: adder: clk no longer meets timing",
+        ])
+
+    def test_keyed_by_resource(self):
+        # The net name changed with the toolchain, but the clock comes from the same resource;
+        # resources read back from JSON are lists.
+        history = self.history(_clock("clk12_0__io", 100e6, ["clk12", 0]))
+        results = self.results(_clock("$glbnet$clk", 50e6, ("clk12", 0)))
+        self.assertEqual(find_regressions(history, results), [
+            "board: adder: $glbnet$clk Fmax 100.00 MHz -> 50.00 MHz",
+        ])
+
+    def test_build_time(self):
+        history = self.history()
+        self.assertEqual(find_regressions(history, self.results(wall_time=20.0)), [
+            "board: adder: build time 10.0 s -> 20.0 s",
+        ])
+
+    def test_no_baseline(self):
+        self.assertEqual(find_regressions([], self.results(_clock("clk", 1e6))), [])
@@ -0,0 +1,29 @@
+import unittest
+
+from .. import platforms, get_platform
+from ..index import INDEX_FILENAME, build_index, load_index, find_platforms, _dumps
+
+
+class IndexTestCase(unittest.TestCase):
+    def test_up_to_date(self):
+        with open(INDEX_FILENAME) as f:
+            self.assertEqual(f.read(), _dumps(build_index()),
+                             "index.json is out of date; run `python -m amaranth_boards.index` "
+                             "to regenerate it")
+
+    def test_program_tool(self):
+        # Every platform that can be programmed names the tool it programs with; the others
+        # (e.g. Zynq boards, programmed through their processor) only have the `Platform`
+        # method, which raises `NotImplementedError`.
+        index = load_index()
+        for info in platforms():
+            with self.subTest(name=info.name):
+                programmable = any("toolchain_program" in vars(base)
+                                   for base in get_platform(info.name).__mro__
+                                   if base.__module__.startswith("amaranth_boards."))
+                self.assertEqual(index[info.name]["program_tool"] is not None, programmable)
+
+    def test_find_platforms(self):
+        self.assertIn("icebreaker", find_platforms(family="lattice_ice40", clock=12e6))
+        self.assertNotIn("icebreaker", find_platforms(family="xilinx"))
+        self.assertIn("ulx3s_85f", find_platforms(device="LFE5U-85F", resource="sdram"))
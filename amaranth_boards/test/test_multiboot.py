@@ -0,0 +1,225 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from amaranth.hdl import *
+from amaranth.sim import Simulator
+
+from ..config import ConfigInterface
+from ..multiboot import FlashLayout, multiboot_overrides, multiboot_image, Series7Warmboot
+
+
+class _MockPlatform:
+    def __init__(self, toolchain, family=None, size=None):
+        self.toolchain = toolchain
+        self.family    = family
+        self.config_interface = ConfigInterface(flash=None, size=size, max_clock=None,
+                                                bus_width=1, compression=False)
+
+
+class _MockProducts:
+    def __init__(self, bitstream, extension="bit"):
+        self.files = {"top." + extension: bitstream}
+
+    def get(self, filename, mode="b"):
+        return self.files[filename]
+
+
+class FlashLayoutTestCase(unittest.TestCase):
+    def test_layout(self):
+        layout = FlashLayout([0, 0x400000], boot=1)
+        self.assertEqual(layout.offsets, (0, 0x400000))
+        self.assertEqual(layout.boot, 1)
+
+    def test_empty(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Flash layout must have at least one image$"):
+            FlashLayout([])
+
+    def test_same_offset(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Flash layout images must be at distinct offsets, not 0x0, 0x10000, 0x0$"):
+            FlashLayout([0, 0x10000, 0])
+
+    def test_misaligned(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Flash layout image offset 0x18000 is not a multiple of the 0x10000 byte "
+                r"erase sector$"):
+            FlashLayout([0, 0x18000])
+
+    def test_boot_out_of_range(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Boot image index 2 is out of range for 2 images$"):
+            FlashLayout([0, 0x10000], boot=2)
+
+
+class CheckLayoutTestCase(unittest.TestCase):
+    def test_series7_golden(self):
+        platform = _MockPlatform("Vivado", family="series7")
+        with self.assertRaisesRegex(ValueError,
+                r"^The golden image must be at offset 0 on 7-series devices$"):
+            multiboot_overrides(platform, FlashLayout([0x10000, 0]), 0)
+
+    def test_series7_only(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Multiboot is only supported for 7-series devices with the Vivado toolchain$"):
+            multiboot_overrides(_MockPlatform("Vivado", family="ultrascale"),
+                                FlashLayout([0]), 0)
+
+    def test_ecp5_boot(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^The image booted at power-up must be at offset 0 on ECP5 devices$"):
+            multiboot_overrides(_MockPlatform("Trellis"), FlashLayout([0, 0x10000], boot=1), 0)
+
+    def test_ice40(self):
+        platform = _MockPlatform("IceStorm")
+        for offsets in ([0x10000, 0x30000], [0x30000, 0x60000], [0x10000 * n for n in range(1, 6)]):
+            with self.subTest(offsets=offsets):
+                with self.assertRaisesRegex(ValueError,
+                        r"^iCE40 devices can hold at most 4 images"):
+                    multiboot_overrides(platform, FlashLayout(offsets), 0)
+        self.assertEqual(multiboot_overrides(platform, FlashLayout([0x20000, 0x40000]), 0), {})
+
+    def test_unsupported(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Multiboot is not supported for the Quartus toolchain$"):
+            multiboot_overrides(_MockPlatform("Quartus"), FlashLayout([0]), 0)
+
+
+class MultibootOverridesTestCase(unittest.TestCase):
+    def test_series7(self):
+        platform = _MockPlatform("Vivado", family="series7")
+        layout = FlashLayout([0, 0x400000], boot=1)
+        self.assertEqual(multiboot_overrides(platform, layout, 0, script_before_bitstream="a"), {
+            "script_before_bitstream":
+                "a\n"
+                "set_property BITSTREAM.CONFIG.CONFIGFALLBACK ENABLE [current_design]\n"
+                "set_property BITSTREAM.CONFIG.NEXT_CONFIG_ADDR 0x00400000 [current_design]\n"
+                "set_property BITSTREAM.CONFIG.NEXT_CONFIG_REBOOT ENABLE [current_design]"
+        })
+        self.assertEqual(multiboot_overrides(platform, layout, 1), {
+            "script_before_bitstream":
+                "set_property BITSTREAM.CONFIG.CONFIGFALLBACK ENABLE [current_design]"
+        })
+
+
+class MultibootImageTestCase(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+
+    def mock_tool(self, env_var):
+        # Records its arguments in `args.txt`, and writes them as its output file.
+        path = os.path.join(self.temp_dir, env_var.lower())
+        with open(path, "w") as f:
+            f.write("#!{}\n".format(sys.executable))
+            f.write("import sys\n"
+                    "args = ' '.join(sys.argv[1:])\n"
+                    "open({!r}, 'w').write(args)\n"
+                    "flag = '-o' if '-o' in sys.argv else '--output'\n"
+                    "output = sys.argv[sys.argv.index(flag) + 1]\n"
+                    "open(output, 'w').write(args)\n"
+                    .format(os.path.join(self.temp_dir, "args.txt")))
+        os.chmod(path, 0o755)
+        os.environ[env_var] = path
+
+    def test_icemulti(self):
+        self.mock_tool("ICEMULTI")
+        layout = FlashLayout([0x20000, 0x40000, 0x60000], boot=1)
+        image = multiboot_image(_MockPlatform("IceStorm"), layout,
+                                [_MockProducts(bytes(0x100), "bin")] * 3)
+        self.assertEqual(image, b"-p1 -A17 -o multiboot.bin image0.bin image1.bin image2.bin")
+
+    def test_icemulti_too_large(self):
+        self.mock_tool("ICEMULTI")
+        layout = FlashLayout([0x20000, 0x40000])
+        with self.assertRaisesRegex(ValueError,
+                r"^Image at 0x40000 does not fit in 0x20000 bytes$"):
+            multiboot_image(_MockPlatform("IceStorm"), layout,
+                            [_MockProducts(bytes(0x100), "bin"),
+                             _MockProducts(bytes(0x20001), "bin")])
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "args.txt")))
+
+    def test_ecpmulti(self):
+        self.mock_tool("ECPMULTI")
+        layout = FlashLayout([0x100000, 0], boot=1)
+        image = multiboot_image(_MockPlatform("Trellis", size=16), layout,
+                                [_MockProducts(b"golden"), _MockProducts(b"update")])
+        self.assertEqual(image, b"--flashsize 128 --output multiboot.bin --input image1.bit "
+                                b"--golden image0.bit --goldenaddr 0x100000")
+
+    def test_overlap(self):
+        self.mock_tool("ECPMULTI")
+        layout = FlashLayout([0x100000, 0], boot=1)
+        with self.assertRaisesRegex(ValueError,
+                r"^Image 1 at 0x0 is 0x100001 bytes long, and overlaps image 0 at 0x100000$"):
+            multiboot_image(_MockPlatform("Trellis", size=16), layout,
+                            [_MockProducts(b"golden"), _MockProducts(bytes(0x100001))])
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "args.txt")))
+
+    def test_larger_than_flash(self):
+        self.mock_tool("ECPMULTI")
+        layout = FlashLayout([0x100000, 0], boot=1)
+        with self.assertRaisesRegex(ValueError,
+                r"^Image 0 at 0x100000 is 0x100001 bytes long, and does not fit in 2 MiB "
+                r"of flash$"):
+            multiboot_image(_MockPlatform("Trellis", size=2), layout,
+                            [_MockProducts(bytes(0x100001)), _MockProducts(b"update")])
+
+    def test_flash_size_unknown(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^The configuration flash size of _MockPlatform is not known; specify it$"):
+            multiboot_image(_MockPlatform("Trellis"), FlashLayout([0]), [_MockProducts(b"")])
+
+    def test_image_count(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Flash layout has 2 images, but 1 were given$"):
+            multiboot_image(_MockPlatform("Trellis", size=16), FlashLayout([0, 0x10000]),
+                            [_MockProducts(b"")])
+
+
+class Series7WarmbootTestCase(unittest.TestCase):
+    def test_iprog(self):
+        dut  = Series7Warmboot()
+        frag = Fragment.get(dut, None)
+        icap = frag.find_subfragment("icap")
+        self.assertEqual(icap.type, "ICAPE2")
+        self.assertEqual(icap.parameters, {"ICAP_WIDTH": "X32"})
+
+        words = []
+        def process():
+            yield dut.address.eq(0x0123456)
+            yield dut.start.eq(1)
+            yield
+            yield dut.start.eq(0)
+            for _ in range(12):
+                yield
+                if not (yield icap.named_ports["CSIB"][0]):
+                    data = yield icap.named_ports["I"][0]
+                    # ICAPE2 takes each byte with its bits reversed.
+                    words.append(int.from_bytes(bytes(int("{:08b}".format(byte)[::-1], 2)
+                                                      for byte in data.to_bytes(4, "little")),
+                                                "little"))
+        sim = Simulator(frag)
+        sim.add_clock(1e-6)
+        sim.add_sync_process(process)
+        sim.run()
+
+        self.assertEqual([hex(word) for word in words], [hex(word) for word in [
+            0xFFFFFFFF, # dummy
+            0xAA995566, # sync
+            0x20000000, # NOOP
+            0x30020001, # write WBSTAR
+            0x00123456, # the address
+            0x20000000, # NOOP
+            0x30008001, # write CMD
+            0x0000000F, # IPROG
+            0x20000000, # NOOP
+        ]])
@@ -0,0 +1,99 @@
+import subprocess
+import unittest
+
+from ..nextpnr import ClockTiming, SeedResult, parse_fmax, _rank
+
+
+_LOG = """\
+Info: Placed 92 cells based on constraints.
+Info: Running simulated annealing placer.
+
+Info: Max frequency for clock          'clk$SB_IO_IN_$glb_clk': 143.25 MHz (PASS at 12.00 MHz)
+Info: Max frequency for clock 'uart_clk_$glb_clk': 41.07 MHz (FAIL at 48.00 MHz)
+
+Info: Max delay <async>                        -> posedge clk$SB_IO_IN_$glb_clk: 2.37 ns
+Info: Routing..
+Info: Routing complete.
+
+Info: Critical path report for clock 'clk$SB_IO_IN_$glb_clk' (posedge -> posedge):
+Info: curr total
+Info:  1.05  1.05  Source counter_SB_DFF_Q_DFFLC.O
+
+Info: Max frequency for clock          'clk$SB_IO_IN_$glb_clk': 128.52 MHz (PASS at 12.00 MHz)
+Info: Max frequency for clock 'uart_clk_$glb_clk': 50.12 MHz (PASS at 48.00 MHz)
+
+Info: Program finished normally.
+"""
+
+
+class ParseFmaxTestCase(unittest.TestCase):
+    def test_clocks(self):
+        # The report after routing replaces the one after placement.
+        self.assertEqual(parse_fmax(_LOG), {
+            "clk$SB_IO_IN_$glb_clk": ClockTiming(128.52, 12.0, True),
+            "uart_clk_$glb_clk":     ClockTiming(50.12, 48.0, True),
+        })
+
+    def test_fail(self):
+        log = _LOG[:_LOG.index("Info: Routing..")]
+        self.assertEqual(parse_fmax(log)["uart_clk_$glb_clk"],
+                         ClockTiming(41.07, 48.0, False))
+
+    def test_no_timing(self):
+        self.assertEqual(parse_fmax("Info: Packing constants..\n"
+                                    "ERROR: Unable to place cell 'led'\n"), {})
+
+
+def _result(seed, *fmaxes, target=100.0, error=None):
+    clocks = {"clk{}".format(index): ClockTiming(fmax, target, fmax >= target)
+              for index, fmax in enumerate(fmaxes)}
+    return SeedResult(seed, clocks, error)
+
+
+class SeedResultTestCase(unittest.TestCase):
+    def test_margin(self):
+        result = _result(1, 150.0, 120.0)
+        self.assertTrue(result.passed)
+        self.assertEqual(result.margin, 1.2)
+        self.assertFalse(_result(2, 150.0, 90.0).passed)
+        self.assertFalse(_result(3).passed)
+        self.assertEqual(_result(3).margin, 0.0)
+
+
+class RankTestCase(unittest.TestCase):
+    def assertRanked(self, results, seeds):
+        self.assertEqual([result.seed for result in _rank(results)], seeds)
+
+    def test_worst_clock(self):
+        # Seed 2 has the fastest clock, but seed 3 the fastest slowest clock.
+        self.assertRanked([
+            _result(1, 110.0, 105.0),
+            _result(2, 180.0, 101.0),
+            _result(3, 120.0, 115.0),
+        ], [3, 1, 2])
+
+    def test_ties(self):
+        self.assertRanked([
+            _result(4, 120.0),
+            _result(2, 130.0),
+            _result(1, 120.0),
+            _result(3, 120.0, 140.0),
+        ], [2, 4, 1, 3])
+
+    def test_failed_timing(self):
+        # A seed that fails timing on any clock ranks below every seed that meets it, however
+        # fast its other clocks are.
+        self.assertRanked([
+            _result(1, 300.0, 99.0),
+            _result(2, 101.0, 101.0),
+            _result(3, 90.0),
+        ], [2, 1, 3])
+
+    def test_failed_seeds(self):
+        error = subprocess.CalledProcessError(1, ["sh", "build_top.sh"])
+        self.assertRanked([
+            _result(1, 95.0, error=error),  # nextpnr exited because timing failed
+            _result(2, error=error),        # no timing report at all
+            _result(3, 90.0),               # timing failed, but the build completed
+            _result(4, 120.0),
+        ], [4, 3, 1, 2])
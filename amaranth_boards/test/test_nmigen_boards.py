@@ -0,0 +1,57 @@
+import sys
+import warnings
+import importlib
+import unittest
+
+import amaranth_boards.de0_nano
+
+
+class NmigenBoardsTestCase(unittest.TestCase):
+    def setUp(self):
+        # Import the alias package afresh in every test, so that its warning is issued again.
+        self.meta_path = list(sys.meta_path)
+        self.modules   = {name: module for name, module in sys.modules.items()
+                          if name == "nmigen_boards" or name.startswith("nmigen_boards.")}
+        for name in self.modules:
+            del sys.modules[name]
+
+    def tearDown(self):
+        sys.meta_path[:] = self.meta_path
+        for name in list(sys.modules):
+            if name == "nmigen_boards" or name.startswith("nmigen_boards."):
+                del sys.modules[name]
+        sys.modules.update(self.modules)
+
+    def import_alias(self, name):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            module = importlib.import_module(name)
+        return module, [warning for warning in caught
+                        if issubclass(warning.category, DeprecationWarning)]
+
+    def test_same_module(self):
+        module, _ = self.import_alias("nmigen_boards.de0_nano")
+        self.assertIs(module, amaranth_boards.de0_nano)
+        self.assertIs(sys.modules["nmigen_boards.de0_nano"], amaranth_boards.de0_nano)
+        self.assertIs(module.DE0NanoPlatform, amaranth_boards.de0_nano.DE0NanoPlatform)
+
+    def test_module_attrs_unchanged(self):
+        spec    = amaranth_boards.de0_nano.__spec__
+        loader  = amaranth_boards.de0_nano.__loader__
+        package = amaranth_boards.de0_nano.__package__
+        self.import_alias("nmigen_boards.de0_nano")
+        self.assertIs(amaranth_boards.de0_nano.__spec__, spec)
+        self.assertEqual(amaranth_boards.de0_nano.__spec__.name, "amaranth_boards.de0_nano")
+        self.assertIs(amaranth_boards.de0_nano.__loader__, loader)
+        self.assertEqual(amaranth_boards.de0_nano.__package__, package)
+
+    def test_single_warning(self):
+        _, caught = self.import_alias("nmigen_boards.de0_nano")
+        self.assertEqual(len(caught), 1)
+        self.assertEqual(str(caught[0].message),
+                         "instead of nmigen_boards, use amaranth_boards")
+
+    def test_missing_module(self):
+        self.import_alias("nmigen_boards")
+        with self.assertRaises(ModuleNotFoundError):
+            importlib.import_module("nmigen_boards.does_not_exist")
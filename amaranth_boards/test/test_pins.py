@@ -0,0 +1,146 @@
+import unittest
+
+from amaranth.build import *
+from amaranth.build.res import ResourceManager
+
+from ..pins import *
+
+
+def _platform():
+    return ResourceManager([
+        Resource("led", 0, Pins("A1", dir="o")),
+        Resource("led", 1, Pins("1", dir="o", conn=("pmod", 0))),
+        Resource("gpio", 0, Pins("B1 B2", dir="io")),
+        Resource("ext_led", 0, Pins("2", dir="o", conn=("ext", 0))),
+        Resource("diff", 0, DiffPairs("A2", "A3", dir="i")),
+        Resource("uart", 0,
+            Subsignal("tx", Pins("A4", dir="o")),
+            Subsignal("rx", Pins("A5", dir="i")),
+            Subsignal("rts", Pins("-", dir="o")),
+        ),
+        Resource("broken", 0, Pins("9", dir="o", conn=("ext", 0))),
+    ], [
+        Connector("pmod", 0, "B1 B2 B3 B4 - - B7 B8 B9 B10 - -"),
+        Connector("ext", 0, "1 2 - -", conn=("pmod", 0)),
+    ])
+
+
+class PinIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.platform = _platform()
+
+    def test_pin_index(self):
+        index = pin_index(self.platform)
+        self.assertEqual(index["A1"], [PinUse(("led", 0), (), 0, None)])
+        self.assertEqual(index["B1"], [
+            PinUse(("led", 1), (), 0, "pmod_0:1"),
+            PinUse(("gpio", 0), (), 0, None),
+        ])
+        self.assertEqual(index["A3"], [PinUse(("diff", 0), ("n",), 0, None)])
+        self.assertEqual(index["A4"], [PinUse(("uart", 0), ("tx",), 0, None)])
+        self.assertNotIn("-", index)
+
+    def test_pin_use_str(self):
+        self.assertEqual(str(PinUse(("led", 1), (), 0, "pmod_0:1")), "led_1[0] (pmod_0:1)")
+        self.assertEqual(str(PinUse(("uart", 0), ("tx",), 0, None)), "uart_0.tx[0]")
+
+    def test_resource_pins(self):
+        self.assertEqual(resource_pins(self.platform, "gpio"), {"B1", "B2"})
+        self.assertEqual(resource_pins(self.platform, "diff"), {"A2", "A3"})
+        self.assertEqual(resource_pins(self.platform, "uart"), {"A4", "A5"})
+
+    def test_resource_pins_wrong(self):
+        with self.assertRaisesRegex(ResourceError, r"^Resource nonexistent#0 does not exist$"):
+            resource_pins(self.platform, "nonexistent")
+        with self.assertRaisesRegex(NameError, r"refers to nonexistent connector pin ext_0:9$"):
+            resource_pins(self.platform, "broken")
+
+    def test_aliases(self):
+        self.assertEqual(aliases(self.platform, "gpio"), [("ext_led", 0), ("led", 1)])
+        self.assertEqual(aliases(self.platform, "led", 0), [])
+
+    def test_connector_pins(self):
+        self.assertEqual(connector_pins(self.platform, "B2"), ["pmod_0:2", "ext_0:2"])
+        self.assertEqual(connector_pins(self.platform, "A1"), [])
+
+    def test_cache_invalidated(self):
+        self.assertNotIn("C1", pin_index(self.platform))
+        self.platform.add_resources([Resource("led", 2, Pins("C1", dir="o"))])
+        self.assertEqual(pin_index(self.platform)["C1"], [PinUse(("led", 2), (), 0, None)])
+
+
+class ConflictTestCase(unittest.TestCase):
+    def setUp(self):
+        self.platform = _platform()
+
+    def test_no_conflicts(self):
+        self.assertEqual(find_conflicts(self.platform, ["led", ("led", 1), "diff"]), [])
+        check_requests(self.platform, ["led", ("led", 1), "diff"])
+
+    def test_find_conflicts(self):
+        self.assertEqual(find_conflicts(self.platform, [("led", 1), "gpio", "ext_led"]), [
+            PinConflict("B1", PinUse(("led", 1), (), 0, "pmod_0:1"),
+                              PinUse(("gpio", 0), (), 0, None)),
+            PinConflict("B2", PinUse(("gpio", 0), (), 1, None),
+                              PinUse(("ext_led", 0), (), 0, "ext_0:2")),
+        ])
+
+    def test_order(self):
+        conflict, = find_conflicts(self.platform, ["gpio", ("led", 1)])
+        self.assertEqual(conflict.first.resource,  ("gpio", 0))
+        self.assertEqual(conflict.second.resource, ("led", 1))
+
+    def test_check_requests(self):
+        with self.assertRaisesRegex(ResourceError,
+                r"^Requested resources conflict:\n"
+                r"  physical pin B1 is used by led_1\[0\] \(pmod_0:1\) and by gpio_0\[0\]$"):
+            check_requests(self.platform, [("led", 1), "gpio"])
+
+
+class ConnectorTableTestCase(unittest.TestCase):
+    def test_chained(self):
+        platform = ResourceManager([], [
+            Connector("pmod", 0, "B1 B2 - - - - B7 B8 - - - -"),
+            Connector("ext", 0, "1 2 7", conn=("pmod", 0)),
+            Connector("adapter", 0, "1 2 3", conn=("ext", 0)),
+        ])
+        self.assertEqual(connector_table(platform), {
+            "pmod_0:1": "B1", "pmod_0:2": "B2", "pmod_0:7": "B7", "pmod_0:8": "B8",
+            "ext_0:1": "B1", "ext_0:2": "B2", "ext_0:3": "B7",
+            "adapter_0:1": "B1", "adapter_0:2": "B2", "adapter_0:3": "B7",
+        })
+
+    def test_resolve_pins(self):
+        platform = _platform()
+        self.assertEqual(resolve_pins(platform, ["A1", "pmod_0:8", "ext_0:2", "-"]),
+                         ["A1", "B8", "B2", "-"])
+
+    def test_resolve_pins_wrong(self):
+        with self.assertRaisesRegex(NameError, r"^Nonexistent connector pin ext_0:9$"):
+            resolve_pins(_platform(), ["ext_0:9"])
+
+    def test_cache_invalidated(self):
+        platform = _platform()
+        self.assertNotIn("more_0:1", connector_table(platform))
+        platform.add_connectors([Connector("more", 0, "1", conn=("ext", 0))])
+        self.assertEqual(connector_table(platform)["more_0:1"], "B1")
+        self.assertEqual(resolve_pins(platform, ["more_0:1"]), ["B1"])
+
+    def test_cycle(self):
+        platform = ResourceManager([], [
+            Connector("pmod", 0, "B1 B2 - - - - B7 B8 - - - -"),
+            Connector("ext", 0, "1 2", conn=("adapter", 0)),
+            Connector("adapter", 0, "2 1", conn=("ext", 0)),
+        ])
+        with self.assertRaisesRegex(ValueError,
+                r"^Connector pins refer to each other in a cycle: "
+                r"ext_0:1 -> adapter_0:1 -> ext_0:2 -> adapter_0:2 -> ext_0:1$"):
+            connector_table(platform)
+
+    def test_self_reference(self):
+        platform = ResourceManager([], [
+            Connector("ext", 0, "1 2", conn=("ext", 0)),
+        ])
+        with self.assertRaisesRegex(ValueError,
+                r"^Connector pins refer to each other in a cycle: ext_0:1 -> ext_0:1$"):
+            connector_table(platform)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from amaranth.build.run import BuildProducts, LocalBuildProducts
+
+from .._products import LocalProducts, extract
+
+
+class _RemoteProducts(BuildProducts):
+    def __init__(self, root):
+        self.root = root
+
+    def get(self, filename, mode="b"):
+        with open(os.path.join(self.root, filename), "r" + mode) as f:
+            return f.read()
+
+
+class ExtractTestCase(unittest.TestCase):
+    def setUp(self):
+        self.build_dir = tempfile.TemporaryDirectory()
+        for filename in ("top.bit", "top.svf"):
+            with open(os.path.join(self.build_dir.name, filename), "w") as f:
+                f.write(filename)
+
+    def tearDown(self):
+        self.build_dir.cleanup()
+
+    def test_in_place(self):
+        products = LocalProducts(self.build_dir.name)
+        with extract(products, "top.bit") as path:
+            self.assertEqual(path, os.path.join(self.build_dir.name, "top.bit"))
+        with extract(products, "top.bit", "top.svf") as paths:
+            self.assertEqual([os.path.basename(path) for path in paths], ["top.bit", "top.svf"])
+        self.assertTrue(os.path.exists(path))
+
+    def test_amaranth_local(self):
+        # As returned by `platform.build()`.
+        products = LocalBuildProducts(os.path.abspath(self.build_dir.name))
+        with extract(products, "top.bit") as path:
+            self.assertEqual(path, os.path.join(self.build_dir.name, "top.bit"))
+
+    def test_copied(self):
+        # Products whose files are not known to be in a local directory.
+        products = _RemoteProducts(self.build_dir.name)
+        with extract(products, "top.bit") as path:
+            self.assertNotEqual(os.path.dirname(path), self.build_dir.name)
+            with open(path) as f:
+                self.assertEqual(f.read(), "top.bit")
+        self.assertFalse(os.path.exists(path))
+
+        products = LocalBuildProducts(os.path.relpath(self.build_dir.name))
+        with extract(products, "top.bit", "top.svf") as paths:
+            for path in paths:
+                self.assertNotEqual(os.path.dirname(path), self.build_dir.name)
+                self.assertTrue(os.path.exists(path))
+
+    def test_missing(self):
+        products = LocalProducts(self.build_dir.name)
+        with self.assertRaises(FileNotFoundError):
+            with extract(products, "top.bin"):
+                pass
@@ -0,0 +1,259 @@
+import os
+import sys
+import asyncio
+import tempfile
+import unittest
+
+from .._command import run_command
+from ..program import (Device, device_args, ProgramState, program, program_all, program_async,
+                       _device_lock)
+
+
+class DeviceTestCase(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(Device.parse("serial:FT1234"), Device(serial="FT1234"))
+        self.assertEqual(Device.parse("FT1234"), Device(serial="FT1234"))
+        self.assertEqual(Device.parse("usb:1-2.3,cable:digilent"),
+                         Device(usb_path="1-2.3", cable="digilent"))
+        self.assertEqual(Device.parse("cable:usb-blaster:1"), Device(cable="usb-blaster:1"))
+
+    def test_parse_wrong(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Unknown device selector 'port'; expected one of serial, usb, cable$"):
+            Device.parse("port:1-2")
+
+    def test_str(self):
+        self.assertEqual(str(Device(serial="FT1234", cable="digilent")),
+                         "serial:FT1234,cable:digilent")
+        device = Device(usb_path="1-2.3", cable="ft232")
+        self.assertEqual(Device.parse(str(device)), device)
+
+
+class DeviceArgsTestCase(unittest.TestCase):
+    def test_default(self):
+        self.assertEqual(device_args("iceprog", None), [])
+        self.assertEqual(device_args("openFPGALoader", None, cable="digilent"),
+                         ["-c", "digilent"])
+
+    def test_openfpgaloader(self):
+        self.assertEqual(device_args("openFPGALoader", Device(serial="FT1234"), cable="ft2232"),
+                         ["-c", "ft2232", "--ftdi-serial", "FT1234"])
+        self.assertEqual(device_args("openFPGALoader", Device(cable="ft232"), cable="ft2232"),
+                         ["-c", "ft232"])
+
+    def test_iceprog(self):
+        self.assertEqual(device_args("iceprog", Device(serial="FT1234")),
+                         ["-d", "s:0x0403:0x6010:FT1234"])
+        self.assertEqual(device_args("iceprog", Device(serial="FT1234"), usb_id=(0x0403, 0x6014)),
+                         ["-d", "s:0x0403:0x6014:FT1234"])
+        with self.assertRaisesRegex(ValueError, r"^iceprog cannot select a cable$"):
+            device_args("iceprog", Device(cable="ft2232"))
+
+    def test_dfu_util(self):
+        self.assertEqual(device_args("dfu-util", Device(serial="1234", usb_path="1-2")),
+                         ["-S", "1234", "-p", "1-2"])
+
+    def test_xc3sprog(self):
+        self.assertEqual(device_args("xc3sprog", Device(serial="1234"), cable="nexys4"),
+                         ["-c", "nexys4", "-s", "1234"])
+        with self.assertRaisesRegex(ValueError, r"^xc3sprog cannot select a device by USB port$"):
+            device_args("xc3sprog", Device(usb_path="1-2"))
+
+    def test_quartus_pgm(self):
+        self.assertEqual(device_args("quartus_pgm", Device(cable="USB-Blaster [1-2]")),
+                         ["-c", "USB-Blaster [1-2]"])
+        with self.assertRaisesRegex(ValueError, r"^quartus_pgm can only select a device by cable"):
+            device_args("quartus_pgm", Device(serial="1234"))
+
+    def test_usb_path_missing(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^No USB device is plugged into port 99-99.99$"):
+            device_args("openFPGALoader", Device(usb_path="99-99.99"))
+
+    def test_unsupported(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Selecting a device is not supported for tinyprog$"):
+            device_args("tinyprog", Device(serial="1234"))
+
+
+class _MockPlatform:
+    def toolchain_program(self, products, name, *, device=None):
+        run_command([sys.executable, "-c", "print({!r})".format(name)])
+
+
+class _RecordingPlatform:
+    def __init__(self, error=None):
+        self.programmed = []
+        self.error      = error
+
+    def toolchain_program(self, products, name, *, device=None, **kwargs):
+        if self.error is not None:
+            raise self.error
+        self.programmed.append((products, name, device, kwargs))
+
+
+class _MockProducts:
+    def __init__(self, files):
+        self.files = files
+
+    def get(self, filename, mode="b"):
+        try:
+            return self.files[filename]
+        except KeyError:
+            raise FileNotFoundError(filename) from None
+
+
+class ProgramStateTestCase(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path     = os.path.join(temp_dir.name, "state", "program.json")
+        self.state    = ProgramState(self.path)
+        self.platform = _RecordingPlatform()
+        self.products = _MockProducts({"top.bit": b"bitstream", "top.log": b"log"})
+
+    def program(self, products=None, device=Device(serial="1"), **kwargs):
+        return program(self.platform, products or self.products, "top", device,
+                       state=self.state, **kwargs)
+
+    def test_same_digest_skipped(self):
+        self.assertTrue(self.program())
+        self.assertFalse(self.program())
+        self.assertEqual(len(self.platform.programmed), 1)
+        self.assertEqual(self.state.get(Device(serial="1")),
+                         self.state.digest(self.platform, self.products))
+
+    def test_digest_ignores_logs(self):
+        self.assertTrue(self.program())
+        self.assertFalse(self.program(_MockProducts({"top.bit": b"bitstream", "top.log": b"x"})))
+
+    def test_changed_digest_programmed(self):
+        self.assertTrue(self.program())
+        changed = _MockProducts({"top.bit": b"other bitstream"})
+        self.assertTrue(self.program(changed))
+        self.assertTrue(self.program())
+        self.assertEqual(len(self.platform.programmed), 3)
+
+    def test_changed_kwargs_programmed(self):
+        self.assertTrue(self.program())
+        self.assertTrue(self.program(flash=True))
+        self.assertEqual(self.platform.programmed[-1][3], {"flash": True})
+        self.assertFalse(self.program(flash=True))
+
+    def test_other_device_programmed(self):
+        self.assertTrue(self.program(device=Device(serial="1")))
+        self.assertTrue(self.program(device=Device(serial="2")))
+        self.assertFalse(self.program(device=Device(serial="2")))
+        self.assertEqual([device for _, _, device, _ in self.platform.programmed],
+                         [Device(serial="1"), Device(serial="2")])
+
+    def test_state_shared_between_instances(self):
+        self.assertTrue(self.program())
+        self.state = ProgramState(self.path)
+        self.assertFalse(self.program())
+
+    def test_confirm(self):
+        calls = []
+        def confirm(platform, device):
+            calls.append((platform, device))
+            return answer
+
+        answer = True
+        self.assertTrue(self.program(confirm=confirm))
+        # The digest differed, so there was nothing to confirm.
+        self.assertEqual(calls, [])
+        self.assertFalse(self.program(confirm=confirm))
+        self.assertEqual(calls, [(self.platform, Device(serial="1"))])
+
+        with open(self.path) as f:
+            recorded = f.read()
+        answer = False
+        self.assertTrue(self.program(confirm=confirm))
+        self.assertEqual(len(self.platform.programmed), 2)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), recorded)
+
+    def test_unselected_device_never_current(self):
+        self.assertTrue(self.program(device=None))
+        self.assertTrue(self.program(device=None))
+        self.assertEqual(len(self.platform.programmed), 2)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(self.state.get(None))
+
+    def test_failure_not_recorded(self):
+        self.platform.error = RuntimeError("cable unplugged")
+        with self.assertRaisesRegex(RuntimeError, r"^cable unplugged$"):
+            self.program()
+        self.assertIsNone(self.state.get(Device(serial="1")))
+
+
+class ProgramAllTestCase(unittest.TestCase):
+    def test_every_board(self):
+        platforms = [_RecordingPlatform() for _ in range(3)]
+        platforms.append(_RecordingPlatform(error=RuntimeError("no device")))
+        targets = [(platform, _MockProducts({"top.bit": bytes([index])}),
+                    Device(serial=str(index)))
+                   for index, platform in enumerate(platforms)]
+        results = program_all(targets, jobs=2)
+        self.assertEqual([result.platform for result in results], platforms)
+        self.assertEqual([result.device for result in results],
+                         [device for _, _, device in targets])
+        self.assertEqual([result.ok for result in results], [True, True, True, False])
+        self.assertEqual(str(results[3].error), "no device")
+        for platform, products, device in targets[:3]:
+            self.assertEqual(platform.programmed, [(products, "top", device, {})])
+
+    def test_same_device(self):
+        platform = _RecordingPlatform()
+        products = _MockProducts({"top.bit": b"bitstream"})
+        results  = program_all([(platform, products, Device(serial="1"))] * 3)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(len(platform.programmed), 3)
+
+    def test_state(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state    = ProgramState(os.path.join(temp_dir, "program.json"))
+            platform = _RecordingPlatform()
+            targets  = [(platform, _MockProducts({"top.bit": b"bitstream"}),
+                         Device(serial="1")),
+                        (platform, _MockProducts({"top.bit": b"bitstream"}),
+                         Device(serial="2"))]
+            results = program_all(targets, state=state)
+            self.assertEqual([result.skipped for result in results], [False, False])
+            results = program_all(targets, state=state)
+            self.assertEqual([result.skipped for result in results], [True, True])
+            self.assertEqual(len(platform.programmed), 2)
+
+    def test_empty(self):
+        self.assertEqual(program_all([]), [])
+
+
+class ProgramAsyncTestCase(unittest.TestCase):
+    def test_program(self):
+        result = asyncio.run(program_async(_MockPlatform(), None, "top", Device(serial="1")))
+        self.assertTrue(result.ok, result.error)
+        command, = result.commands
+        self.assertEqual((command.returncode, command.output), (0, ["top"]))
+
+    def test_several_event_loops(self):
+        async def program_twice():
+            return await asyncio.gather(*[
+                program_async(_MockPlatform(), None, device=Device(serial="2"))
+                for _ in range(2)
+            ])
+
+        for _ in range(2):
+            for result in asyncio.run(program_twice()):
+                self.assertTrue(result.ok, result.error)
+
+    def test_shares_lock_with_program(self):
+        device = Device(serial="3")
+        lock = _device_lock(device)
+        with lock:
+            result = asyncio.run(program_async(_MockPlatform(), None, device=device,
+                                               timeout=0.1))
+            self.assertIsInstance(result.error, asyncio.TimeoutError)
+            self.assertEqual(result.commands, [])
+        # The lock is given back by the thread that was still waiting for it.
+        self.assertTrue(lock.acquire(timeout=5))
+        lock.release()
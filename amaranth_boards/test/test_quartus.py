@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from amaranth.vendor.intel import IntelPlatform
+
+from ..quartus import recompile_overrides, build_recompile
+from ..rz_easyfpga_a2_2 import RZEasyFPGAA2_2Platform
+
+
+class RecompileOverridesTestCase(unittest.TestCase):
+    def test_default(self):
+        self.assertEqual(recompile_overrides(jobs=3), {
+            "nproc": "3",
+            "add_settings": "set_global_assignment -name SMART_RECOMPILE ON",
+        })
+
+    def test_rapid(self):
+        self.assertEqual(recompile_overrides(jobs=3, rapid_recompile=True)["add_settings"]
+                         .splitlines(), [
+            "set_global_assignment -name SMART_RECOMPILE ON",
+            "set_global_assignment -name RAPID_RECOMPILE_MODE ON",
+        ])
+
+    def test_none(self):
+        self.assertEqual(recompile_overrides(jobs=3, smart_recompile=False), {"nproc": "3"})
+
+    def test_all_processors(self):
+        self.assertEqual(recompile_overrides()["nproc"], str(os.cpu_count()))
+
+    def test_caller_overrides(self):
+        overrides = recompile_overrides(jobs=3, nproc="2", add_settings="# caller",
+                                        do_build=False)
+        self.assertEqual(overrides, {
+            "nproc": "2",
+            "add_settings": "# caller\nset_global_assignment -name SMART_RECOMPILE ON",
+            "do_build": False,
+        })
+
+
+class BoardSettingsTestCase(unittest.TestCase):
+    def prepare(self, **kwargs):
+        with mock.patch.object(IntelPlatform, "toolchain_prepare") as toolchain_prepare:
+            RZEasyFPGAA2_2Platform().toolchain_prepare(None, "top", **kwargs)
+        return toolchain_prepare.call_args.kwargs
+
+    def test_board(self):
+        self.assertEqual(self.prepare()["add_settings"],
+            'set_global_assignment -name CYCLONEII_RESERVE_NCEO_AFTER_CONFIGURATION '
+            '"USE AS REGULAR IO"')
+
+    def test_recompile(self):
+        kwargs = recompile_overrides(jobs=3)
+        overrides = self.prepare(**kwargs)
+        self.assertEqual(overrides["nproc"], "3")
+        self.assertEqual(overrides["add_settings"].splitlines(), [
+            "set_global_assignment -name SMART_RECOMPILE ON",
+            'set_global_assignment -name CYCLONEII_RESERVE_NCEO_AFTER_CONFIGURATION '
+            '"USE AS REGULAR IO"',
+        ])
+        # The caller's overrides are left alone.
+        self.assertEqual(kwargs["add_settings"],
+                         "set_global_assignment -name SMART_RECOMPILE ON")
+
+
+class _MockPlatform:
+    # Records the overrides and the databases it found, then writes new ones, as Quartus would.
+    toolchain = "Quartus"
+
+    def __init__(self):
+        self.overrides = []
+        self.databases = []
+
+    def build(self, elaboratable, name, build_dir, **kwargs):
+        self.overrides.append(kwargs)
+        db = os.path.join(build_dir, "db", "{}.db".format(name))
+        if os.path.exists(db):
+            with open(db) as f:
+                self.databases.append(f.read())
+        else:
+            self.databases.append(None)
+        if kwargs.get("do_build", True):
+            os.makedirs(os.path.dirname(db), exist_ok=True)
+            with open(db, "w") as f:
+                f.write(elaboratable)
+        return "products of " + elaboratable
+
+
+class BuildRecompileTestCase(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.platform = _MockPlatform()
+
+    def test_overrides(self):
+        products = build_recompile(self.platform, "first", jobs=2, rapid_recompile=True,
+                                   build_dir=os.path.join(self.temp_dir, "build"),
+                                   add_settings="# caller")
+        self.assertEqual(products, "products of first")
+        self.assertEqual(self.platform.overrides, [{
+            "nproc": "2",
+            "add_settings": "# caller\n"
+                            "set_global_assignment -name SMART_RECOMPILE ON\n"
+                            "set_global_assignment -name RAPID_RECOMPILE_MODE ON",
+        }])
+
+    def test_build_dir(self):
+        build_dir = os.path.join(self.temp_dir, "build")
+        build_recompile(self.platform, "first", build_dir=build_dir)
+        build_recompile(self.platform, "second", build_dir=build_dir)
+        self.assertEqual(self.platform.databases, [None, "first"])
+
+    def test_db_dir(self):
+        db_dir = os.path.join(self.temp_dir, "databases")
+        build_recompile(self.platform, "first", db_dir=db_dir,
+                        build_dir=os.path.join(self.temp_dir, "a"))
+        self.assertTrue(os.path.exists(os.path.join(db_dir, "_MockPlatform", "top", "db")))
+        # A fresh build directory still starts from the kept databases.
+        build_recompile(self.platform, "second", db_dir=db_dir,
+                        build_dir=os.path.join(self.temp_dir, "b"))
+        self.assertEqual(self.platform.databases, [None, "first"])
+
+    def test_no_build(self):
+        db_dir = os.path.join(self.temp_dir, "databases")
+        build_recompile(self.platform, "first", db_dir=db_dir, do_build=False,
+                        build_dir=os.path.join(self.temp_dir, "a"))
+        self.assertFalse(os.path.exists(db_dir))
+
+    def test_wrong_toolchain(self):
+        self.platform.toolchain = "Vivado"
+        with self.assertRaisesRegex(ValueError,
+                r"^Recompilation requires the Quartus toolchain, not Vivado$"):
+            build_recompile(self.platform, "first")
@@ -0,0 +1,52 @@
+import pkgutil
+import importlib
+import unittest
+
+from amaranth.build.plat import Platform
+
+from .. import _registry, platforms, get_platform
+import amaranth_boards
+
+
+class RegistryTestCase(unittest.TestCase):
+    def test_registered_classes(self):
+        for info in platforms():
+            with self.subTest(name=info.name):
+                cls = get_platform(info.name)
+                self.assertEqual(cls.__name__, info.cls_name)
+                self.assertEqual(cls.__module__, "amaranth_boards.{}".format(info.module))
+                if info.device is not None:
+                    # Gowin platforms call the device their `part`.
+                    self.assertEqual(getattr(cls, "device", None) or getattr(cls, "part"),
+                                     info.device)
+                vendor_modules = [base.__module__.rpartition(".")[2].lstrip("_")
+                                  for base in cls.__mro__
+                                  if base.__module__.startswith("amaranth.vendor.")]
+                self.assertTrue(any(module.startswith(info.family)
+                                    for module in vendor_modules),
+                                "{} is not a {} platform".format(info.cls_name, info.family))
+
+    def test_every_board_registered(self):
+        registered = {(info.module, info.cls_name) for info in _registry}
+        for module_info in pkgutil.iter_modules(amaranth_boards.__path__):
+            if module_info.ispkg or module_info.name.startswith("_"):
+                continue
+            module = importlib.import_module("amaranth_boards.{}".format(module_info.name))
+            for name, value in vars(module).items():
+                if (isinstance(value, type) and issubclass(value, Platform) and
+                        value.__module__ == module.__name__ and not name.startswith("_")):
+                    with self.subTest(name=name):
+                        self.assertIn((module_info.name, name), registered)
+
+    def test_unique_names(self):
+        names = [info.name for info in _registry]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_get_platform_unknown(self):
+        with self.assertRaisesRegex(KeyError, r"Unknown platform 'nonexistent'"):
+            get_platform("nonexistent")
+
+    def test_module_attribute(self):
+        self.assertIs(amaranth_boards.ICEBreakerPlatform, get_platform("icebreaker"))
+        with self.assertRaises(AttributeError):
+            amaranth_boards.NonexistentPlatform
@@ -0,0 +1,283 @@
+import unittest
+
+from .. import get_platform
+from ..report import *
+
+
+class _Products:
+    def __init__(self, files):
+        self.files = files
+
+    def get(self, filename, mode="b"):
+        try:
+            contents = self.files[filename]
+        except KeyError:
+            raise FileNotFoundError(filename) from None
+        return contents if mode == "t" else contents.encode()
+
+
+_NEXTPNR_TIM = """\
+Info: Device utilisation:
+Info: 	         ICESTORM_LC:     800/   5280    15%
+Info: 	        ICESTORM_RAM:       0/     30     0%
+Info: 	               SB_IO:       2/     39     5%
+Info: 	        ICESTORM_DSP:       0/      8     0%
+Info: Max frequency for clock 'cd_sync_clk12_0__i': 51.13 MHz (PASS at 12.00 MHz)
+Info: Device utilisation:
+Info: 	         ICESTORM_LC:     793/   5280    15%
+Info: 	        ICESTORM_RAM:       2/     30     6%
+Info: 	               SB_IO:       2/     39     5%
+Info: 	        ICESTORM_DSP:       1/      8    12%
+Info: Critical path report for clock 'cd_sync_clk12_0__i' (posedge -> posedge):
+Info:       type curr  total name
+Info:   clk-to-q  1.39  1.39 Source sum35_0_LC.O
+Info:    routing  3.39  4.78 Net sum35_0[0] (14,6) -> (22,6)
+Info:                          Sink sum36_0_LC.I1
+Info:      logic  0.68  5.45 Source sum36_0_LC.COUT
+Info:    routing  0.00  5.45 Net sum36_0_I3[3] (22,6) -> (22,6)
+Info:                          Sink sum36_1_LC.I0
+Info: 3.50 ns logic, 3.39 ns routing
+Info: Max frequency for clock 'cd_sync_clk12_0__i': 46.16 MHz (PASS at 12.00 MHz)
+"""
+
+_VIVADO_TIMING = """\
+------------------------------------------------------------------------------------------------
+| Clock Summary
+| -------------
+------------------------------------------------------------------------------------------------
+
+Clock         Waveform(ns)       Period(ns)      Frequency(MHz)
+-----         ------------       ----------      --------------
+clk100_0__io  {0.000 5.000}      10.000          100.000
+  clk_pll     {0.000 2.500}      5.000           200.000
+
+
+------------------------------------------------------------------------------------------------
+| Intra Clock Table
+| -----------------
+------------------------------------------------------------------------------------------------
+
+Clock             WNS(ns)      TNS(ns)  TNS Failing Endpoints  TNS Total Endpoints
+-----             -------      -------  ---------------------  -------------------
+clk100_0__io        6.000        0.000                      0                   45
+  clk_pll          -0.250       -1.000                      4                   10
+
+
+Max Delay Paths
+--------------------------------------------------------------------------------------
+Slack (MET) :             6.000ns  (required time - arrival time)
+  Source:                 ctr_reg[0]/C
+                            (rising edge-triggered cell FDRE clocked by clk100_0__io)
+  Destination:            ctr_reg[25]/D
+                            (rising edge-triggered cell FDRE clocked by clk100_0__io)
+  Path Group:             clk100_0__io
+  Path Type:              Setup (Max at Slow Process Corner)
+  Requirement:            10.000ns  (clk100_0__io rise@10.000ns - clk100_0__io rise@0.000ns)
+  Data Path Delay:        3.800ns  (logic 2.100ns (55.263%)  route 1.700ns (44.737%))
+"""
+
+_VIVADO_UTILIZATION = """\
++-------------------------+------+-------+------------+-----------+-------+
+|        Site Type        | Used | Fixed | Prohibited | Available | Util% |
++-------------------------+------+-------+------------+-----------+-------+
+| Slice LUTs              |   25 |     0 |          0 |     20800 |  0.12 |
+|   LUT as Logic          |   25 |     0 |          0 |     20800 |  0.12 |
+| Slice Registers         |   29 |     0 |          0 |     41600 |  0.07 |
++-------------------------+------+-------+------------+-----------+-------+
+| Block RAM Tile          |  1.5 |     0 |          0 |        50 |  3.00 |
+| DSPs                    |    2 |     0 |          0 |        90 |  2.22 |
+"""
+
+_ISE_PAR = """\
+----------------------------------------------------------------------------------------------------------
+  Constraint                                |    Check    | Worst Case |  Best Case | Timing |   Timing
+                                            |             |    Slack   | Achievable | Errors |    Score
+----------------------------------------------------------------------------------------------------------
+  TSclk100_0__i = PERIOD TIMEGRP "PRDclk100 | SETUP       |     5.000ns|     5.000ns|       0|           0
+  _0__i" 10 ns HIGH 50%                     | HOLD        |     0.456ns|            |       0|           0
+----------------------------------------------------------------------------------------------------------
+"""
+
+_ISE_MAP = """\
+  Number of Slice Registers:                    27 out of  18,224    1%
+    Number used as Flip Flops:                  27
+  Number of Slice LUTs:                         31 out of   9,112    1%
+  Number of RAMB16BWERs:                         0 out of      32    0%
+  Number of DSP48A1s:                            1 out of      32    3%
+"""
+
+_QUARTUS_STA_SUMMARY = """\
+Type  : Slow 1200mV 85C Model Setup 'clk50_0__io'
+Slack : 15.100
+TNS   : 0.000
+
+Type  : Slow 1200mV 85C Model Hold 'clk50_0__io'
+Slack : 0.345
+TNS   : 0.000
+"""
+
+_QUARTUS_STA = """\
++-------------------------------------------------+
+; Slow 1200mV 85C Model Fmax Summary              ;
++------------+-----------------+-------------+------+
+; Fmax       ; Restricted Fmax ; Clock Name  ; Note ;
++------------+-----------------+-------------+------+
+; 204.58 MHz ; 200.00 MHz      ; clk50_0__io ;      ;
++------------+-----------------+-------------+------+
+
++----------------------------------------------------------------------------------------+
+; Slow 1200mV 85C Model Setup: 'clk50_0__io'                                             ;
++--------+-----------+---------+--------------+-------------+--------------+------------+------------+
+; Slack  ; From Node ; To Node ; Launch Clock ; Latch Clock ; Relationship ; Clock Skew ; Data Delay ;
++--------+-----------+---------+--------------+-------------+--------------+------------+------------+
+; 15.100 ; ctr[0]    ; ctr[25] ; clk50_0__io  ; clk50_0__io ; 20.000       ; -0.061     ; 4.817      ;
+"""
+
+_QUARTUS_FIT_SUMMARY = """\
+Total logic elements : 57 / 6,272 ( < 1 % )
+Total registers : 27
+Total memory bits : 0 / 276,480 ( 0 % )
+Embedded Multiplier 9-bit elements : 0 / 30 ( 0 % )
+"""
+
+_DIAMOND_TWR = """\
+================================================================================
+Preference: FREQUENCY PORT "clk12_0__io" 12.000000 MHz ;
+            4096 items scored, 0 timing errors detected.
+--------------------------------------------------------------------------------
+
+Passed: The following path meets requirements by 78.000ns
+
+   Source:         FF         Q              ctr_0  (from clk12_0__io_c +)
+   Destination:    FF         Data in        ctr_25  (to clk12_0__io_c +)
+
+   Delay:               5.327ns  (38.0% logic, 62.0% route), 12 logic levels.
+
+Report:  182.149MHz is the maximum frequency for this preference.
+"""
+
+_DIAMOND_MRP = """\
+   Number of registers:     27 out of  4635 (1%)
+   Number of LUT4s:         31 out of  4320 (1%)
+   Number of block RAMs:  1 out of 10 (10%)
+"""
+
+
+class ReportTestCase(unittest.TestCase):
+    def read(self, platform_name, files):
+        return read_report(get_platform(platform_name)(), _Products(files))
+
+    def test_nextpnr(self):
+        report = self.read("icebreaker", {"top.tim": _NEXTPNR_TIM})
+        self.assertEqual(report.toolchain, "IceStorm")
+        clock, = report.clocks
+        self.assertEqual(clock.name, "cd_sync_clk12_0__i")
+        self.assertAlmostEqual(clock.fmax, 46.16e6)
+        self.assertEqual(clock.constraint, 12e6)
+        self.assertAlmostEqual(clock.slack, 1e3 / 12 - 1e3 / 46.16)
+        self.assertEqual(clock.resource, ("clk12", 0))
+        # The last utilisation report, after placement, is used.
+        self.assertEqual(report.utilisation, {
+            "lut":  Utilisation(793, 5280),
+            "bram": Utilisation(2, 30),
+            "dsp":  Utilisation(1, 8),
+        })
+        path, = report.critical_paths
+        self.assertEqual((path.source, path.destination), ("sum35_0_LC.O", "sum36_1_LC.I0"))
+        self.assertAlmostEqual(path.delay, 6.89)
+        self.assertTrue(report.met)
+
+    def test_vivado(self):
+        report = self.read("arty_a7_35", {
+            "top_timing.rpt": _VIVADO_TIMING,
+            "top_utilization_place.rpt": _VIVADO_UTILIZATION,
+        })
+        main, derived = report.clocks
+        self.assertEqual(main.name, "clk100_0__io")
+        self.assertEqual(main.resource, ("clk100", 0))
+        self.assertAlmostEqual(main.fmax, 1e9 / 4)
+        self.assertEqual(main.slack, 6.0)
+        self.assertEqual(derived.name, "clk_pll")
+        self.assertIsNone(derived.resource)
+        self.assertAlmostEqual(derived.constraint, 200e6)
+        self.assertFalse(derived.met)
+        self.assertEqual(report.utilisation, {
+            "lut":  Utilisation(25, 20800),
+            "ff":   Utilisation(29, 41600),
+            "bram": Utilisation(1.5, 50),
+            "dsp":  Utilisation(2, 90),
+        })
+        self.assertEqual(report.critical_paths, [
+            CriticalPath("clk100_0__io", "ctr_reg[0]/C", "ctr_reg[25]/D", 3.8, 6.0),
+        ])
+        self.assertEqual(report.worst_slack, -0.25)
+        self.assertFalse(report.met)
+
+    def test_ise(self):
+        report = self.read("numato_mimas", {"top_par.par": _ISE_PAR, "top_map.mrp": _ISE_MAP})
+        clock, = report.clocks
+        self.assertEqual(clock.name, "clk100_0__i")
+        self.assertEqual(clock.resource, ("clk100", 0))
+        self.assertAlmostEqual(clock.fmax, 200e6)
+        self.assertEqual(clock.slack, 5.0)
+        self.assertEqual(report.utilisation, {
+            "lut":  Utilisation(31, 9112),
+            "ff":   Utilisation(27, 18224),
+            "bram": Utilisation(0, 32),
+            "dsp":  Utilisation(1, 32),
+        })
+
+    def test_quartus(self):
+        report = self.read("de0_nano", {
+            "top.sta.summary": _QUARTUS_STA_SUMMARY,
+            "top.sta.rpt": _QUARTUS_STA,
+            "top.fit.summary": _QUARTUS_FIT_SUMMARY,
+        })
+        clock, = report.clocks
+        self.assertEqual(clock.name, "clk50_0__io")
+        self.assertEqual(clock.resource, ("clk50", 0))
+        self.assertAlmostEqual(clock.fmax, 200e6)
+        self.assertEqual(clock.slack, 15.1)
+        self.assertEqual(report.utilisation["lut"], Utilisation(57, 6272))
+        self.assertEqual(report.utilisation["ff"], Utilisation(27, None))
+        self.assertEqual(report.critical_paths, [
+            CriticalPath("clk50_0__io", "ctr[0]", "ctr[25]", 4.817, 15.1),
+        ])
+
+    def test_diamond(self):
+        report = self.read("machxo3_sk", {
+            "top_impl/top_impl.twr": _DIAMOND_TWR,
+            "top_impl/top_impl.mrp": _DIAMOND_MRP,
+        })
+        clock, = report.clocks
+        self.assertEqual(clock.name, "clk12_0__io")
+        self.assertEqual(clock.resource, ("clk12", 0))
+        self.assertAlmostEqual(clock.fmax, 182.149e6)
+        self.assertEqual(clock.slack, 78.0)
+        self.assertEqual(report.utilisation, {
+            "lut":  Utilisation(31, 4320),
+            "ff":   Utilisation(27, 4635),
+            "bram": Utilisation(1, 10),
+        })
+        self.assertEqual(report.critical_paths, [
+            CriticalPath("clk12_0__io", "ctr_0", "ctr_25", 5.327, 78.0),
+        ])
+
+    def test_missing(self):
+        report = self.read("arty_a7_35", {})
+        self.assertEqual(report.clocks, [])
+        self.assertEqual(report.utilisation, {})
+        self.assertIsNone(report.met)
+
+    def test_unsupported(self):
+        with self.assertRaisesRegex(ValueError,
+                r"^Reports of the QLSymbiflow toolchain cannot be parsed$"):
+            self.read("quickfeather", {})
+
+    def test_as_dict(self):
+        report = self.read("icebreaker", {"top.tim": _NEXTPNR_TIM})
+        result = report.as_dict()
+        self.assertEqual(result["toolchain"], "IceStorm")
+        self.assertEqual(result["clocks"][0]["resource"], ("clk12", 0))
+        self.assertTrue(result["clocks"][0]["met"])
+        self.assertEqual(result["utilisation"]["lut"], {"used": 793, "available": 5280})
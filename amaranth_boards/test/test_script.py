@@ -0,0 +1,88 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from .. import get_platform
+from .._script import split_script, command_tool, command_script
+from .blinky import Blinky
+
+
+def _script_platform(cls):
+    # Only the build script is rendered, so that no toolchain (not even Yosys, which some
+    # toolchains use to emit Verilog) is needed.
+    class ScriptPlatform(cls):
+        @property
+        def file_templates(self):
+            return {filename: template for filename, template in super().file_templates.items()
+                    if filename == "build_{{name}}.sh"}
+    return ScriptPlatform
+
+
+class SplitScriptTestCase(unittest.TestCase):
+    # One board per toolchain family, and the environment variables its header requires.
+    families = [
+        ("icebreaker",   "IceStorm",     {}, {}),
+        ("icebreaker",   "LSE-iCECube2", {"toolchain": "LSE-iCECube2"},
+         {"AMARANTH_ENV_LSE_iCECube2": "/opt/icecube2", "AMARANTH_ENV_ICECUBE2": "/opt/icecube2"}),
+        ("ulx3s_12f",    "Trellis",      {}, {}),
+        ("versa_ecp5",   "Diamond",      {"toolchain": "Diamond"}, {}),
+        ("machxo3_sk",   "Diamond",      {}, {}),
+        ("arty_a7_35",   "Vivado",       {}, {}),
+        ("arty_a7_35",   "Symbiflow",    {"toolchain": "Symbiflow"}, {}),
+        ("numato_mimas", "ISE",          {}, {}),
+        ("de0_nano",     "Quartus",      {}, {}),
+        ("de10_nano",    "Mistral",      {"toolchain": "Mistral"}, {}),
+        ("tang_nano",    "Apicula",      {}, {}),
+        ("tang_nano",    "Gowin",        {"toolchain": "Gowin"}, {}),
+        ("quickfeather", "QLSymbiflow",  {}, {}),
+    ]
+
+    def setUp(self):
+        self.build_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.build_dir)
+
+    def test_families(self):
+        for board, toolchain, kwargs, toolchain_env in self.families:
+            with self.subTest(board=board, toolchain=toolchain):
+                platform = _script_platform(get_platform(board))(**kwargs)
+                self.assertEqual(platform.toolchain, toolchain)
+                script = platform.prepare(Blinky(), "top").files["build_top.sh"]
+                header, commands = split_script(platform, script)
+
+                self.assertEqual(len(commands), len(platform.command_templates))
+                self.assertEqual("{}\n{}".format(header, "\n".join(commands)), script)
+                for command in commands:
+                    if command.startswith('"$'):
+                        self.assertIn(command_tool(platform, command), platform.required_tools)
+
+                # The header must run as is: it can re-execute itself with bash, source the
+                # toolchain environment, and set the default for each tool.
+                env = dict(os.environ)
+                for name in list(env):
+                    if name.startswith(("AMARANTH_ENV_", "NMIGEN_ENV_")):
+                        del env[name]
+                env.update(toolchain_env)
+                with command_script(header, 'echo "$BASH" "$0"') as args:
+                    output = subprocess.run(args, cwd=self.build_dir, env=env,
+                                            stdout=subprocess.PIPE, check=True).stdout
+                self.assertTrue(output.strip())
+
+    def test_tool_defaults(self):
+        platform = _script_platform(get_platform("numato_mimas"))()
+        script = platform.prepare(Blinky(), "top").files["build_top.sh"]
+        header, commands = split_script(platform, script)
+        env = {name: value for name, value in os.environ.items() if name != "XST"}
+        with command_script(header, 'echo "$XST"') as args:
+            output = subprocess.run(args, cwd=self.build_dir, env=env,
+                                    stdout=subprocess.PIPE, check=True).stdout
+        self.assertEqual(output, b"xst\n")
+
+    def test_command_tool(self):
+        platform = get_platform("de0_nano")()
+        self.assertEqual(command_tool(platform, '"$QUARTUS_MAP" --rev=top top'), "quartus_map")
+        self.assertEqual(command_tool(platform, '"$OTHER" --version'), "other")
+        self.assertEqual(command_tool(platform, "cp top_flash.svf top.svf"), "cp")
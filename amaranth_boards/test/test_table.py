@@ -0,0 +1,99 @@
+import abc
+import unittest
+
+from .._table import LazyTable
+from ..arrow_sockit import ArrowSoCKitPlatform
+
+
+class _Base(metaclass=abc.ABCMeta):
+    builds = []
+
+    def _build(cls):
+        _Base.builds.append(cls.__name__)
+        return ["a", "b"]
+
+    table = LazyTable(_build)
+
+
+class _Inherited(_Base):
+    pass
+
+
+class _Extended(_Base):
+    table = LazyTable(lambda cls: [*_Base.table, cls.extra])
+    extra = "c"
+
+
+class _Patched(_Base):
+    def __init__(self, extra=None):
+        if extra is not None:
+            self.table.append(extra)
+
+
+class LazyTableTestCase(unittest.TestCase):
+    def setUp(self):
+        # Every test starts with tables that were not built yet.
+        for cls in (_Base, _Extended):
+            vars(cls)["table"]._table = None
+        _Base.builds.clear()
+
+    def test_not_built_on_definition(self):
+        self.assertEqual(_Base.builds, [])
+        self.assertEqual(repr(_Base.table), "<LazyTable _Base.table (not built)>")
+
+    def test_built_once(self):
+        self.assertEqual(list(_Base.table), ["a", "b"])
+        self.assertEqual(len(_Base.table), 2)
+        self.assertEqual(_Base.table[1], "b")
+        self.assertEqual(list(_Base().table), ["a", "b"])
+        self.assertEqual(list(_Base().table), ["a", "b"])
+        self.assertEqual(_Base.builds, ["_Base"])
+        self.assertEqual(repr(_Base.table), "['a', 'b']")
+
+    def test_add(self):
+        self.assertEqual(_Base.table + ["c"], ["a", "b", "c"])
+        self.assertEqual(["z"] + _Base.table, ["z", "a", "b"])
+
+    def test_instance_owns_list(self):
+        first, second = _Patched("x"), _Patched("y")
+        self.assertEqual(first.table, ["a", "b", "x"])
+        self.assertEqual(second.table, ["a", "b", "y"])
+        self.assertEqual(_Patched().table, ["a", "b"])
+        self.assertEqual(list(_Base.table), ["a", "b"])
+        self.assertEqual(_Base.builds, ["_Base"])
+
+    def test_instance_assignment(self):
+        instance = _Base()
+        instance.table = ["z"]
+        self.assertEqual(instance.table, ["z"])
+        self.assertEqual(_Base().table, ["a", "b"])
+
+    def test_inherited(self):
+        # A subclass that does not override the table shares the one built for its base.
+        self.assertEqual(list(_Inherited.table), ["a", "b"])
+        self.assertEqual(list(_Base.table), ["a", "b"])
+        self.assertEqual(_Base.builds, ["_Base"])
+
+    def test_subclass_override(self):
+        self.assertEqual(list(_Extended.table), ["a", "b", "c"])
+        self.assertEqual(_Extended().table, ["a", "b", "c"])
+        self.assertEqual(list(_Base.table), ["a", "b"])
+        self.assertEqual(_Base.builds, ["_Base"])
+
+    def test_abstract_check(self):
+        # `ABCMeta` looks up every attribute of a new class; that must not build the table.
+        class _Abstract(_Base):
+            @abc.abstractmethod
+            def method(self):
+                pass
+        self.assertEqual(_Base.builds, [])
+
+
+class BoardTableTestCase(unittest.TestCase):
+    def test_arrow_sockit_connectors(self):
+        with_daughterboard = ArrowSoCKitPlatform(with_gpio_daughterboard=True)
+        without = ArrowSoCKitPlatform()
+        self.assertEqual(len(with_daughterboard.connectors), 6)
+        self.assertEqual(len(without.connectors), 0)
+        self.assertEqual(list(ArrowSoCKitPlatform.connectors), [])
+        with_daughterboard.request("gpio_serial", 0)
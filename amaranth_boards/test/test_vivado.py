@@ -0,0 +1,182 @@
+import os
+import tempfile
+import unittest
+
+from ..vivado import incremental_overrides, parse_incremental_reuse, build_incremental
+
+
+_REUSE_REPORT = """\
+Copyright 1986-2020 Xilinx, Inc. All Rights Reserved.
+---------------------------------------------------------------------------------------------
+| Tool Version : Vivado v.2020.2 (lin64) Build 3064766 Wed Nov 18 09:12:47 MST 2020
+| Date         : Sun Oct 18 03:50:12 2026
+| Command      : report_incremental_reuse -file top_incremental_reuse.rpt
+| Design       : top
+| Device       : xc7a35t
+| Design State : Routed
+---------------------------------------------------------------------------------------------
+
+Incremental Implementation Information
+
+Table of Contents
+-----------------
+1. Incremental Flow Summary
+2. Reuse Summary
+3. Reference Checkpoint Information
+
+1. Incremental Flow Summary
+---------------------------
+
++-------------------------+-----------------+
+|     Flow Information    |      Value      |
++-------------------------+-----------------+
+| Incremental Flow        | Default         |
+| Auto Incremental        | No              |
++-------------------------+-----------------+
+
+
+2. Reuse Summary
+----------------
+
++-------+----------------------+--------------------+--------------------+--------+
+|  Type | Matched % (of Total) | Reuse % (of Total) | Fixed % (of Total) |  Total |
++-------+----------------------+--------------------+--------------------+--------+
+| Cells |                99.52 |              98.80 |               0.00 |   1245 |
+| Nets  |                99.10 |              98.11 |               0.00 |   2114 |
+| Pins  |                    - |              97.92 |                  - |   8327 |
+| Ports |               100.00 |             100.00 |             100.00 |     42 |
++-------+----------------------+--------------------+--------------------+--------+
+
+
+3. Reference Checkpoint Information
+-----------------------------------
+
++----------------+----------------------+
+| DCP Location:  | top_reference.dcp    |
++----------------+----------------------+
+"""
+
+# What `report_incremental_reuse` writes when the design was not read with a reference
+# checkpoint.
+_NO_REFERENCE_REPORT = """\
+Copyright 1986-2020 Xilinx, Inc. All Rights Reserved.
+---------------------------------------------------------------------------------------------
+| Command      : report_incremental_reuse -file top_incremental_reuse.rpt
+| Design       : top
+| Design State : Routed
+---------------------------------------------------------------------------------------------
+
+Incremental Implementation Information
+
+1. Incremental Flow Summary
+---------------------------
+
++-------------------------+-----------------+
+|     Flow Information    |      Value      |
++-------------------------+-----------------+
+| Incremental Flow        | Not Applicable  |
++-------------------------+-----------------+
+
+WARNING: No reference checkpoint was read; the design is not incremental.
+"""
+
+
+class ParseIncrementalReuseTestCase(unittest.TestCase):
+    def test_summary(self):
+        self.assertEqual(parse_incremental_reuse(_REUSE_REPORT), {
+            "Cells": {"Matched % (of Total)": 99.52, "Reuse % (of Total)": 98.8,
+                      "Fixed % (of Total)": 0.0, "Total": 1245},
+            "Nets":  {"Matched % (of Total)": 99.1, "Reuse % (of Total)": 98.11,
+                      "Fixed % (of Total)": 0.0, "Total": 2114},
+            "Pins":  {"Matched % (of Total)": None, "Reuse % (of Total)": 97.92,
+                      "Fixed % (of Total)": None, "Total": 8327},
+            "Ports": {"Matched % (of Total)": 100.0, "Reuse % (of Total)": 100.0,
+                      "Fixed % (of Total)": 100.0, "Total": 42},
+        })
+
+    def test_no_reference(self):
+        self.assertEqual(parse_incremental_reuse(_NO_REFERENCE_REPORT), {})
+
+    def test_empty(self):
+        self.assertEqual(parse_incremental_reuse(""), {})
+
+
+class IncrementalOverridesTestCase(unittest.TestCase):
+    def test_overrides(self):
+        self.assertEqual(incremental_overrides("top", script_after_synth="a", do_build=False), {
+            "script_after_synth":
+                "a\n"
+                "if {[file exists top_reference.dcp]} "
+                "{ read_checkpoint -incremental top_reference.dcp }",
+            "script_after_route":
+                "if {[file exists top_reference.dcp]} "
+                "{ report_incremental_reuse -file top_incremental_reuse.rpt }",
+            "do_build": False,
+        })
+
+
+class _MockPlatform:
+    # Writes the routed checkpoint and, when given a reference checkpoint, the reuse report,
+    # as the build script with the incremental overrides would.
+    toolchain = "Vivado"
+
+    def __init__(self):
+        self.references = []
+
+    def build(self, elaboratable, name, build_dir, **kwargs):
+        reference = os.path.join(build_dir, "{}_reference.dcp".format(name))
+        if os.path.exists(reference):
+            with open(reference) as f:
+                self.references.append(f.read())
+            with open(os.path.join(build_dir, "{}_incremental_reuse.rpt".format(name)), "w") as f:
+                f.write(_REUSE_REPORT)
+        else:
+            self.references.append(None)
+        with open(os.path.join(build_dir, "{}_route.dcp".format(name)), "w") as f:
+            f.write(elaboratable)
+        return "products of " + elaboratable
+
+
+class BuildIncrementalTestCase(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.platform = _MockPlatform()
+
+    def test_build_dir(self):
+        build_dir = os.path.join(self.temp_dir, "build")
+        products, reuse = build_incremental(self.platform, "first", build_dir=build_dir)
+        self.assertEqual(products, "products of first")
+        self.assertIsNone(reuse)
+        products, reuse = build_incremental(self.platform, "second", build_dir=build_dir)
+        self.assertEqual(products, "products of second")
+        self.assertEqual(reuse["Cells"]["Reuse % (of Total)"], 98.8)
+        self.assertEqual(self.platform.references, [None, "first"])
+
+    def test_checkpoint_dir(self):
+        checkpoint_dir = os.path.join(self.temp_dir, "checkpoints")
+        _, reuse = build_incremental(self.platform, "first", checkpoint_dir=checkpoint_dir,
+                                     build_dir=os.path.join(self.temp_dir, "a"))
+        self.assertIsNone(reuse)
+        self.assertTrue(os.path.exists(os.path.join(checkpoint_dir, "_MockPlatform", "top.dcp")))
+        # A fresh build directory still starts from the kept checkpoint.
+        _, reuse = build_incremental(self.platform, "second", checkpoint_dir=checkpoint_dir,
+                                     build_dir=os.path.join(self.temp_dir, "b"))
+        self.assertIsNotNone(reuse)
+        self.assertEqual(self.platform.references, [None, "first"])
+
+    def test_stale_report(self):
+        # A report left over from an earlier build must not be taken for the reuse of this one.
+        build_dir = os.path.join(self.temp_dir, "build")
+        build_incremental(self.platform, "first", build_dir=build_dir)
+        build_incremental(self.platform, "second", build_dir=build_dir)
+        os.remove(os.path.join(build_dir, "top_route.dcp"))
+        _, reuse = build_incremental(self.platform, "third", build_dir=build_dir)
+        self.assertIsNone(reuse)
+
+    def test_wrong_toolchain(self):
+        self.platform.toolchain = "Trellis"
+        with self.assertRaisesRegex(ValueError,
+                r"^Incremental builds require the Vivado toolchain, not Trellis$"):
+            build_incremental(self.platform, "first")
@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import textwrap
+import threading
+import unittest
+
+from ..vivado_server import VivadoServer, submit
+
+
+# Stands in for `vivado -mode tcl`: it understands just enough of what the server sends to
+# source a script made of the commands below, and to answer the server's status markers.
+_STUB_VIVADO = """\
+import os, re, sys
+
+status, result, argv = 0, "", ""
+for line in sys.stdin:
+    if line.startswith("cd "):
+        os.chdir(line[len("cd {"):-len("}\\n")])
+    elif line.startswith("set argv "):
+        argv = line[len("set argv [list "):-len("]\\n")]
+    elif line.startswith("set _amaranth_status "):
+        status, result = 0, ""
+        with open(re.search(r"source \\{(.*?)\\}", line).group(1)) as f:
+            for command in f.read().splitlines():
+                name, _, arg = command.partition(" ")
+                if name == "puts":
+                    print(arg)
+                elif name == "argv":
+                    print(argv)
+                elif name == "pwd":
+                    print(os.getcwd())
+                elif name == "pid":
+                    print(os.getpid())
+                elif name == "error":
+                    status, result = 1, arg
+                    break
+                elif name == "crash_once" and not os.path.exists(arg):
+                    open(arg, "w").close()
+                    sys.exit(1)
+                elif name == "crash":
+                    sys.exit(1)
+    else:
+        match = re.match(r'puts "(amaranth-vivado-server-\\w+) (\\S+)', line)
+        if match and match.group(2) == "0":
+            print(match.group(1), 0)
+        elif match:
+            print(match.group(1), status, result)
+    sys.stdout.flush()
+"""
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class VivadoServerTestCase(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+
+        self.vivado = os.path.join(self.temp_dir, "vivado")
+        with open(self.vivado, "w") as f:
+            f.write("#!{}\n{}".format(sys.executable, _STUB_VIVADO))
+        os.chmod(self.vivado, 0o755)
+
+        self.path   = os.path.join(self.temp_dir, "server.sock")
+        self.server = VivadoServer(self.path, vivado=self.vivado)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        while self.server._socket is None or not os.path.exists(self.path):
+            time.sleep(0.01)
+
+        def stop():
+            self.server.shutdown()
+            thread.join()
+        self.addCleanup(stop)
+
+    def script(self, text):
+        fd, path = tempfile.mkstemp(suffix=".tcl", dir=self.temp_dir)
+        with os.fdopen(fd, "w") as f:
+            f.write(textwrap.dedent(text))
+        return path
+
+    def submit(self, text, **kwargs):
+        lines = []
+        error = submit(self.path, self.script(text), output=lines.append, **kwargs)
+        return error, lines
+
+    def test_output(self):
+        error, lines = self.submit("""\
+            puts hello
+            puts world
+        """)
+        self.assertIsNone(error)
+        self.assertEqual(lines, ["hello\n", "world\n"])
+
+    def test_cwd_argv(self):
+        cwd = os.path.join(self.temp_dir, "build")
+        os.mkdir(cwd)
+        error, lines = self.submit("""\
+            pwd
+            argv
+        """, cwd=cwd, argv=["-a", "b c"])
+        self.assertIsNone(error)
+        self.assertEqual(lines, [os.path.realpath(cwd) + "\n", "{-a} {b c}\n"])
+
+    def test_error(self):
+        error, lines = self.submit("""\
+            puts before
+            error synthesis failed
+            puts after
+        """)
+        self.assertEqual(error, "synthesis failed")
+        self.assertEqual(lines, ["before\n"])
+
+    def test_session_reused(self):
+        _, first  = self.submit("pid\n")
+        _, second = self.submit("pid\n")
+        self.assertEqual(first, second)
+
+    def test_crash_retried(self):
+        flag = os.path.join(self.temp_dir, "crashed")
+        error, lines = self.submit("""\
+            crash_once {}
+            puts recovered
+        """.format(flag))
+        self.assertIsNone(error)
+        self.assertEqual(lines, ["Vivado exited unexpectedly; restarting it\n", "recovered\n"])
+
+    def test_crash_repeated(self):
+        error, lines = self.submit("crash\n")
+        self.assertEqual(error, "Vivado exited unexpectedly")
+        self.assertEqual(lines, ["Vivado exited unexpectedly; restarting it\n"])
+        # The next script gets a fresh Vivado process.
+        error, lines = self.submit("puts hello\n")
+        self.assertIsNone(error)
+        self.assertEqual(lines, ["hello\n"])
+
+    def test_unquotable(self):
+        error, lines = self.submit("puts hello\n", argv=["{"])
+        self.assertEqual(error, "Cannot pass '{' to Tcl")
+
+    def test_bad_request(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.path)
+            with client.makefile("rw", encoding="utf-8") as stream:
+                stream.write(json.dumps({"script": "build.tcl"}) + "\n")
+                stream.flush()
+                self.assertEqual(json.loads(stream.readline()),
+                                 {"status": 1, "error": "Bad request: 'cwd'"})
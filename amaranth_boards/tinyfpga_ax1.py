@@ -1,6 +1,7 @@
 from amaranth.build import *
 from amaranth.vendor.lattice_machxo_2_3l import *
 from .resources import *
+from ._table import LazyTable
 
 
 __all__ = ["TinyFPGAAX1Platform"]
@@ -10,7 +11,7 @@ class TinyFPGAAX1Platform(LatticeMachXO2Platform):
     device      = "LCMXO2-256HC"
     package     = "SG32"
     speed       = "4"
-    connectors  = [
+    connectors  = LazyTable(lambda cls: [
         Connector("gpio", 0,
             # Left side of the board
             #  1  2  3  4  5  6  7  8  9 10 11
@@ -19,6 +20,6 @@ class TinyFPGAAX1Platform(LatticeMachXO2Platform):
             # 12 13 14 15 16 17 18 19 20 21 22
              "-  -  -  -  4  5  8  9  10 11 12 "
         ),
-    ]
+    ])
     resources = []
     # This board doesn't have an integrated programmer.
@@ -1,9 +1,11 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["TinyFPGABXPlatform"]
@@ -13,7 +15,7 @@ class TinyFPGABXPlatform(LatticeICE40Platform):
     device      = "iCE40LP8K"
     package     = "CM81"
     default_clk = "clk16"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk16", 0, Pins("B2", dir="i"),
                  Clock(16e6), Attrs(IO_STANDARD="SB_LVCMOS")),
 
@@ -27,8 +29,8 @@ class TinyFPGABXPlatform(LatticeICE40Platform):
             cs_n="F7", clk="G7", copi="G6", cipo="H7", wp_n="H4", hold_n="J8",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         Connector("gpio", 0,
             # Left side of the board
             #     1  2  3  4  5  6  7  8  9 10 11 12 13
@@ -40,12 +42,12 @@ class TinyFPGABXPlatform(LatticeICE40Platform):
             # 25 26 27 28 29 30 31
              "G1 J3 J4 G9 J9 E8 J2"
         ),
-    ]
+    ])
 
     def toolchain_program(self, products, name):
         tinyprog = os.environ.get("TINYPROG", "tinyprog")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([tinyprog, "-p", bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([tinyprog, "-p", bitstream_filename])
 
 
 if __name__ == "__main__":
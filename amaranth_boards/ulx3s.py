@@ -1,11 +1,15 @@
 import os
 import argparse
-import subprocess
 import shutil
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from .config import ConfigInterface, fast_config_overrides
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = [
@@ -18,8 +22,12 @@ class _ULX3SPlatform(LatticeECP5Platform):
     package                = "BG381"
     speed                  = "6"
     default_clk            = "clk25"
+    # The flash can do quad SPI, but quad mode depends on the QE bit being set in the flash,
+    # which is not guaranteed; these are conservative values known to boot every board.
+    config_interface = ConfigInterface(flash=None, size=None, max_clock=38.8, bus_width=1,
+                                       compression=True)
 
-    resources = [
+    resources = LazyTable(lambda cls: [
         Resource("clk25", 0, Pins("G2", dir="i"), Clock(25e6), Attrs(IO_TYPE="LVCMOS33")),
 
         # Used to reload FPGA configuration.
@@ -123,9 +131,9 @@ class _ULX3SPlatform(LatticeECP5Platform):
             d_p="D15", d_n="E15", pullup="B12",
             attrs=Attrs(IO_TYPE="LVCMOS33")
         )
-    ]
+    ])
 
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("gpio", 0, {
             "0+": "B11",  "0-":  "C11", "1+":  "A10", "1-":  "A11",
             "2+": "A9",   "2-":  "B10", "3+":  "B9",  "3-":  "C10",
@@ -142,7 +150,7 @@ class _ULX3SPlatform(LatticeECP5Platform):
             "24+": "C16", "24-": "D16", "25+": "D14", "25-": "E14",
             "26+": "B13", "26-": "C13", "27+": "D13", "27-": "E13",
         })
-    ]
+    ])
 
     @property
     def required_tools(self):
@@ -150,15 +158,18 @@ class _ULX3SPlatform(LatticeECP5Platform):
             "openFPGALoader"
         ]
 
-    def toolchain_prepare(self, fragment, name, **kwargs):
+    def toolchain_prepare(self, fragment, name, *, fast_config=False, **kwargs):
         overrides = dict(ecppack_opts="--compress")
+        if fast_config:
+            overrides = fast_config_overrides(self, **overrides)
         overrides.update(kwargs)
         return super().toolchain_prepare(fragment, name, **overrides)
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         tool = os.environ.get("OPENFPGALOADER", "openFPGALoader")
-        with products.extract("{}.bit".format(name)) as bitstream_filename:
-            subprocess.check_call([tool, "-b", "ulx3s", '-m', bitstream_filename])
+        with extract(products, "{}.bit".format(name)) as bitstream_filename:
+            run_command([tool, *device_args("openFPGALoader", device),
+                         "-b", "ulx3s", '-m', bitstream_filename])
 
 
 class ULX3S_12F_Platform(_ULX3SPlatform):
@@ -1,6 +1,7 @@
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
 
 
 __all__ = ["UpduinoV1Platform"]
@@ -11,7 +12,7 @@ class UpduinoV1Platform(LatticeICE40Platform):
     package     = "SG48"
     default_clk = "SB_HFOSC"
     hfosc_div   = 0
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         *LEDResources(pins="39 40 41", invert=True,
                       attrs=Attrs(IO_STANDARD="SB_LVCMOS")),
         Resource("led_g", 0, PinsN("39", dir="o"),
@@ -25,12 +26,12 @@ class UpduinoV1Platform(LatticeICE40Platform):
             cs_n="16", clk="15", cipo="17", copi="14",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         # "Left" row of header pins (JP5 on the schematic)
         Connector("j", 0, "- - 23 25 26 27 32 35 31 37 34 43 36 42 38 28"),
         # "Right" row of header pins (JP6 on the schematic)
         Connector("j", 1, "12 21 13 19 18 11 9 6 44 4 3 48 45 47 46 2")
-    ]
+    ])
 
     # This board doesn't have an integrated programmer.
@@ -1,10 +1,13 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from .resources import *
+from ._table import LazyTable
 from .upduino_v1 import UpduinoV1Platform
+from .program import device_args
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["UpduinoV2Platform"]
@@ -13,16 +16,17 @@ __all__ = ["UpduinoV2Platform"]
 class UpduinoV2Platform(UpduinoV1Platform):
     # Mostly identical to the V1 board, but it has an integrated
     # programmer and a 12MHz oscillator which is NC by default.
-    resources = UpduinoV1Platform.resources + [
+    resources = LazyTable(lambda cls: UpduinoV1Platform.resources + [
         # Solder pin 12 to the adjacent 'J8' osc_out pin to enable.
         Resource("clk12", 0, Pins("12", dir="i"),
                  Clock(12e6), Attrs(IO_STANDARD="SB_LVCMOS")),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         iceprog = os.environ.get("ICEPROG", "iceprog")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([iceprog, bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([iceprog, *device_args("iceprog", device, usb_id=(0x0403, 0x6014)),
+                         bitstream_filename])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ice40 import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 
 __all__ = ["UpduinoV3Platform"]
@@ -14,7 +17,7 @@ class UpduinoV3Platform(LatticeICE40Platform):
     package     = "SG48"
     default_clk = "SB_HFOSC"
     hfosc_div   = 0
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         # Solder the OSC jumper to connect the onboard oscillator to pin 20.
         # Note that this overlaps with the QSPI pins.
         Resource("clk12", 0,
@@ -30,18 +33,19 @@ class UpduinoV3Platform(LatticeICE40Platform):
             cs_n="16", clk="15", cipo="17", copi="14", wp_n="10", hold_n="20",
             attrs=Attrs(IO_STANDARD="SB_LVCMOS")
         ),
-    ]
-    connectors  = [
+    ])
+    connectors  = LazyTable(lambda cls: [
         # "Left" row of header pins (JP5 on the schematic)
         Connector("j", 0, "41 39 40 - - - 23 25 26 27 32 35 31 37 34 43 36 42 38 28"),
         # "Right" row of header pins (JP6 on the schematic)
         Connector("j", 1, "20 10 - - 12 21 13 19 18 11 9 6 44 4 3 48 45 47 46 2")
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         iceprog = os.environ.get("ICEPROG", "iceprog")
-        with products.extract("{}.bin".format(name)) as bitstream_filename:
-            subprocess.check_call([iceprog, bitstream_filename])
+        with extract(products, "{}.bin".format(name)) as bitstream_filename:
+            run_command([iceprog, *device_args("iceprog", device, usb_id=(0x0403, 0x6014)),
+                         bitstream_filename])
 
 
 if __name__ == "__main__":
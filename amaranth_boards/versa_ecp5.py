@@ -1,9 +1,11 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.lattice_ecp5 import *
 from .resources import *
+from ._table import LazyTable
+from ._products import extract
+from ._command import run_command
 
 
 __all__ = ["VersaECP5Platform"]
@@ -15,7 +17,7 @@ class VersaECP5Platform(LatticeECP5Platform):
     speed       = "8"
     default_clk = "clk100"
     default_rst = "rst"
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("rst", 0, PinsN("T1", dir="i"), Attrs(IO_TYPE="LVCMOS33")),
         Resource("clk100", 0, DiffPairs("P3", "P4", dir="i"),
                  Clock(100e6), Attrs(IO_TYPE="LVDS")),
@@ -124,8 +126,8 @@ class VersaECP5Platform(LatticeECP5Platform):
             Subsignal("odt",     Pins("L2", dir="o")),
             Attrs(IO_TYPE="SSTL135_I", SLEWRATE="FAST")
         )
-    ]
-    connectors = [
+    ])
+    connectors = LazyTable(lambda cls: [
         Connector("expcon", 1, """
         -   -   -   B19 B12 B9  E6  D6  E7  D7  B11 B6  E9  D9  B8  C8  D8  E8  C7  C6
         -   -   -   -   -   -   -   -   -   -   -   -   -   -   -   -   -   -   -   -
@@ -134,7 +136,7 @@ class VersaECP5Platform(LatticeECP5Platform):
         A8  -   A12 A13 B13 C13 D13 E13 A14 C14 D14 E14 D11 C10 A9  B10 D12 E12 -   -
         B15 -   C15 -   D15 -   E15 A16 B16 -   C16 D16 B17 -   C17 A17 B18 A7  A18 -
         """), # X4
-    ]
+    ])
 
     @property
     def file_templates(self):
@@ -163,9 +165,9 @@ class VersaECP5Platform(LatticeECP5Platform):
 
     def toolchain_program(self, products, name):
         openocd = os.environ.get("OPENOCD", "openocd")
-        with products.extract("{}-openocd.cfg".format(name), "{}.svf".format(name)) \
+        with extract(products, "{}-openocd.cfg".format(name), "{}.svf".format(name)) \
                 as (config_filename, vector_filename):
-            subprocess.check_call([openocd,
+            run_command([openocd,
                 "-f", config_filename,
                 "-c", "transport select jtag; init; svf -quiet {}; exit".format(vector_filename)
             ])
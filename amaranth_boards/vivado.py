@@ -0,0 +1,104 @@
+import os
+import shutil
+
+from ._overrides import append_override
+
+
+__all__ = ["incremental_overrides", "parse_incremental_reuse", "build_incremental"]
+
+
+def incremental_overrides(name, **kwargs):
+    """Return ``kwargs``, with the Vivado template overrides that make the build of design
+    ``name`` incremental appended to any overrides of the same name already in ``kwargs``.
+
+    If ``{name}_reference.dcp`` exists in the build directory, its placement and routing are
+    reused; the amount of reuse is then reported in ``{name}_incremental_reuse.rpt``. Otherwise
+    the build is a regular one.
+    """
+    reference = "{}_reference.dcp".format(name)
+    append_override(kwargs, "script_after_synth",
+        "if {{[file exists {0}]}} {{ read_checkpoint -incremental {0} }}"
+        .format(reference))
+    append_override(kwargs, "script_after_route",
+        "if {{[file exists {0}]}} {{ report_incremental_reuse -file {1}_incremental_reuse.rpt }}"
+        .format(reference, name))
+    return kwargs
+
+
+def parse_incremental_reuse(report):
+    """Parse the reuse summary of a ``report_incremental_reuse`` report.
+
+    Returns a dictionary mapping each type of object (``"Cells"``, ``"Nets"``, ``"Pins"``,
+    ``"Ports"``) to a dictionary of its columns (e.g. ``"Reuse % (of Total)"``, ``"Total"``).
+    Numeric values are converted to numbers, and ``-`` to ``None``. If the report has no reuse
+    summary (e.g. because no reference checkpoint was read), the dictionary is empty.
+    """
+    def value(text):
+        if text == "-":
+            return None
+        for convert in (int, float):
+            try:
+                return convert(text)
+            except ValueError:
+                pass
+        return text
+
+    summary = {}
+    header = None
+    for line in report.splitlines():
+        line = line.strip()
+        if not line.startswith("|"):
+            if header is not None and summary and not line.startswith("+"):
+                break
+            continue
+        cells = [cell.strip() for cell in line.strip("|").split("|")]
+        if header is None:
+            if cells[0] == "Type":
+                header = cells
+        else:
+            summary[cells[0]] = {column: value(cell)
+                                 for column, cell in zip(header[1:], cells[1:])}
+    return summary
+
+
+def build_incremental(platform, elaboratable, name="top", build_dir="build", *,
+                      checkpoint_dir=None, **kwargs):
+    """Build ``elaboratable`` for a Vivado ``platform``, reusing the placement and routing of
+    the previous build of the same design.
+
+    The routed checkpoint of every build is kept as ``{checkpoint_dir}/{platform}/{name}.dcp``,
+    where ``platform`` is the platform class name; if ``checkpoint_dir`` is ``None``, it is
+    kept in ``build_dir`` instead. Returns the build products and the parsed reuse summary
+    (see :func:`parse_incremental_reuse`), or ``None`` if there was no previous checkpoint.
+    """
+    if platform.toolchain != "Vivado":
+        raise ValueError("Incremental builds require the Vivado toolchain, not {}"
+                         .format(platform.toolchain))
+
+    if checkpoint_dir is None:
+        checkpoint = os.path.join(build_dir, "{}_route.dcp".format(name))
+    else:
+        checkpoint = os.path.join(checkpoint_dir, type(platform).__name__, "{}.dcp".format(name))
+    reference = os.path.join(build_dir, "{}_reference.dcp".format(name))
+    reuse_report = os.path.join(build_dir, "{}_incremental_reuse.rpt".format(name))
+
+    os.makedirs(build_dir, exist_ok=True)
+    for filename in (reference, reuse_report):
+        if os.path.exists(filename):
+            os.remove(filename)
+    if os.path.exists(checkpoint):
+        shutil.copyfile(checkpoint, reference)
+
+    products = platform.build(elaboratable, name, build_dir,
+                              **incremental_overrides(name, **kwargs))
+    if not kwargs.get("do_build", True):
+        return products, None
+
+    if checkpoint_dir is not None:
+        os.makedirs(os.path.dirname(checkpoint), exist_ok=True)
+        shutil.copyfile(os.path.join(build_dir, "{}_route.dcp".format(name)), checkpoint)
+
+    if not os.path.exists(reuse_report):
+        return products, None
+    with open(reuse_report) as f:
+        return products, parse_incremental_reuse(f.read())
@@ -0,0 +1,346 @@
+import os
+import sys
+import json
+import uuid
+import queue
+import shlex
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+
+
+__all__ = ["VivadoServer", "submit"]
+
+
+def _tcl_quote(text):
+    if any(char in text for char in "{}\\\n"):
+        raise ValueError("Cannot pass {!r} to Tcl".format(text))
+    return "{" + text + "}"
+
+
+# Vivado started in Tcl mode keeps running between scripts, so `quit` and `exit` (which every
+# Amaranth build script ends with) must only end the script that calls them.
+_SESSION_SETUP = """
+foreach _amaranth_cmd {quit exit} {
+    if {[llength [info commands ::$_amaranth_cmd]]} {
+        rename ::$_amaranth_cmd ::_amaranth_$_amaranth_cmd
+    }
+    proc ::$_amaranth_cmd {args} { return -code return }
+}
+"""
+
+# Whatever a script leaves open would leak into the next one.
+_JOB_TEMPLATE = """
+cd {cwd}
+set argv [list {argv}]
+set argc {argc}
+set _amaranth_status [catch {{source {script}}} _amaranth_result]
+foreach _amaranth_cmd {{close_project close_design close_hw_manager}} {{
+    catch $_amaranth_cmd
+}}
+puts "{marker} $_amaranth_status [string map {{"\\n" " "}} $_amaranth_result]"
+flush stdout
+"""
+
+
+class _SessionCrashed(Exception):
+    pass
+
+
+class _Session:
+    def __init__(self, vivado):
+        self.vivado  = vivado
+        self.process = None
+
+    def start(self):
+        self.marker  = "amaranth-vivado-server-{}".format(uuid.uuid4().hex)
+        self.process = subprocess.Popen([self.vivado, "-nolog", "-nojournal", "-mode", "tcl"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            universal_newlines=True, bufsize=1)
+        self._send(_SESSION_SETUP + 'puts "{} 0"\nflush stdout\n'.format(self.marker))
+        self._wait(lambda line: None)
+
+    def stop(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            for pipe in (self.process.stdin, self.process.stdout):
+                try:
+                    pipe.close()
+                except OSError:
+                    pass # unwritten input is lost with the process anyway
+            self.process = None
+
+    def _send(self, tcl):
+        try:
+            self.process.stdin.write(tcl)
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise _SessionCrashed from None
+
+    def _wait(self, output):
+        for line in self.process.stdout:
+            # The marker may follow output that did not end with a newline.
+            index = line.find(self.marker)
+            if index < 0:
+                output(line)
+                continue
+            if index > 0:
+                output(line[:index] + "\n")
+            status, _, result = line[index + len(self.marker):].strip().partition(" ")
+            return int(status), result
+        raise _SessionCrashed
+
+    def run(self, job, output):
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+        self._send(_JOB_TEMPLATE.format(
+            cwd=_tcl_quote(job.cwd),
+            argv=" ".join(_tcl_quote(arg) for arg in job.argv),
+            argc=len(job.argv),
+            script=_tcl_quote(job.script),
+            marker=self.marker))
+        return self._wait(output)
+
+
+class _Job:
+    def __init__(self, cwd, script, argv):
+        self.cwd      = cwd
+        self.script   = script
+        self.argv     = argv
+        self.attempts = 0
+        self.events   = queue.Queue()
+
+
+class VivadoServer:
+    """Runs Tcl scripts submitted over the Unix socket ``path`` in long-lived Vivado processes.
+
+    ``workers`` Vivado processes run one script each at a time; further scripts wait in a queue.
+    If Vivado exits while running a script, it is restarted and the script is run again, at
+    most ``retries`` times.
+    """
+    def __init__(self, path, *, vivado="vivado", workers=1, retries=1):
+        self.path     = os.path.abspath(path)
+        self.vivado   = vivado
+        self.workers  = workers
+        self.retries  = retries
+        self._jobs    = queue.Queue()
+        self._socket  = None
+
+    def _work(self):
+        session = _Session(self.vivado)
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                session.stop()
+                return
+            job.attempts += 1
+            try:
+                status, result = session.run(job, lambda line: job.events.put({"output": line}))
+            except _SessionCrashed:
+                session.stop()
+                if job.attempts <= self.retries:
+                    job.events.put({"output": "Vivado exited unexpectedly; restarting it\n"})
+                    self._jobs.put(job)
+                else:
+                    job.events.put({"status": 1, "error": "Vivado exited unexpectedly"})
+                continue
+            except OSError as e:
+                session.stop()
+                job.events.put({"status": 1, "error": "Cannot run Vivado: {}".format(e)})
+                continue
+            except ValueError as e:
+                job.events.put({"status": 1, "error": str(e)})
+                continue
+            # `return` from a sourced script (status 2) ends it normally.
+            if status in (0, 2):
+                job.events.put({"status": 0})
+            else:
+                job.events.put({"status": 1, "error": result})
+
+    def _handle(self, connection):
+        with connection, connection.makefile("rw", encoding="utf-8") as stream:
+            try:
+                request = json.loads(stream.readline())
+                job = _Job(request["cwd"], request["script"], request.get("argv", []))
+            except (ValueError, KeyError) as e:
+                error = "Bad request: {}".format(e)
+                stream.write(json.dumps({"status": 1, "error": error}) + "\n")
+                return
+            self._jobs.put(job)
+            while True:
+                event = job.events.get()
+                try:
+                    stream.write(json.dumps(event) + "\n")
+                    stream.flush()
+                except OSError:
+                    pass # the client went away; let the script finish regardless
+                if "status" in event:
+                    return
+
+    def serve_forever(self):
+        """Accept scripts until :meth:`shutdown` is called."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(self.path)
+        self._socket.listen()
+        workers = [threading.Thread(target=self._work, daemon=True)
+                   for _ in range(self.workers)]
+        for worker in workers:
+            worker.start()
+        try:
+            while True:
+                try:
+                    connection, _ = self._socket.accept()
+                except OSError:
+                    break
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+        finally:
+            for worker in workers:
+                self._jobs.put(None)
+            for worker in workers:
+                worker.join()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def shutdown(self):
+        """Stop accepting scripts, and stop Vivado once the queued scripts have run."""
+        if self._socket is not None:
+            self._socket.shutdown(socket.SHUT_RDWR)
+            self._socket.close()
+
+
+def submit(path, script, *, cwd=None, argv=(), output=None):
+    """Run the Tcl file ``script`` in the :class:`VivadoServer` listening on ``path``, from the
+    directory ``cwd`` (the current directory by default).
+
+    Every line Vivado prints is passed to ``output``, if given. Returns ``None`` if the script
+    succeeded, or the error message otherwise. Raises :exc:`OSError` if the server is not
+    running.
+    """
+    request = {
+        "cwd":    os.path.abspath(cwd or os.getcwd()),
+        "script": os.path.abspath(os.path.join(cwd or os.getcwd(), script)),
+        "argv":   list(argv),
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        with client.makefile("rw", encoding="utf-8") as stream:
+            stream.write(json.dumps(request) + "\n")
+            stream.flush()
+            for line in stream:
+                event = json.loads(line)
+                if "output" in event:
+                    if output is not None:
+                        output(event["output"])
+                    continue
+                return event.get("error") if event["status"] else None
+    return "Connection to the Vivado server was lost"
+
+
+def _client(args):
+    # Accept the subset of the Vivado command line that Amaranth and the board files use.
+    script = log = None
+    mode = "gui"
+    vivado_args, tclargs = list(args.vivado_args), []
+    if "-tclargs" in vivado_args:
+        index = vivado_args.index("-tclargs")
+        vivado_args, tclargs = vivado_args[:index], vivado_args[index + 1:]
+    arg_iter = iter(vivado_args)
+    for arg in arg_iter:
+        if arg == "-source":
+            script = next(arg_iter)
+        elif arg == "-log":
+            log = next(arg_iter)
+        elif arg == "-mode":
+            mode = next(arg_iter)
+        elif arg not in ("-nolog", "-nojournal", "-notrace", "-verbose"):
+            mode = None
+            break
+
+    if mode not in ("batch", "tcl") or (script is None and mode != "tcl"):
+        os.execvp(args.fallback, [args.fallback, *args.vivado_args])
+
+    temp = None
+    if script is None:
+        fd, temp = tempfile.mkstemp(suffix=".tcl")
+        with os.fdopen(fd, "w") as f:
+            f.write(sys.stdin.read())
+        script = temp
+
+    log_file = None if log is None else open(log, "w")
+    def output(line):
+        sys.stdout.write(line)
+        if log_file is not None:
+            log_file.write(line)
+
+    try:
+        error = submit(args.socket, script, argv=tclargs, output=output)
+    except OSError:
+        # The server is not running; do what Vivado would have done.
+        os.execvp(args.fallback, [args.fallback, *args.vivado_args])
+    finally:
+        if log_file is not None:
+            log_file.close()
+        if temp is not None:
+            os.unlink(temp)
+    if error is not None:
+        sys.exit("ERROR: {}".format(error))
+
+
+def _serve(args):
+    server = VivadoServer(args.socket, vivado=args.vivado, workers=args.jobs)
+    # Build scripts invoke Vivado through `$VIVADO`, which must name a single executable.
+    shim = "{}.vivado".format(os.path.abspath(args.socket))
+    with open(shim, "w") as f:
+        f.write("#!/bin/sh\nexec {} -m {} --socket {} client --fallback {} -- \"$@\"\n"
+                .format(shlex.quote(sys.executable), __spec__.name, shlex.quote(server.path),
+                        shlex.quote(args.vivado)))
+    os.chmod(shim, 0o755)
+    print("export VIVADO={}".format(shlex.quote(shim)), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.unlink(shim)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m {}".format(__spec__.name),
+        description="Keep Vivado running between builds and program steps.")
+    parser.add_argument("--socket", metavar="PATH",
+        default=os.path.join(tempfile.gettempdir(),
+                             "amaranth-vivado-{}.sock".format(os.getuid())),
+        help="listen on, or connect to, the Unix socket PATH (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = subparsers.add_parser("serve",
+        help="start the server, and print how to point `$VIVADO` at it")
+    p_serve.add_argument("--vivado", metavar="PATH", default="vivado",
+        help="run Vivado from PATH (default: %(default)s)")
+    p_serve.add_argument("-j", "--jobs", metavar="N", type=int, default=1,
+        help="keep N Vivado processes running, each running one script at a time "
+             "(default: %(default)s)")
+
+    p_client = subparsers.add_parser("client",
+        help="run a script in the server, taking the same arguments as Vivado")
+    p_client.add_argument("--fallback", metavar="PATH", default="vivado",
+        help="run Vivado from PATH if the server is not running or the arguments are not "
+             "supported (default: %(default)s)")
+    p_client.add_argument("vivado_args", metavar="ARGS", nargs=argparse.REMAINDER)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        _serve(args)
+    else:
+        if args.vivado_args[:1] == ["--"]:
+            args.vivado_args = args.vivado_args[1:]
+        _client(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 import os
-import subprocess
 
 from amaranth.build import *
 from amaranth.vendor.intel import *
 from amaranth_boards.resources import *
+from amaranth_boards._table import LazyTable
+from amaranth_boards.program import device_args
+from amaranth_boards._products import extract
+from amaranth_boards._command import run_command
 
 __all__ = ["WaveshareEP4CE10Platform"]
 
@@ -14,7 +17,7 @@ class WaveshareEP4CE10Platform(IntelPlatform):
     speed       = "C8"
     default_clk = "clk50"
 
-    resources   = [
+    resources   = LazyTable(lambda cls: [
         Resource("clk50", 0, Pins("E16", dir="i"),
             Clock(50e6), Attrs(io_standard="3.3-V LVTTL")),
 
@@ -78,10 +81,10 @@ class WaveshareEP4CE10Platform(IntelPlatform):
             ba="N3 N6", a="P8 P6 L6 N8 R12 T12 R13 T13 R14 T14 N5 R16 T15",
             dq="K2 K1 L2 L1 N2 N1 P2 P1 N15 L16 L15 K16 K15 J16 J15 G15", dqm="T2 N16",
             attrs=Attrs(io_standard="3.3-V LVTTL")),
-    ]
+    ])
 
     # These are the connectors on the daughterboard DVK600
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("8IOs", 1, {
               "8": "J13",
               "7": "L11",
@@ -246,13 +249,14 @@ class WaveshareEP4CE10Platform(IntelPlatform):
              "31": "B14",
              "32": "D11",
         }),
-    ]
+    ])
 
-    def toolchain_program(self, products, name):
+    def toolchain_program(self, products, name, *, device=None):
         quartus_pgm = os.environ.get("QUARTUS_PGM", "quartus_pgm")
-        with products.extract("{}.sof".format(name)) as bitstream_filename:
-            subprocess.check_call([quartus_pgm, "--haltcc", "--mode", "JTAG",
-                                    "--operation", "P;" + bitstream_filename])
+        with extract(products, "{}.sof".format(name)) as bitstream_filename:
+            run_command([quartus_pgm, *device_args("quartus_pgm", device),
+                         "--haltcc", "--mode", "JTAG",
+                          "--operation", "P;" + bitstream_filename])
 
 if __name__ == "__main__":
     from amaranth_boards.test.blinky import Blinky
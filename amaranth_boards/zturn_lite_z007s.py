@@ -1,5 +1,6 @@
 from amaranth.build import *
 from amaranth.vendor.xilinx import *
+from ._table import LazyTable
 
 
 __all__ = ["ZTurnLiteZ007SPlatform"]
@@ -10,7 +11,7 @@ class ZTurnLiteZ007SPlatform(XilinxPlatform):
     package    = "clg400"
     speed      = "1"
     resources  = []
-    connectors = [
+    connectors = LazyTable(lambda cls: [
         Connector("expansion", 0,
             "-   -   "
             "B19 E17 "
@@ -73,4 +74,4 @@ class ZTurnLiteZ007SPlatform(XilinxPlatform):
             "-   -   "
             "-   -   "
         ),
-    ]
+    ])
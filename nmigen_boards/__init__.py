@@ -0,0 +1,50 @@
+import sys
+import warnings
+import importlib
+import importlib.abc
+import importlib.util
+
+import amaranth_boards
+
+
+warnings.warn("instead of nmigen_boards, use amaranth_boards",
+              DeprecationWarning, stacklevel=2)
+
+
+class _AliasFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    # Imports `nmigen_boards.<name>` as the very same module object as `amaranth_boards.<name>`,
+    # so that a board imported under both names is only executed once, and every board (or
+    # other submodule) is covered without a shim of its own.
+    _prefix = __name__ + "."
+
+    def __init__(self):
+        self._module_attrs = {}
+
+    def _target(self, fullname):
+        return "amaranth_boards." + fullname[len(self._prefix):]
+
+    def find_spec(self, fullname, path, target=None):
+        if not fullname.startswith(self._prefix):
+            return None
+        if importlib.util.find_spec(self._target(fullname)) is None:
+            return None
+        return importlib.util.spec_from_loader(fullname, self)
+
+    def create_module(self, spec):
+        module = importlib.import_module(self._target(spec.name))
+        # The import system sets `__spec__` (and, depending on the Python version, `__loader__`
+        # and `__package__`) on the module returned here to describe the alias; put them back.
+        self._module_attrs[spec.name] = (module.__spec__, module.__loader__, module.__package__)
+        return module
+
+    def exec_module(self, module):
+        module.__spec__, module.__loader__, module.__package__ = \
+            self._module_attrs.pop(module.__spec__.name)
+
+
+if not any(isinstance(finder, _AliasFinder) for finder in sys.meta_path):
+    sys.meta_path.insert(0, _AliasFinder())
+
+
+def __getattr__(name):
+    return getattr(amaranth_boards, name)
@@ -1,7 +0,0 @@
-from amaranth_boards.arrow_sockit import *
-from amaranth_boards.arrow_sockit import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.arrow_sockit, use amaranth_boards.arrow_sockit",
-              DeprecationWarning, stacklevel=2)
\ No newline at end of file
@@ -1,8 +0,0 @@
-
-from amaranth_boards.colorlight_i5 import *
-from amaranth_boards.colorlight_i5 import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.colorlight_i5, use amaranth_boards.colorlight_i5",
-              DeprecationWarning, stacklevel=2)
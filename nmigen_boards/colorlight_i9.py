@@ -1,8 +0,0 @@
-
-from amaranth_boards.colorlight_i9 import *
-from amaranth_boards.colorlight_i9 import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.colorlight_i9, use amaranth_boards.colorlight_i9",
-              DeprecationWarning, stacklevel=2)
\ No newline at end of file
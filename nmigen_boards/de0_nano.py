@@ -1,8 +0,0 @@
-
-from amaranth_boards.de0_nano import *
-from amaranth_boards.de0_nano import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.de0_nano, use amaranth_boards.de0_nano",
-              DeprecationWarning, stacklevel=2)
\ No newline at end of file
@@ -1,7 +0,0 @@
-from amaranth_boards.qmtech_10cl006 import *
-from amaranth_boards.qmtech_10cl006 import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.qmtech_10cl006, use amaranth_boards.qmtech_10cl006",
-              DeprecationWarning, stacklevel=2)
\ No newline at end of file
@@ -1,7 +0,0 @@
-from amaranth_boards.qmtech_5cefa2 import *
-from amaranth_boards.qmtech_5cefa2 import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.qmtech_5cefa2, use amaranth_boards.qmtech_5cefa2",
-              DeprecationWarning, stacklevel=2)
\ No newline at end of file
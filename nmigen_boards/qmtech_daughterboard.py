@@ -1,7 +0,0 @@
-from amaranth_boards.qmtech_daughterboard import *
-from amaranth_boards.qmtech_daughterboard import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.qmtech_daughterboard, use amaranth_boards.qmtech_daughterboard",
-              DeprecationWarning, stacklevel=2)
\ No newline at end of file
@@ -1,7 +0,0 @@
-from amaranth_boards.qmtech_ep4ce import *
-from amaranth_boards.qmtech_ep4ce import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.qmtech_ep4ce, use amaranth_boards.qmtech_ep4ce",
-              DeprecationWarning, stacklevel=2)
\ No newline at end of file
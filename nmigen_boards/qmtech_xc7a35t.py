@@ -1,7 +0,0 @@
-from amaranth_boards.qmtech_xc7a35t import *
-from amaranth_boards.qmtech_xc7a35t import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.qmtech_xc7a35t, use amaranth_boards.qmtech_xc7a35t",
-              DeprecationWarning, stacklevel=2)
\ No newline at end of file
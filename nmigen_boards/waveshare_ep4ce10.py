@@ -1,7 +0,0 @@
-from amaranth_boards.waveshare_ep4ce10 import *
-from amaranth_boards.waveshare_ep4ce10 import __all__
-
-
-import warnings
-warnings.warn("instead of nmigen_boards.waveshare_ep4ce10, use amaranth_boards.waveshare_ep4ce10",
-              DeprecationWarning, stacklevel=2)
\ No newline at end of file